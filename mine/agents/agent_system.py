@@ -1,6 +1,9 @@
+import argparse
 import random
 import time
-import os
+from concurrent.futures import ProcessPoolExecutor
+
+from grid import GridRenderer, NavGrid, place_resources, random_walls
 
 # Ustawienia
 GRID_SIZE = 8
@@ -9,20 +12,33 @@ NUM_RESOURCES = 5
 BASE_POS = (4, 4)  # Srodek planszy
 SIM_STEPS = 50
 
+ACTIONS = ["UP", "DOWN", "LEFT", "RIGHT"]
+
 
 class Agent:
-    def __init__(self, agent_id):
+    def __init__(self, agent_id, grid_size=GRID_SIZE, base_pos=BASE_POS, rng=random, nav=None):
         self.id = agent_id
-        self.row, self.col = BASE_POS  # Start w bazie
+        self.grid_size = grid_size
+        self.base_pos = base_pos
+        self.rng = rng  # zrodlo losowosci (modul random albo random.Random(seed))
+        self.row, self.col = base_pos  # Start w bazie
         self.carry = False
         self.delivered = 0  # Ile zasobow dostarczyl
+        self.nav = nav  # NavGrid, gdy na planszy sa przeszkody
     
-    def choose_action(self):
-        """Wybiera akcje zgodnie z polityka"""
+    def choose_action(self, explore=None):
+        """Wybiera akcje zgodnie z polityka
+        
+        explore - opcjonalny indeks kierunku z ACTIONS uzywany zamiast losowania
+        (pozwala sterowac kilkoma srodowiskami tym samym strumieniem losowym)
+        """
+        if self.carry and self.nav is not None:
+            # Z przeszkodami: po polu odleglosci od bazy
+            return self.nav.step(self.row, self.col, self.base_pos) or "WAIT"
         if self.carry:
             # Polityka: idz do bazy (zmniejsz odleglosc Manhattan)
-            dr = BASE_POS[0] - self.row
-            dc = BASE_POS[1] - self.col
+            dr = self.base_pos[0] - self.row
+            dc = self.base_pos[1] - self.col
             
             if abs(dr) >= abs(dc):
                 return "DOWN" if dr > 0 else "UP"
@@ -30,7 +46,9 @@ class Agent:
                 return "RIGHT" if dc > 0 else "LEFT"
         else:
             # Polityka: losowa eksploracja
-            return random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+            if explore is not None:
+                return ACTIONS[explore]
+            return self.rng.choice(ACTIONS)
     
     def move(self, action):
         """Wykonuje ruch"""
@@ -45,28 +63,47 @@ class Agent:
         elif action == "RIGHT":
             new_col += 1
         
-        # Sprawdz granice
-        if 0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE:
+        # Sprawdz granice (i przeszkody)
+        if self.nav is not None:
+            if self.nav.passable(new_row, new_col):
+                self.row, self.col = new_row, new_col
+        elif 0 <= new_row < self.grid_size and 0 <= new_col < self.grid_size:
             self.row, self.col = new_row, new_col
 
 
 class Environment:
-    def __init__(self):
-        self.agents = [Agent(i) for i in range(NUM_AGENTS)]
-        self.resources = set()
+    def __init__(self, grid_size=GRID_SIZE, num_agents=NUM_AGENTS, num_resources=NUM_RESOURCES,
+                 base_pos=None, seed=None, walls=0):
+        self.grid_size = grid_size
+        self.num_resources = num_resources
+        # Baza domyslnie na srodku planszy (dla 8x8 to BASE_POS)
+        self.base_pos = base_pos or (grid_size // 2, grid_size // 2)
+        # Z ziarnem - powtarzalny epizod; bez ziarna - globalny modul random
+        self.rng = random.Random(seed) if seed is not None else random
+        # walls - liczba odcinkow scian; bez scian agenci ida zachlannie (Manhattan)
+        self.nav = None
+        if walls:
+            obstacles = random_walls(grid_size, walls, self.rng, keep={self.base_pos})
+            self.nav = NavGrid(grid_size, obstacles, self.base_pos)
+        self.agents = [Agent(i, grid_size, self.base_pos, self.rng, self.nav) for i in range(num_agents)]
         self.total_delivered = 0
+        self.renderer = None
         
         # Losowe rozmieszczenie zasobow
-        while len(self.resources) < NUM_RESOURCES:
-            r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            if (r, c) != BASE_POS:
-                self.resources.add((r, c))
+        self.resources = place_resources(grid_size, num_resources, self.rng, self.base_pos, self.nav)
     
-    def step(self):
-        """Jeden krok symulacji"""
+    @property
+    def done(self):
+        return self.total_delivered >= self.num_resources
+    
+    def step(self, directions=None):
+        """Jeden krok symulacji
+        
+        directions - opcjonalnie kierunki eksploracji (indeksy ACTIONS) dla kazdego agenta
+        """
         for agent in self.agents:
             # Wybierz i wykonaj akcje
-            action = agent.choose_action()
+            action = agent.choose_action(None if directions is None else directions[agent.id])
             agent.move(action)
             
             # Sprawdz podniesienie zasobu
@@ -75,68 +112,130 @@ class Environment:
                 self.resources.remove((agent.row, agent.col))
             
             # Sprawdz dostarczenie do bazy
-            if agent.carry and (agent.row, agent.col) == BASE_POS:
+            if agent.carry and (agent.row, agent.col) == self.base_pos:
                 agent.carry = False
                 agent.delivered += 1
                 self.total_delivered += 1
     
+    def cells(self):
+        """Pola planszy inne niz puste - O(A + R) zamiast przegladania calej planszy"""
+        cells = {self.base_pos: "B"}
+        if self.nav is not None:
+            for pos in self.nav.obstacles:
+                cells[pos] = "#"
+        for pos in self.resources:
+            cells[pos] = "R"
+        # Pierwszy agent na polu ma pierwszenstwo (jak wczesniej)
+        for a in reversed(self.agents):
+            cells[(a.row, a.col)] = "*" if a.carry else str(a.id % 10)
+        return cells
+    
     def display(self, step_num):
-        """Wyswietla plansze"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        
-        print(f"\n=== KROK {step_num} === Dostarczone: {self.total_delivered}")
-        print("+" + "-" * (GRID_SIZE * 2 + 1) + "+")
-        
-        for r in range(GRID_SIZE):
-            print("| ", end="")
-            for c in range(GRID_SIZE):
-                # Co jest na tym polu
-                agents_here = [a for a in self.agents if a.row == r and a.col == c]
-                
-                if agents_here:
-                    # Agent (z zasobem = duza litera)
-                    a = agents_here[0]
-                    symbol = str(a.id) if not a.carry else "*"
-                elif (r, c) == BASE_POS:
-                    symbol = "B"
-                elif (r, c) in self.resources:
-                    symbol = "R"
-                else:
-                    symbol = "."
-                
-                print(symbol + " ", end="")
-            print("|")
-        
-        print("+" + "-" * (GRID_SIZE * 2 + 1) + "+")
-        print("Legenda: B=baza, R=zasob, 0-2=agenci, *=agent z zasobem")
+        """Wyswietla plansze (przerysowuje tylko zmienione pola)"""
+        if self.renderer is None:
+            self.renderer = GridRenderer(self.grid_size, self.grid_size)
         
+        header = ["", f"=== KROK {step_num} === Dostarczone: {self.total_delivered}"]
+        footer = ["Legenda: B=baza, R=zasob, #=sciana, 0-9=agenci, *=agent z zasobem"]
         for a in self.agents:
             status = "niesie zasob" if a.carry else "szuka"
-            print(f"  Agent {a.id}: ({a.row},{a.col}) {status}, dostarczyl: {a.delivered}")
+            footer.append(f"  Agent {a.id}: ({a.row},{a.col}) {status}, dostarczyl: {a.delivered}")
+        self.renderer.render(header, self.cells(), footer)
+
+
+def run_episode(seed, grid_size=GRID_SIZE, num_agents=NUM_AGENTS, num_resources=NUM_RESOURCES,
+                max_steps=SIM_STEPS, walls=0):
+    """Jeden epizod bez wyswietlania i opoznien."""
+    env = Environment(grid_size, num_agents, num_resources, seed=seed, walls=walls)
+    steps = 0
+    start = time.perf_counter()
+    while steps < max_steps and not env.done:
+        env.step()
+        steps += 1
+    return {
+        "seed": seed,
+        "steps": steps,
+        "completed": env.done,
+        "delivered": [a.delivered for a in env.agents],
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def _run_episode_args(args):
+    return run_episode(*args)
+
+
+def run_batch(episodes, seed=0, workers=0, grid_size=GRID_SIZE, num_agents=NUM_AGENTS,
+              num_resources=NUM_RESOURCES, max_steps=SIM_STEPS, walls=0):
+    """Uruchamia epizody o ziarnach seed..seed+episodes-1, po kolei albo w puli procesow."""
+    jobs = [(seed + i, grid_size, num_agents, num_resources, max_steps, walls) for i in range(episodes)]
+    start = time.perf_counter()
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_episode_args, jobs, chunksize=max(1, episodes // (4 * workers))))
+    else:
+        results = [run_episode(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+    
+    total_steps = sum(r["steps"] for r in results)
+    completed = [r["steps"] for r in results if r["completed"]]
+    return {
+        "episodes": episodes,
+        "completed": len(completed),
+        "avg_steps_to_completion": sum(completed) / len(completed) if completed else None,
+        "avg_delivered_per_agent": [
+            sum(r["delivered"][i] for r in results) / episodes for i in range(num_agents)
+        ] if episodes else [],
+        "steps_per_second": total_steps / elapsed if elapsed > 0 else 0.0,
+        "results": results,
+    }
 
 
 def main():
-    env = Environment()
+    parser = argparse.ArgumentParser(description="System agentowy - zbieranie zasobow")
+    parser.add_argument("--headless", action="store_true", help="seria epizodow bez wyswietlania")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=0, help="liczba procesow (0 - bez puli)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grid", type=int, default=GRID_SIZE)
+    parser.add_argument("--agents", type=int, default=NUM_AGENTS)
+    parser.add_argument("--resources", type=int, default=NUM_RESOURCES)
+    parser.add_argument("--max-steps", type=int, default=SIM_STEPS)
+    parser.add_argument("--walls", type=int, default=0, help="liczba odcinkow scian na planszy")
+    args = parser.parse_args()
+    
+    if args.headless:
+        stats = run_batch(args.episodes, args.seed, args.workers, args.grid, args.agents,
+                          args.resources, args.max_steps, args.walls)
+        print(f"Epizody: {stats['episodes']}, ukonczone: {stats['completed']}")
+        if stats["avg_steps_to_completion"] is not None:
+            print(f"  Srednio krokow do ukonczenia: {stats['avg_steps_to_completion']:.1f}")
+        for i, delivered in enumerate(stats["avg_delivered_per_agent"]):
+            print(f"  Agent {i}: srednio dostarczyl {delivered:.2f}")
+        print(f"  Krokow na sekunde: {stats['steps_per_second']:.0f}")
+        return
+    
+    env = Environment(args.grid, args.agents, args.resources, walls=args.walls)
     
     print("SYSTEM AGENTOWY - ZBIERANIE ZASOBOW")
-    print(f"Plansza: {GRID_SIZE}x{GRID_SIZE}")
-    print(f"Agenci: {NUM_AGENTS}, Zasoby: {NUM_RESOURCES}")
+    print(f"Plansza: {args.grid}x{args.grid}")
+    print(f"Agenci: {args.agents}, Zasoby: {args.resources}")
     input("Nacisnij Enter aby rozpoczac...")
     
-    for step in range(SIM_STEPS):
+    for step in range(args.max_steps):
         env.display(step)
         env.step()
         time.sleep(0.3)
         
         # Koniec jesli zebrano wszystkie zasoby
-        if env.total_delivered >= NUM_RESOURCES:
+        if env.done:
             env.display(step + 1)
             print(f"\n*** SUKCES! Wszystkie zasoby dostarczone w {step+1} krokach ***")
             break
     else:
-        env.display(SIM_STEPS)
-        print(f"\n*** Koniec symulacji. Dostarczone: {env.total_delivered}/{NUM_RESOURCES} ***")
+        env.display(args.max_steps)
+        print(f"\n*** Koniec symulacji. Dostarczone: {env.total_delivered}/{args.resources} ***")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,41 @@
+import unittest
+from agent_system import Environment, run_episode
+
+
+class TestWalls(unittest.TestCase):
+    
+    def test_resources_reachable_from_base(self):
+        for seed in range(5):
+            env = Environment(grid_size=16, num_agents=3, num_resources=20, seed=seed, walls=12)
+            self.assertEqual(len(env.resources), 20)
+            for r, c in env.resources:
+                self.assertNotIn((r, c), env.nav.obstacles)
+                self.assertGreater(env.nav.distance(r, c, env.base_pos), 0)
+    
+    def test_agents_never_enter_walls(self):
+        env = Environment(grid_size=16, num_agents=4, num_resources=10, seed=3, walls=12)
+        for _ in range(2000):
+            if env.done:
+                break
+            env.step()
+            for agent in env.agents:
+                self.assertTrue(env.nav.passable(agent.row, agent.col))
+        self.assertTrue(env.done)
+    
+    def test_episode_with_walls_completes(self):
+        result = run_episode(1, grid_size=16, num_agents=3, num_resources=10, walls=10, max_steps=5000)
+        self.assertTrue(result["completed"])
+        self.assertEqual(sum(result["delivered"]), 10)
+    
+    def test_too_many_resources(self):
+        with self.assertRaises(ValueError):
+            Environment(grid_size=4, num_resources=16)  # 15 pol poza baza
+        # To samo ziarno - te same sciany; o jeden zasob wiecej niz pol osiagalnych
+        env = Environment(grid_size=8, num_resources=1, seed=0, walls=3)
+        reachable = sum(1 for d in env.nav.base_field if d > 0)
+        with self.assertRaises(ValueError):
+            Environment(grid_size=8, num_resources=reachable + 1, seed=0, walls=3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
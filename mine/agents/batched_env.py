@@ -0,0 +1,243 @@
+"""
+Wsadowe API dla wielu srodowisk agentowych (vector env)
+
+BatchedEnv krokuje N niezaleznych srodowisk (agent_system.Environment albo
+multi_agent_system.Environment) jednym wywolaniem i zwraca obserwacje
+jako tablice NumPy z pierwszym wymiarem N:
+- grid      (N, K, G, G) - warstwy planszy (agenci, zasoby, baza, ...)
+- positions (N, A, 2)    - pozycje agentow
+- carry     (N, A)       - czy agent niesie zasob
+
+Srodowisko, ktore zakonczylo epizod (wszystko dostarczone albo limit
+krokow), jest od razu tworzone od nowa z kolejnym ziarnem. Srodowiska moga
+byc rozdzielone miedzy procesy robocze (workers).
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+import agent_system
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "multi_agents"))
+import multi_agent_system  # noqa: E402
+
+
+def layers(env):
+    """Agenci i warstwy planszy (listy pol) jednego srodowiska."""
+    if isinstance(env, multi_agent_system.Environment):
+        return env.scouts + env.collectors, [
+            [(s.row, s.col) for s in env.scouts],
+            [(c.row, c.col) for c in env.collectors if not c.carry],
+            [(c.row, c.col) for c in env.collectors if c.carry],
+            env.known_resources,
+            env.resources,
+            [env.base_pos],
+        ]
+    return env.agents, [
+        [(a.row, a.col) for a in env.agents if not a.carry],
+        [(a.row, a.col) for a in env.agents if a.carry],
+        env.resources,
+        [env.base_pos],
+    ]
+
+
+def observe_into(env, grid, positions, carry):
+    """Wpisuje obserwacje srodowiska do gotowych tablic (bez alokacji)."""
+    agents, cells = layers(env)
+    grid.fill(0)
+    for k, layer in enumerate(cells):
+        for r, c in layer:
+            grid[k, r, c] = 1
+    positions[:] = [(a.row, a.col) for a in agents]
+    carry[:] = [getattr(a, "carry", False) for a in agents]
+
+
+def observe(env):
+    """Obserwacja jednego srodowiska jako slownik tablic."""
+    agents, cells = layers(env)
+    obs = {
+        "grid": np.zeros((len(cells), env.grid_size, env.grid_size), dtype=np.uint8),
+        "positions": np.zeros((len(agents), 2), dtype=np.int32),
+        "carry": np.zeros(len(agents), dtype=bool),
+    }
+    observe_into(env, obs["grid"], obs["positions"], obs["carry"])
+    return obs
+
+
+class EnvGroup:
+    """Grupa srodowisk w jednym procesie (sloty first..first+count-1 z num_envs)."""
+    
+    def __init__(self, env_fn, first, count, num_envs, seed, max_steps):
+        self.env_fn = env_fn
+        self.slots = list(range(first, first + count))
+        self.num_envs = num_envs
+        self.seed = seed
+        self.max_steps = max_steps
+        self.envs = []
+        self.episodes = [0] * count
+        self.steps = [0] * count
+        self.buffers = None
+    
+    def _make(self, i):
+        # Ziarno zalezy tylko od slotu i numeru epizodu, nie od podzialu na procesy
+        seed = self.seed + self.slots[i] + self.episodes[i] * self.num_envs
+        self.steps[i] = 0
+        return self.env_fn(seed=seed)
+    
+    def _observe(self, i):
+        buffers = self.buffers
+        observe_into(self.envs[i], buffers["grid"][i], buffers["positions"][i], buffers["carry"][i])
+    
+    def _observations(self):
+        return {key: buffer.copy() for key, buffer in self.buffers.items()}
+    
+    def reset(self):
+        self.episodes = [0] * len(self.slots)
+        self.envs = [self._make(i) for i in range(len(self.slots))]
+        # Wspolne bufory obserwacji dla calej grupy - jedna kopia na krok
+        first = observe(self.envs[0])
+        self.buffers = {key: np.zeros((len(self.envs),) + value.shape, dtype=value.dtype)
+                        for key, value in first.items()}
+        for i in range(len(self.envs)):
+            self._observe(i)
+        return self._observations()
+    
+    def step(self, actions=None):
+        rewards, dones, infos = [], [], []
+        for i, env in enumerate(self.envs):
+            before = env.total_delivered
+            env.step(None if actions is None else actions[i])
+            self.steps[i] += 1
+            rewards.append(env.total_delivered - before)
+            
+            done = env.done or self.steps[i] >= self.max_steps
+            dones.append(done)
+            if done:
+                # Automatyczny reset - zwracamy juz obserwacje nowego epizodu
+                infos.append({
+                    "env": self.slots[i],
+                    "steps": self.steps[i],
+                    "delivered": env.total_delivered,
+                    "completed": env.done,
+                    "final_observation": observe(env),
+                })
+                self.episodes[i] += 1
+                self.envs[i] = self._make(i)
+            self._observe(i)
+        return self._observations(), np.array(rewards), np.array(dones), infos
+
+
+def _worker(conn, group):
+    while True:
+        cmd, data = conn.recv()
+        if cmd == "reset":
+            conn.send(group.reset())
+        elif cmd == "step":
+            conn.send(group.step(data))
+        elif cmd == "close":
+            conn.close()
+            break
+
+
+class BatchedEnv:
+    """N srodowisk krokowanych razem, opcjonalnie w procesach roboczych.
+    
+    env_fn(seed=...) tworzy jedno srodowisko (przy workers > 0 musi dac sie
+    zapiklowac, np. sama klasa Environment albo functools.partial na niej).
+    """
+    
+    def __init__(self, env_fn, num_envs, seed=0, max_steps=agent_system.SIM_STEPS, workers=0):
+        self.num_envs = num_envs
+        sizes = [len(chunk) for chunk in np.array_split(np.arange(num_envs), max(1, workers))]
+        firsts = np.cumsum([0] + sizes[:-1])
+        groups = [EnvGroup(env_fn, int(first), size, num_envs, seed, max_steps)
+                  for first, size in zip(firsts, sizes) if size]
+        
+        self.group = None
+        self.conns = []
+        self.procs = []
+        if workers:
+            for group in groups:
+                parent, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(target=_worker, args=(child, group), daemon=True)
+                proc.start()
+                child.close()
+                self.conns.append(parent)
+                self.procs.append(proc)
+        else:
+            self.group = groups[0]
+        self.sizes = [len(g.slots) for g in groups]
+    
+    def reset(self):
+        """Tworzy wszystkie srodowiska od nowa i zwraca obserwacje."""
+        if self.group:
+            return self.group.reset()
+        for conn in self.conns:
+            conn.send(("reset", None))
+        return self._concat_obs([conn.recv() for conn in self.conns])
+    
+    def step(self, actions=None):
+        """Krok we wszystkich srodowiskach.
+        
+        actions - None (polityka agentow) albo tablica (N, A) kierunkow eksploracji
+        Zwraca (obserwacje, nagrody, zakonczone, info o zakonczonych epizodach).
+        """
+        if self.group:
+            return self.group.step(actions)
+        first = 0
+        for conn, size in zip(self.conns, self.sizes):
+            conn.send(("step", None if actions is None else actions[first:first + size]))
+            first += size
+        results = [conn.recv() for conn in self.conns]
+        obs = self._concat_obs([r[0] for r in results])
+        rewards = np.concatenate([r[1] for r in results])
+        dones = np.concatenate([r[2] for r in results])
+        infos = [info for r in results for info in r[3]]
+        return obs, rewards, dones, infos
+    
+    def _concat_obs(self, parts):
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+    
+    def close(self):
+        for conn in self.conns:
+            conn.send(("close", None))
+        for proc in self.procs:
+            proc.join()
+        self.conns, self.procs = [], []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wsadowe krokowanie wielu srodowisk")
+    parser.add_argument("--system", choices=["agents", "multi"], default="agents")
+    parser.add_argument("--envs", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+    
+    if args.system == "agents":
+        env_fn = agent_system.Environment
+    else:
+        env_fn = multi_agent_system.Environment
+    
+    batch = BatchedEnv(env_fn, args.envs, workers=args.workers)
+    batch.reset()
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, _, infos = batch.step()
+        episodes += len(infos)
+    elapsed = time.perf_counter() - start
+    batch.close()
+    
+    print(f"Srodowiska: {args.envs}, kroki: {args.steps}, procesy: {args.workers}")
+    print(f"  Krokow srodowisk na sekunde: {args.envs * args.steps / elapsed:.0f}")
+    print(f"  Zakonczone epizody: {episodes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import unittest
+import functools
+import numpy as np
+from batched_env import BatchedEnv, agent_system, multi_agent_system
+
+
+class TestBatchedEnv(unittest.TestCase):
+    
+    def test_observation_shapes(self):
+        batch = BatchedEnv(functools.partial(agent_system.Environment), 6)
+        obs = batch.reset()
+        self.assertEqual(obs["grid"].shape, (6, 4, 8, 8))
+        self.assertEqual(obs["positions"].shape, (6, 3, 2))
+        self.assertEqual(obs["carry"].shape, (6, 3))
+    
+    def test_multi_agent_environments_are_independent(self):
+        batch = BatchedEnv(functools.partial(multi_agent_system.Environment), 3, max_steps=1000)
+        batch.reset()
+        for _ in range(20):
+            batch.step()
+        boards = [env.known_resources for env in batch.group.envs]
+        self.assertIsNot(boards[0], boards[1])
+    
+    def test_auto_reset_reports_finished_episodes(self):
+        batch = BatchedEnv(functools.partial(agent_system.Environment), 4, max_steps=5)
+        batch.reset()
+        for _ in range(4):
+            _, _, dones, infos = batch.step()
+            self.assertFalse(dones.any())
+        _, _, dones, infos = batch.step()
+        self.assertTrue(dones.all())
+        self.assertEqual(sorted(info["env"] for info in infos), [0, 1, 2, 3])
+    
+    def test_workers_match_single_process(self):
+        env_fn = functools.partial(agent_system.Environment)
+        local = BatchedEnv(env_fn, 5, seed=3, max_steps=20)
+        remote = BatchedEnv(env_fn, 5, seed=3, max_steps=20, workers=2)
+        try:
+            local.reset()
+            remote.reset()
+            directions = np.random.default_rng(0).integers(0, 4, size=(30, 5, 3))
+            for step_directions in directions:
+                a = local.step(step_directions)
+                b = remote.step(step_directions)
+                np.testing.assert_array_equal(a[0]["grid"], b[0]["grid"])
+                np.testing.assert_array_equal(a[1], b[1])
+        finally:
+            remote.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
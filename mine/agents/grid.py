@@ -0,0 +1,211 @@
+"""
+Wspolne elementy planszy dla agent_system i multi_agent_system
+
+- random_walls - losowe odcinki scian,
+- NavGrid - przeszkody i pola odleglosci (BFS) do nawigacji,
+- place_resources - losowe rozmieszczenie zasobow,
+- GridRenderer - rysowanie planszy w terminalu.
+"""
+
+import sys
+from collections import OrderedDict, deque
+
+MOVES = {"UP": (-1, 0), "DOWN": (1, 0), "LEFT": (0, -1), "RIGHT": (0, 1)}
+
+
+def random_walls(grid_size, count, rng, keep=()):
+    """count losowych odcinkow scian (poziomych lub pionowych), z pominieciem pol keep."""
+    walls = set()
+    for _ in range(count):
+        length = rng.randint(2, max(2, grid_size // 2))
+        r, c = rng.randrange(grid_size), rng.randrange(grid_size)
+        dr, dc = (0, 1) if rng.random() < 0.5 else (1, 0)
+        for i in range(length):
+            pos = (r + dr * i, c + dc * i)
+            if pos[0] < grid_size and pos[1] < grid_size and pos not in keep:
+                walls.add(pos)
+    return walls
+
+
+class NavGrid:
+    """Przeszkody i pola odleglosci (BFS) do nawigacji agentow.
+    
+    Pole odleglosci do celu liczone jest raz BFS-em od celu, potem agent
+    w kazdym kroku przechodzi na sasiada o odleglosci o 1 mniejszej - O(1)
+    zamiast planowania trasy. Pole do bazy liczone jest od razu i trzymane na
+    stale, pola do pozostalych celow trafiaja do cache LRU (cache_size pol).
+    """
+    
+    def __init__(self, grid_size, obstacles=(), base_pos=None, cache_size=64):
+        self.grid_size = grid_size
+        self.obstacles = set(obstacles)
+        self.blocked = bytearray(grid_size * grid_size)
+        for r, c in self.obstacles:
+            self.blocked[r * grid_size + c] = 1
+        self.cache_size = cache_size
+        self.fields = OrderedDict()  # cel -> pole odleglosci, od najdawniej uzytego
+        self.hits = 0
+        self.misses = 0
+        self.base_pos = base_pos
+        self.base_field = self._bfs(base_pos) if base_pos is not None else None
+    
+    def passable(self, row, col):
+        n = self.grid_size
+        return 0 <= row < n and 0 <= col < n and not self.blocked[row * n + col]
+    
+    def _bfs(self, target):
+        """Odleglosci (w krokach) wszystkich pol od target; -1 - nieosiagalne."""
+        n = self.grid_size
+        dist = [-1] * (n * n)
+        start = target[0] * n + target[1]
+        if self.blocked[start]:
+            return dist
+        dist[start] = 0
+        queue = deque([start])
+        blocked = self.blocked
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            r, c = divmod(i, n)
+            for j, ok in ((i - n, r > 0), (i + n, r < n - 1), (i - 1, c > 0), (i + 1, c < n - 1)):
+                if ok and dist[j] < 0 and not blocked[j]:
+                    dist[j] = d
+                    queue.append(j)
+        return dist
+    
+    def field(self, target):
+        if target == self.base_pos:
+            return self.base_field
+        field = self.fields.get(target)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(target)
+            return field
+        self.misses += 1
+        field = self._bfs(target)
+        self.fields[target] = field
+        if len(self.fields) > self.cache_size:
+            self.fields.popitem(last=False)
+        return field
+    
+    def distance(self, row, col, target):
+        return self.field(target)[row * self.grid_size + col]
+    
+    def step(self, row, col, target):
+        """Akcja skracajaca droge do target (None, gdy juz na miejscu albo nieosiagalny)."""
+        dr = target[0] - row
+        dc = target[1] - col
+        if abs(dr) >= abs(dc):
+            greedy = "DOWN" if dr > 0 else "UP"
+        else:
+            greedy = "RIGHT" if dc > 0 else "LEFT"
+        if abs(dr) + abs(dc) == 1 and self.passable(*target):
+            return greedy  # cel obok - bez liczenia pola
+        
+        n = self.grid_size
+        field = self.field(target)
+        d = field[row * n + col]
+        if d <= 0:
+            return None
+        # Najpierw ruch zachlanny - na pustej planszy trasa jak bez przeszkod
+        for action in (greedy, "UP", "DOWN", "LEFT", "RIGHT"):
+            mr, mc = MOVES[action]
+            r, c = row + mr, col + mc
+            if 0 <= r < n and 0 <= c < n and field[r * n + c] == d - 1:
+                return action
+        return None
+
+
+def place_resources(grid_size, count, rng, base_pos, nav=None):
+    """count losowych pol na zasoby (bez bazy); z przeszkodami tylko pola osiagalne z bazy.
+    
+    Bez przeszkod losowanie jest takie jak dotad (te same pola dla tego
+    samego ziarna). ValueError, gdy pol jest za malo.
+    """
+    if nav is None:
+        free = grid_size * grid_size - 1
+        if count > free:
+            raise ValueError(f"Za malo wolnych pol ({free}) na {count} zasobow")
+        resources = set()
+        while len(resources) < count:
+            r, c = rng.randint(0, grid_size-1), rng.randint(0, grid_size-1)
+            if (r, c) != base_pos:
+                resources.add((r, c))
+        return resources
+    reachable = [divmod(i, grid_size) for i, d in enumerate(nav.field(base_pos)) if d > 0]
+    if count > len(reachable):
+        raise ValueError(f"Za malo pol osiagalnych z bazy ({len(reachable)}) na {count} zasobow")
+    return set(rng.sample(reachable, count))
+
+
+class GridRenderer:
+    """Rysuje plansze w terminalu sekwencjami ANSI.
+    
+    Pamieta siatke aktualnie wyswietlonych symboli i w kolejnych klatkach
+    przestawia kursor tylko na pola, ktore sie zmienily. Cala klatka idzie
+    na terminal jednym zapisem. Z ansi=False kazda klatka wypisywana jest
+    w calosci zwyklym tekstem (plik, potok, terminal bez ANSI).
+    """
+    
+    def __init__(self, rows, cols, out=None, ansi=True):
+        self.rows = rows
+        self.cols = cols
+        self.out = out or sys.stdout
+        self.ansi = ansi
+        self.screen = None  # siatka zajetosci: symbole widoczne na ekranie
+        self.cells = {}  # niepuste pola z poprzedniej klatki
+        self.header = []
+        self.footer = []
+    
+    def render(self, header, cells, footer):
+        if not self.ansi:
+            self.out.write("".join(line + "\n" for line in self.frame(header, cells, footer)) + "\n")
+            self.out.flush()
+            return
+        buf = []
+        if self.screen is None or len(header) != len(self.header):
+            self._full_redraw(buf, header, cells)
+        else:
+            top = len(header) + 2  # wiersz terminala (od 1) z pierwszym wierszem planszy
+            for r, c in self.cells.keys() | cells.keys():
+                symbol = cells.get((r, c), ".")
+                if self.screen[r][c] != symbol:
+                    self.screen[r][c] = symbol
+                    buf.append(f"\x1b[{top + r};{3 + 2 * c}H{symbol}")
+            self._update_lines(buf, 1, self.header, header)
+        
+        self._update_lines(buf, len(header) + self.rows + 3, self.footer, footer)
+        buf.append(f"\x1b[{len(header) + self.rows + 3 + len(footer)};1H")
+        
+        self.cells = cells
+        self.header = list(header)
+        self.footer = list(footer)
+        self.out.write("".join(buf))
+        self.out.flush()
+    
+    def frame(self, header, cells, footer):
+        """Linie calej klatki bez sekwencji sterujacych."""
+        grid = [["."] * self.cols for _ in range(self.rows)]
+        for (r, c), symbol in cells.items():
+            grid[r][c] = symbol
+        border = "+" + "-" * (self.cols * 2 + 1) + "+"
+        return [*header, border, *("| " + " ".join(row) + " |" for row in grid), border, *footer]
+    
+    def _full_redraw(self, buf, header, cells):
+        self.screen = [["."] * self.cols for _ in range(self.rows)]
+        for (r, c), symbol in cells.items():
+            self.screen[r][c] = symbol
+        border = "+" + "-" * (self.cols * 2 + 1) + "+"
+        buf.append("\x1b[2J\x1b[H")
+        buf.extend(line + "\n" for line in header)
+        buf.append(border + "\n")
+        buf.extend("| " + " ".join(row) + " |\n" for row in self.screen)
+        buf.append(border + "\n")
+        self.footer = []  # stopka zostanie narysowana od nowa
+    
+    def _update_lines(self, buf, first_row, old, new):
+        """Przepisuje linie tekstu, ktore sie zmienily (i czysci nadmiarowe)."""
+        for i in range(max(len(old), len(new))):
+            line = new[i] if i < len(new) else ""
+            if i >= len(old) or old[i] != line:
+                buf.append(f"\x1b[{first_row + i};1H{line}\x1b[K")
@@ -0,0 +1,88 @@
+import io
+import random
+import unittest
+from grid import MOVES, GridRenderer, NavGrid, place_resources, random_walls
+
+
+class TestGridRenderer(unittest.TestCase):
+    
+    def test_first_frame(self):
+        out = io.StringIO()
+        GridRenderer(3, 4, out).render(["Krok 1"], {(0, 0): "B", (2, 3): "R"}, ["stopka"])
+        text = out.getvalue()
+        self.assertTrue(text.startswith("\x1b[2J\x1b[H"))
+        self.assertIn("Krok 1\n+---------+\n| B . . . |\n| . . . . |\n| . . . R |\n+---------+\n", text)
+        self.assertIn("stopka", text)
+    
+    def test_next_frame_moves_cursor_to_changed_cells_only(self):
+        out = io.StringIO()
+        renderer = GridRenderer(3, 4, out)
+        renderer.render(["Krok 1"], {(0, 0): "B", (1, 1): "0"}, [])
+        out.seek(0)
+        out.truncate()
+        renderer.render(["Krok 1"], {(0, 0): "B", (1, 2): "0"}, [])
+        text = out.getvalue()
+        self.assertNotIn("\x1b[2J", text)
+        # Wiersz planszy r na ekranie: naglowek (1) + ramka (1) + r + 1; kolumna: 3 + 2 * c
+        self.assertIn("\x1b[4;5H.", text)
+        self.assertIn("\x1b[4;7H0", text)
+        self.assertNotIn("B", text)
+    
+    def test_plain_frames_without_ansi(self):
+        out = io.StringIO()
+        renderer = GridRenderer(2, 3, out, ansi=False)
+        renderer.render(["Krok 1"], {(0, 1): "R"}, ["stopka"])
+        renderer.render(["Krok 2"], {(1, 2): "*"}, [])
+        text = out.getvalue()
+        self.assertNotIn("\x1b", text)
+        self.assertEqual(text, "Krok 1\n+-------+\n| . R . |\n| . . . |\n+-------+\nstopka\n\n"
+                               "Krok 2\n+-------+\n| . . . |\n| . . * |\n+-------+\n\n")
+
+
+
+class TestNavGrid(unittest.TestCase):
+    
+    def test_distance_goes_around_wall(self):
+        # Pionowa sciana w kolumnie 2 z przejsciem tylko w ostatnim wierszu
+        nav = NavGrid(5, [(r, 2) for r in range(4)], base_pos=(0, 0))
+        self.assertEqual(nav.distance(0, 4, (0, 0)), 12)
+        self.assertEqual(nav.distance(0, 2, (0, 0)), -1)
+        row, col, steps = 0, 4, 0
+        while (row, col) != (0, 0):
+            dr, dc = MOVES[nav.step(row, col, (0, 0))]
+            row, col = row + dr, col + dc
+            self.assertTrue(nav.passable(row, col))
+            steps += 1
+        self.assertEqual(steps, 12)
+    
+    def test_lru_evicts_oldest_field(self):
+        nav = NavGrid(6, cache_size=2)
+        nav.field((0, 0))
+        nav.field((1, 1))
+        nav.field((0, 0))
+        nav.field((2, 2))
+        self.assertEqual(list(nav.fields), [(0, 0), (2, 2)])
+        self.assertEqual((nav.hits, nav.misses), (1, 3))
+
+
+class TestPlaceResources(unittest.TestCase):
+    
+    def test_without_walls(self):
+        resources = place_resources(4, 15, random.Random(0), (2, 2))
+        self.assertEqual(len(resources), 15)
+        self.assertNotIn((2, 2), resources)
+        with self.assertRaises(ValueError):
+            place_resources(4, 16, random.Random(0), (2, 2))  # 15 pol poza baza
+    
+    def test_only_reachable_cells(self):
+        rng = random.Random(0)
+        nav = NavGrid(8, random_walls(8, 3, rng, keep={(4, 4)}), (4, 4))
+        reachable = {divmod(i, 8) for i, d in enumerate(nav.base_field) if d > 0}
+        self.assertEqual(place_resources(8, len(reachable), rng, (4, 4), nav), reachable)
+        self.assertLessEqual(place_resources(8, 5, rng, (4, 4), nav), reachable)
+        with self.assertRaises(ValueError):
+            place_resources(8, len(reachable) + 1, rng, (4, 4), nav)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,238 @@
+"""
+Zapis epizodow do pliku .npz i odtwarzanie
+
+EpisodeRecorder zapisuje po kazdym kroku stan srodowiska
+(agent_system.Environment albo multi_agent_system.Environment):
+- positions (T, A, 2) - pozycje agentow,
+- carry     (T, A)    - czy agent niesie zasob,
+- resources (T, G*G/8) - maska lezacych zasobow spakowana bitowo (np.packbits),
+- known     (T, G*G/8) - maska znanych zasobow (tylko multi_agent_system),
+- delivered (T,)      - dostarczone do tej pory.
+
+Kroki zbierane sa w buforach po chunk_size i dopisywane do archiwum zip
+jako osobne tablice (positions_000000.npy, ...), wiec pamiec nie rosnie
+z dlugoscia epizodu. load_episode skleja fragmenty z powrotem, a replay
+rysuje zapis tym samym GridRendererem co symulacja.
+"""
+
+import argparse
+import os
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+import agent_system
+from grid import GridRenderer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "multi_agents"))
+import multi_agent_system  # noqa: E402
+
+
+def agents_of(env):
+    """Agenci srodowiska w stalej kolejnosci i ich rodzaje (A - agent, S - skaut, C - zbieracz)."""
+    if isinstance(env, multi_agent_system.Environment):
+        return env.scouts + env.collectors, "S" * len(env.scouts) + "C" * len(env.collectors)
+    return env.agents, "A" * len(env.agents)
+
+
+class EpisodeRecorder:
+    """Zapisuje kolejne stany srodowiska do pliku .npz fragmentami po chunk_size krokow."""
+
+    def __init__(self, path, env, chunk_size=1024, compress=True):
+        self.env = env
+        self.agents, self.kinds = agents_of(env)
+        self.chunk_size = chunk_size
+        n = env.grid_size
+        pos_dtype = np.int16 if n < 2 ** 15 else np.int32
+        packed = (n * n + 7) // 8
+        self.buffers = {
+            "positions": np.zeros((chunk_size, len(self.agents), 2), dtype=pos_dtype),
+            "carry": np.zeros((chunk_size, len(self.agents)), dtype=bool),
+            "resources": np.zeros((chunk_size, packed), dtype=np.uint8),
+            "delivered": np.zeros(chunk_size, dtype=np.int32),
+        }
+        if hasattr(env, "known_resources"):
+            self.buffers["known"] = np.zeros((chunk_size, packed), dtype=np.uint8)
+        self.mask = np.zeros(n * n, dtype=bool)
+        self.fill = 0
+        self.chunks = 0
+        self.steps = 0
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _pack(self, positions):
+        mask = self.mask
+        mask[:] = False
+        if positions:
+            n = self.env.grid_size
+            mask[np.fromiter((r * n + c for r, c in positions), dtype=np.int64, count=len(positions))] = True
+        return np.packbits(mask)
+
+    def record(self):
+        """Zapamietuje biezacy stan srodowiska jako kolejny krok."""
+        i = self.fill
+        buffers = self.buffers
+        env = self.env
+        if self.agents:
+            buffers["positions"][i] = [(a.row, a.col) for a in self.agents]
+            buffers["carry"][i] = [getattr(a, "carry", False) for a in self.agents]  # skauci nic nie nosza
+        buffers["resources"][i] = self._pack(env.resources)
+        buffers["delivered"][i] = env.total_delivered
+        if "known" in buffers:
+            buffers["known"][i] = self._pack(env.known_resources)
+        self.fill += 1
+        self.steps += 1
+        if self.fill == self.chunk_size:
+            self._flush()
+
+    def _write(self, name, array):
+        with self.zip.open(name + ".npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, np.asarray(array), allow_pickle=False)
+
+    def _flush(self):
+        if not self.fill:
+            return
+        for key, buffer in self.buffers.items():
+            self._write(f"{key}_{self.chunks:06d}", buffer[:self.fill])
+        self.chunks += 1
+        self.fill = 0
+
+    def close(self):
+        """Dopisuje ostatni fragment i metadane, zamyka plik."""
+        if self.zip is None:
+            return
+        self._flush()
+        env = self.env
+        nav = getattr(env, "nav", None)
+        obstacles = sorted(nav.obstacles) if nav is not None else []
+        self._write("grid_size", np.array(env.grid_size))
+        self._write("base_pos", np.array(env.base_pos))
+        self._write("kinds", np.array(self.kinds))
+        self._write("obstacles", np.array(obstacles, dtype=np.int32).reshape(-1, 2))
+        self.zip.close()
+        self.zip = None
+
+
+def record_episode(env, path, max_steps=agent_system.SIM_STEPS, chunk_size=1024):
+    """Prowadzi epizod do konca (albo max_steps krokow) i zapisuje go; zwraca liczbe krokow."""
+    steps = 0
+    with EpisodeRecorder(path, env, chunk_size) as recorder:
+        recorder.record()  # stan poczatkowy
+        while steps < max_steps and not env.done:
+            env.step()
+            steps += 1
+            recorder.record()
+    return steps
+
+
+def load_episode(path, unpack=True):
+    """Wczytuje zapis; przy unpack maski zasobow zamieniane sa na tablice (T, G, G) bool."""
+    with np.load(path) as data:
+        names = sorted(data.files)
+        chunks = {}
+        episode = {}
+        for name in names:
+            key, _, index = name.rpartition("_")
+            if index.isdigit() and len(index) == 6:
+                chunks.setdefault(key, []).append(data[name])
+            else:
+                episode[name] = data[name]
+
+    for key, parts in chunks.items():
+        episode[key] = np.concatenate(parts)
+    episode["grid_size"] = n = int(episode["grid_size"])
+    episode["base_pos"] = tuple(int(x) for x in episode["base_pos"])
+    episode["kinds"] = str(episode["kinds"])
+    if unpack:
+        for key in ("resources", "known"):
+            if key in episode:
+                bits = np.unpackbits(episode[key], axis=1, count=n * n)
+                episode[key] = bits.reshape(-1, n, n).astype(bool)
+    return episode
+
+
+def frame_cells(episode, t):
+    """Pola planszy w kroku t (jak Environment.cells)."""
+    cells = {tuple(pos): "#" for pos in episode["obstacles"]}
+    for r, c in zip(*np.nonzero(episode["resources"][t])):
+        cells[(int(r), int(c))] = "R"
+    if "known" in episode:
+        for r, c in zip(*np.nonzero(episode["known"][t])):
+            cells[(int(r), int(c))] = "!"
+    cells[episode["base_pos"]] = "B"
+    positions = episode["positions"][t]
+    carry = episode["carry"][t]
+    # Pierwszy agent na polu ma pierwszenstwo, skauci przed zbieraczami
+    for i in reversed(range(len(positions))):
+        kind = episode["kinds"][i]
+        if kind == "A":
+            symbol = "*" if carry[i] else str(i % 10)
+        elif kind == "C":
+            symbol = "*" if carry[i] else "C"
+        else:
+            continue
+        cells[(int(positions[i][0]), int(positions[i][1]))] = symbol
+    for i, kind in enumerate(episode["kinds"]):
+        if kind == "S":
+            cells[(int(positions[i][0]), int(positions[i][1]))] = "S"
+    return cells
+
+
+def replay(path, delay=0.1, every=1, out=None):
+    """Odtwarza zapisany epizod w terminalu (co every-ty krok)."""
+    episode = load_episode(path)
+    n = episode["grid_size"]
+    renderer = GridRenderer(n, n, out)
+    steps = len(episode["delivered"])
+    for t in list(range(0, steps, every)) + ([steps - 1] if (steps - 1) % every else []):
+        header = [f"=== ODTWARZANIE {os.path.basename(path)} === krok {t}/{steps - 1}",
+                  f"Dostarczone: {episode['delivered'][t]}"]
+        renderer.render(header, frame_cells(episode, t), [])
+        if delay:
+            time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zapis i odtwarzanie epizodow (.npz)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="nagraj epizod bez wyswietlania")
+    rec.add_argument("path")
+    rec.add_argument("--system", choices=["agents", "multi"], default="agents")
+    rec.add_argument("--grid", type=int, default=agent_system.GRID_SIZE)
+    rec.add_argument("--agents", type=int, default=agent_system.NUM_AGENTS,
+                     help="agenci (multi: tylu skautow i tylu zbieraczy)")
+    rec.add_argument("--resources", type=int, default=agent_system.NUM_RESOURCES)
+    rec.add_argument("--max-steps", type=int, default=10_000)
+    rec.add_argument("--seed", type=int, default=0)
+    rec.add_argument("--chunk", type=int, default=1024)
+    play = sub.add_parser("replay", help="odtworz nagrany epizod")
+    play.add_argument("path")
+    play.add_argument("--delay", type=float, default=0.1)
+    play.add_argument("--every", type=int, default=1, help="pokazuj co N-ty krok")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        replay(args.path, args.delay, args.every)
+        return
+
+    if args.system == "agents":
+        env = agent_system.Environment(args.grid, args.agents, args.resources, seed=args.seed)
+    else:
+        env = multi_agent_system.Environment(args.grid, args.agents, args.agents, args.resources,
+                                             seed=args.seed)
+    start = time.perf_counter()
+    steps = record_episode(env, args.path, args.max_steps, args.chunk)
+    elapsed = time.perf_counter() - start
+    print(f"Zapisano {steps} krokow do {args.path} ({os.path.getsize(args.path) / 1024:.1f} KiB) "
+          f"w {elapsed:.2f} s ({steps / elapsed if elapsed > 0 else 0:.0f} krokow/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import agent_system
+from recorder import EpisodeRecorder, load_episode, multi_agent_system, record_episode, replay
+
+
+class TestEpisodeRecorder(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "episode.npz")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_round_trip_across_chunks(self):
+        env = agent_system.Environment(grid_size=10, num_agents=3, num_resources=6, seed=0)
+        states = []
+        with EpisodeRecorder(self.path, env, chunk_size=7) as recorder:
+            for _ in range(20):
+                env.step()
+                recorder.record()
+                states.append(([(a.row, a.col) for a in env.agents], [a.carry for a in env.agents],
+                               set(env.resources)))
+        
+        episode = load_episode(self.path)
+        self.assertEqual(len(episode["positions"]), 20)
+        for t, (positions, carry, resources) in enumerate(states):
+            self.assertEqual(episode["positions"][t].tolist(), [list(p) for p in positions])
+            self.assertEqual(episode["carry"][t].tolist(), carry)
+            self.assertEqual({tuple(p) for p in np.argwhere(episode["resources"][t])}, resources)
+    
+    def test_multi_agent_episode(self):
+        env = multi_agent_system.Environment(grid_size=12, seed=3)
+        steps = record_episode(env, self.path, max_steps=2000, chunk_size=64)
+        episode = load_episode(self.path)
+        self.assertEqual(episode["kinds"], "SSCC")
+        self.assertEqual(len(episode["delivered"]), steps + 1)
+        self.assertEqual(episode["delivered"][-1], env.total_delivered)
+        self.assertEqual({tuple(p) for p in np.argwhere(episode["known"][-1])}, set(env.known_resources))
+    
+    def test_replay_renders_frames(self):
+        env = agent_system.Environment(grid_size=8, num_agents=2, num_resources=3, seed=1)
+        record_episode(env, self.path, max_steps=30)
+        out = io.StringIO()
+        replay(self.path, delay=0, every=10, out=out)
+        self.assertIn("ODTWARZANIE", out.getvalue())
+        self.assertIn("B", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,136 @@
+"""
+Zwektoryzowane srodowisko agentowe (NumPy)
+
+Ten sam model co agent_system.Environment, ale stan trzymany jest w tablicach:
+pozycje, flagi niesienia i liczniki dostarczen agentow oraz maska zasobow
+na planszy. Ruch, podnoszenie i dostarczanie zasobow dla wszystkich agentow
+to kilka operacji na tablicach - zamiast petli po obiektach Agent.
+
+Kolejnosc agentow jest zachowana: jesli kilku agentow wejdzie na ten sam
+zasob w jednym kroku, podnosi go agent o najnizszym ID (jak w petli w
+agent_system). Przy tych samych kierunkach eksploracji (step(directions))
+wyniki sa identyczne z wersja skalarna.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from agent_system import ACTIONS, GRID_SIZE, NUM_AGENTS, NUM_RESOURCES
+
+# Przesuniecia (wiersz, kolumna) w kolejnosci ACTIONS: UP, DOWN, LEFT, RIGHT
+D_ROW = np.array([-1, 1, 0, 0], dtype=np.int32)
+D_COL = np.array([0, 0, -1, 1], dtype=np.int32)
+UP, DOWN, LEFT, RIGHT = (ACTIONS.index(a) for a in ("UP", "DOWN", "LEFT", "RIGHT"))
+
+
+class VectorizedEnvironment:
+    def __init__(self, grid_size=GRID_SIZE, num_agents=NUM_AGENTS, num_resources=NUM_RESOURCES,
+                 base_pos=None, seed=None):
+        self.grid_size = grid_size
+        self.num_agents = num_agents
+        self.num_resources = num_resources
+        self.base_pos = base_pos or (grid_size // 2, grid_size // 2)
+        self.rng = np.random.default_rng(seed)
+        
+        self.rows = np.full(num_agents, self.base_pos[0], dtype=np.int32)
+        self.cols = np.full(num_agents, self.base_pos[1], dtype=np.int32)
+        self.carry = np.zeros(num_agents, dtype=bool)
+        self.delivered = np.zeros(num_agents, dtype=np.int64)
+        self.total_delivered = 0
+        
+        # Maska zasobow: losowe pola bez powtorzen, z pominieciem bazy
+        self.resources = np.zeros((grid_size, grid_size), dtype=bool)
+        base_index = self.base_pos[0] * grid_size + self.base_pos[1]
+        cells = self.rng.choice(grid_size * grid_size - 1, size=num_resources, replace=False)
+        cells[cells >= base_index] += 1
+        self.resources.flat[cells] = True
+    
+    @classmethod
+    def from_environment(cls, env):
+        """Kopiuje stan skalarnego agent_system.Environment (tylko bez scian)."""
+        if env.nav is not None:
+            raise ValueError("VectorizedEnvironment nie obsluguje przeszkod (Environment z walls)")
+        venv = cls(env.grid_size, len(env.agents), 0, env.base_pos)
+        venv.num_resources = env.num_resources
+        venv.rows[:] = [a.row for a in env.agents]
+        venv.cols[:] = [a.col for a in env.agents]
+        venv.carry[:] = [a.carry for a in env.agents]
+        venv.delivered[:] = [a.delivered for a in env.agents]
+        venv.total_delivered = env.total_delivered
+        for r, c in env.resources:
+            venv.resources[r, c] = True
+        return venv
+    
+    @property
+    def done(self):
+        return self.total_delivered >= self.num_resources
+    
+    def choose_actions(self, directions):
+        """Akcje wszystkich agentow: niosacy ida do bazy, reszta eksploruje."""
+        dr = self.base_pos[0] - self.rows
+        dc = self.base_pos[1] - self.cols
+        to_base = np.where(np.abs(dr) >= np.abs(dc),
+                           np.where(dr > 0, DOWN, UP),
+                           np.where(dc > 0, RIGHT, LEFT))
+        return np.where(self.carry, to_base, directions)
+    
+    def step(self, directions=None):
+        """Jeden krok dla wszystkich agentow.
+        
+        directions - kierunki eksploracji (indeksy ACTIONS); domyslnie losowane z self.rng
+        """
+        if directions is None:
+            directions = self.rng.integers(0, len(ACTIONS), size=self.num_agents)
+        actions = self.choose_actions(np.asarray(directions))
+        
+        # Ruch z pozostaniem w granicach planszy
+        new_rows = self.rows + D_ROW[actions]
+        new_cols = self.cols + D_COL[actions]
+        inside = (new_rows >= 0) & (new_rows < self.grid_size) & (new_cols >= 0) & (new_cols < self.grid_size)
+        self.rows = np.where(inside, new_rows, self.rows)
+        self.cols = np.where(inside, new_cols, self.cols)
+        
+        # Podniesienie zasobu - z kilku chetnych na tym samym polu wygrywa najnizsze ID
+        candidates = np.flatnonzero(~self.carry & self.resources[self.rows, self.cols])
+        if candidates.size:
+            cells = self.rows[candidates] * self.grid_size + self.cols[candidates]
+            _, first = np.unique(cells, return_index=True)
+            winners = candidates[first]
+            self.carry[winners] = True
+            self.resources[self.rows[winners], self.cols[winners]] = False
+        
+        # Dostarczenie do bazy
+        at_base = self.carry & (self.rows == self.base_pos[0]) & (self.cols == self.base_pos[1])
+        self.carry[at_base] = False
+        self.delivered[at_base] += 1
+        self.total_delivered += int(np.count_nonzero(at_base))
+
+
+def benchmark(grid_size=1000, num_agents=100_000, num_resources=50_000, steps=100, seed=0):
+    """Zwraca liczbe krokow na sekunde dla duzej populacji agentow."""
+    env = VectorizedEnvironment(grid_size, num_agents, num_resources, seed=seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step()
+    elapsed = time.perf_counter() - start
+    return steps / elapsed, env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zwektoryzowane srodowisko agentowe")
+    parser.add_argument("--grid", type=int, default=1000)
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--resources", type=int, default=50_000)
+    parser.add_argument("--steps", type=int, default=100)
+    args = parser.parse_args()
+    
+    rate, env = benchmark(args.grid, args.agents, args.resources, args.steps)
+    print(f"Plansza {args.grid}x{args.grid}, agenci: {args.agents}, zasoby: {args.resources}")
+    print(f"  Krokow na sekunde: {rate:.1f} ({rate * args.agents:.0f} ruchow agentow/s)")
+    print(f"  Dostarczone po {args.steps} krokach: {env.total_delivered}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from agent_system import Environment
+from vectorized_env import VectorizedEnvironment
+
+
+def scalar_state(env):
+    return ([(a.row, a.col) for a in env.agents], [a.carry for a in env.agents],
+            [a.delivered for a in env.agents], sorted(env.resources))
+
+
+def vector_state(venv):
+    return (list(zip(venv.rows.tolist(), venv.cols.tolist())), venv.carry.tolist(),
+            venv.delivered.tolist(), sorted(map(tuple, np.argwhere(venv.resources).tolist())))
+
+
+class TestVectorizedEnvironment(unittest.TestCase):
+    
+    def test_matches_scalar_under_shared_stream(self):
+        for seed in range(5):
+            env = Environment(grid_size=12, num_agents=20, num_resources=30, seed=seed)
+            venv = VectorizedEnvironment.from_environment(env)
+            stream = np.random.default_rng(seed)
+            for _ in range(300):
+                directions = stream.integers(0, 4, size=20)
+                env.step(directions.tolist())
+                venv.step(directions)
+                self.assertEqual(scalar_state(env), vector_state(venv))
+            self.assertEqual(env.total_delivered, venv.total_delivered)
+    
+    def test_lowest_id_wins_shared_resource(self):
+        env = Environment(grid_size=8, num_agents=3, num_resources=0, seed=0)
+        env.resources = {(3, 4)}
+        venv = VectorizedEnvironment.from_environment(env)
+        venv.step(np.zeros(3, dtype=int))  # wszyscy w gore na (3, 4)
+        self.assertEqual(venv.carry.tolist(), [True, False, False])
+        self.assertFalse(venv.resources.any())
+    
+    def test_walled_environment_rejected(self):
+        with self.assertRaises(ValueError):
+            VectorizedEnvironment.from_environment(Environment(grid_size=16, num_resources=5, seed=0, walls=4))
+    
+    def test_resources_never_on_base(self):
+        venv = VectorizedEnvironment(grid_size=3, num_agents=1, num_resources=8, seed=1)
+        self.assertEqual(int(venv.resources.sum()), 8)
+        self.assertFalse(venv.resources[venv.base_pos])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -10,11 +10,27 @@ Algorytm tyrana:
 5. Proces o najwyzszym ID zawsze wygrywa (stad nazwa "tyran")
 """
 
+import argparse
+import os
+import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
 import random
+import tracemalloc
 from enum import Enum
 
+# Model lacza wspolny z elekcja pierscieniowa
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ring"))
+from link_model import LinkModel, constant, exponential, normal, uniform  # noqa: E402,F401
+
+# Liczba wspoldzielonych blokad - procesy o id % LOCK_STRIPES rownym
+# sobie korzystaja z tej samej blokady (zamiast jednej blokady na proces)
+LOCK_STRIPES = 64
+
+# Liczba watkow rozsylajacych COORDINATOR (0 - rozsylanie po kolei)
+FANOUT_WORKERS = 16
+
 
 class MessageType(Enum):
     ELECTION = "ELECTION"
@@ -23,21 +39,38 @@ class MessageType(Enum):
 
 
 class Process:
+    # Bez __dict__ i bez wlasnej blokady - mniej pamieci na proces
+    __slots__ = ("id", "network", "coordinator_id", "alive", "in_election")
+    
     def __init__(self, process_id, network):
         self.id = process_id
         self.network = network
         self.coordinator_id = None
         self.alive = True
         self.in_election = False
-        self.lock = threading.Lock()
+    
+    @property
+    def lock(self):
+        """Blokada chroniaca stan procesu (wspoldzielona z innymi procesami)."""
+        return self.network.locks[self.id % len(self.network.locks)]
+    
+    def log(self, msg):
+        self.network.log(msg)
     
     def send_message(self, target_id, msg_type):
         """Wysyla wiadomosc do procesu o podanym ID."""
         target = self.network.get_process(target_id)
-        if target and target.alive:
-            print(f"  [P{self.id}] -> [P{target_id}]: {msg_type.value}")
-            return target.receive_message(self.id, msg_type)
-        return False
+        if not (target and target.alive):
+            return False
+        if not self.network.transmit(self.id, target_id):
+            self.log(f"  [P{self.id}] -> [P{target_id}]: {msg_type.value} zgubiona")
+            return False
+        self.log(f"  [P{self.id}] -> [P{target_id}]: {msg_type.value}")
+        ok = target.receive_message(self.id, msg_type)
+        if ok and msg_type == MessageType.ELECTION:
+            # Odpowiedz OK wraca tym samym laczem w druga strone
+            return self.network.transmit(target_id, self.id)
+        return ok
     
     def receive_message(self, sender_id, msg_type):
         """Odbiera wiadomosc od innego procesu."""
@@ -46,12 +79,12 @@ class Process:
         
         if msg_type == MessageType.ELECTION:
             # Odpowiedz OK i rozpocznij wlasna elekcje
-            print(f"  [P{self.id}] <- [P{sender_id}]: {msg_type.value} (odpowiadam OK)")
+            self.log(f"  [P{self.id}] <- [P{sender_id}]: {msg_type.value} (odpowiadam OK)")
             threading.Thread(target=self.start_election, daemon=True).start()
             return True  # OK
         
         elif msg_type == MessageType.COORDINATOR:
-            print(f"  [P{self.id}] <- [P{sender_id}]: Nowy koordynator to P{sender_id}")
+            self.log(f"  [P{self.id}] <- [P{sender_id}]: Nowy koordynator to P{sender_id}")
             with self.lock:
                 self.coordinator_id = sender_id
                 self.in_election = False
@@ -66,7 +99,7 @@ class Process:
                 return
             self.in_election = True
         
-        print(f"\n[P{self.id}] Rozpoczynam elekcje!")
+        self.log(f"\n[P{self.id}] Rozpoczynam elekcje!")
         
         # Wyslij ELECTION do procesow o wyzszych ID
         higher_processes = [p for p in self.network.processes if p.id > self.id]
@@ -81,30 +114,39 @@ class Process:
             self.become_coordinator()
         else:
             # Czekam na ogloszenie koordynatora
-            print(f"[P{self.id}] Otrzymalem OK, czekam na nowego koordynatora...")
+            self.log(f"[P{self.id}] Otrzymalem OK, czekam na nowego koordynatora...")
     
     def become_coordinator(self):
         """Oglasza sie jako nowy koordynator."""
-        print(f"\n*** [P{self.id}] ZOSTAJe NOWYM KOORDYNATOREM ***\n")
+        self.log(f"\n*** [P{self.id}] ZOSTAJe NOWYM KOORDYNATOREM ***\n")
         with self.lock:
             self.coordinator_id = self.id
             self.in_election = False
         
-        # Powiadom wszystkie procesy
-        for process in self.network.processes:
-            if process.id != self.id:
-                self.send_message(process.id, MessageType.COORDINATOR)
+        # Powiadom wszystkie procesy (rownolegle, jesli siec ma pule watkow)
+        self.network.broadcast(self.id, MessageType.COORDINATOR)
     
     def check_coordinator(self):
         """Sprawdza czy koordynator zyje."""
         if self.coordinator_id is None:
             return False
         coord = self.network.get_process(self.coordinator_id)
-        return coord is not None and coord.alive
+        return coord is not None and coord.alive and self.network.link.connected(self.id, coord.id)
 
 
 class Network:
-    def __init__(self, num_processes):
+    def __init__(self, num_processes, verbose=True, link=None, fanout_workers=FANOUT_WORKERS):
+        self.verbose = verbose
+        self.link = link or LinkModel()
+        self.messages = 0
+        self.stats_lock = threading.Lock()
+        self.fanout_workers = fanout_workers
+        self.pool = None  # tworzona przy pierwszym rozgloszeniu, zamykana w close()
+        self.pool_lock = threading.Lock()
+        self.closed = False
+        self.announcements = []  # historia ogloszen koordynatora
+        # Blokady nigdy nie sa zagniezdzone, wiec wspoldzielenie nie grozi zakleszczeniem
+        self.locks = [threading.Lock() for _ in range(max(1, min(LOCK_STRIPES, num_processes)))]
         self.processes = []
         for i in range(num_processes):
             self.processes.append(Process(i, self))
@@ -112,13 +154,98 @@ class Network:
         highest = max(self.processes, key=lambda p: p.id)
         for p in self.processes:
             p.coordinator_id = highest.id
-        print(f"Inicjalizacja: Koordynator to P{highest.id}\n")
+        self.log(f"Inicjalizacja: Koordynator to P{highest.id}\n")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Zamyka pule watkow rozgloszen (czeka na wysylane wiadomosci).
+        
+        Rozgloszenia po zamknieciu (np. z trwajacych jeszcze elekcji) ida po kolei.
+        """
+        with self.pool_lock:
+            self.closed = True
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def log(self, msg):
+        if self.verbose:
+            print(msg)
+    
+    def transmit(self, sender_id, target_id):
+        """Przesyla wiadomosc przez lacze; False, jesli przepadla.
+        
+        Opoznienie lacza jest prawdziwym uspieniem watku nadawcy.
+        """
+        with self.stats_lock:
+            self.messages += 1
+            delay = self.link.transmit(sender_id, target_id)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+    
+    def broadcast(self, sender_id, msg_type):
+        """Wysyla wiadomosc do wszystkich pozostalych procesow i czeka na potwierdzenia.
+        
+        Wiadomosci rozchodza sie rownolegle przez pule watkow, wiec czas
+        ogloszenia nie rosnie liniowo z liczba procesow. Po otrzymaniu
+        wszystkich potwierdzen zapisuje chwile zbieznosci klastra.
+        """
+        sender = self.get_process(sender_id)
+        targets = [p.id for p in self.processes if p.id != sender_id]
+        expected = sum(1 for pid in targets if self.processes[pid].alive)
+        started = time.perf_counter()
+        
+        results = None
+        if self.fanout_workers and len(targets) > 1:
+            with self.pool_lock:
+                if not self.closed:
+                    if self.pool is None:
+                        self.pool = ThreadPoolExecutor(max_workers=self.fanout_workers,
+                                                       thread_name_prefix="fanout")
+                    # map wysyla zadania od razu - po zwolnieniu blokady close() na nie poczeka
+                    results = self.pool.map(lambda pid: sender.send_message(pid, msg_type), targets)
+        if results is None:
+            results = [sender.send_message(pid, msg_type) for pid in targets]
+        results = list(results)
+        
+        converged_at = time.perf_counter()
+        acks = sum(1 for ok in results if ok)
+        announcement = {
+            "sender": sender_id,
+            "acks": acks,
+            "expected": expected,
+            "started": started,
+            "converged_at": converged_at,
+            "duration": converged_at - started,
+        }
+        with self.stats_lock:
+            self.announcements.append(announcement)
+        if acks == expected:
+            self.log(f"[P{sender_id}] Wszystkie zywe procesy ({acks}) potwierdzily - "
+                     f"klaster zbiezny po {announcement['duration'] * 1000:.1f} ms")
+        else:
+            self.log(f"[P{sender_id}] Potwierdzilo {acks}/{expected} zywych procesow")
+        return announcement
+    
+    def converged(self):
+        """Czy wszystkie zywe procesy uznaja najwyzszy zywy proces za koordynatora."""
+        alive = [p for p in self.processes if p.alive]
+        return bool(alive) and all(
+            p.coordinator_id == alive[-1].id and not p.in_election for p in alive)
     
     def get_process(self, process_id):
         """Zwraca proces o podanym ID."""
-        for p in self.processes:
-            if p.id == process_id:
-                return p
+        # Procesy maja ID rowne pozycji na liscie - dostep O(1)
+        if isinstance(process_id, int) and 0 <= process_id < len(self.processes):
+            return self.processes[process_id]
         return None
     
     def kill_process(self, process_id):
@@ -126,14 +253,14 @@ class Network:
         process = self.get_process(process_id)
         if process:
             process.alive = False
-            print(f"\n!!! Proces P{process_id} zostal zabity !!!\n")
+            self.log(f"\n!!! Proces P{process_id} zostal zabity !!!\n")
     
     def revive_process(self, process_id):
         """Wskrzesza proces o podanym ID."""
         process = self.get_process(process_id)
         if process:
             process.alive = True
-            print(f"\n!!! Proces P{process_id} zostal wskrzeszony !!!\n")
+            self.log(f"\n!!! Proces P{process_id} zostal wskrzeszony !!!\n")
             # Wskrzeszony proces rozpoczyna elekcje
             process.start_election()
 
@@ -202,6 +329,7 @@ class BullySimulator:
             time.sleep(0.5)  # Daj czas na propagacje wiadomosci
         
         self.print_final_state()
+        self.network.close()
     
     def print_final_state(self):
         """Wypisuje koncowy stan systemu."""
@@ -216,9 +344,95 @@ class BullySimulator:
         print("=" * 60)
 
 
+def memory_per_node(num_processes):
+    """Mierzy pamiec zajmowana przez siec (tracemalloc) w bajtach na proces."""
+    tracemalloc.start()
+    network = Network(num_processes, verbose=False)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del network
+    return current / num_processes
+
+
+def latency_sweep(latencies, num_processes=8, drop_prob=0.0, runs=5, timeout=5.0, seed=0):
+    """Jak czas zbieznosci elekcji i liczba wiadomosci rosna z opoznieniem laczy.
+    
+    Dla kazdego sredniego opoznienia (rozklad wykladniczy) zabija koordynatora,
+    P0 rozpoczyna elekcje i mierzony jest czas, po ktorym wszystkie zywe
+    procesy zgadzaja sie co do nowego koordynatora.
+    """
+    results = []
+    for mean in latencies:
+        times, messages, failed = [], [], 0
+        for i in range(runs):
+            link = LinkModel(latency=exponential(mean), drop_prob=drop_prob, seed=seed + i)
+            with Network(num_processes, verbose=False, link=link) as network:
+                network.kill_process(num_processes - 1)
+                start = time.perf_counter()
+                network.processes[0].start_election()
+                while not network.converged() and time.perf_counter() - start < timeout:
+                    time.sleep(0.001)
+                if network.converged():
+                    times.append(time.perf_counter() - start)
+                    messages.append(network.messages)
+                else:
+                    failed += 1
+        results.append({
+            "latency": mean,
+            "convergence": sum(times) / len(times) if times else None,
+            "messages": sum(messages) / len(messages) if messages else None,
+            "failed": failed,
+        })
+    return results
+
+
+def fanout_benchmark(sizes, latency=0.005, workers=FANOUT_WORKERS):
+    """Porownuje czas ogloszenia COORDINATOR: po kolei vs rownolegle."""
+    results = []
+    for n in sizes:
+        row = {"processes": n}
+        for name, fanout in (("sequential", 0), ("parallel", workers)):
+            with Network(n, verbose=False, link=LinkModel(latency=latency), fanout_workers=fanout) as network:
+                row[name] = network.broadcast(n - 1, MessageType.COORDINATOR)["duration"]
+        results.append(row)
+    return results
+
+
 def main():
-    # Symulacja z 5 procesami i maksymalnie 10 zdarzeniami
-    simulator = BullySimulator(num_processes=5, max_events=10)
+    parser = argparse.ArgumentParser(description="Symulacja algorytmu tyrana")
+    parser.add_argument("--processes", type=int, default=5)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--memory", action="store_true", help="zmierz pamiec na proces dla --processes")
+    parser.add_argument("--latency-sweep", action="store_true", help="zbieznosc elekcji w funkcji opoznienia")
+    parser.add_argument("--drop", type=float, default=0.0, help="prawdopodobienstwo zgubienia wiadomosci")
+    parser.add_argument("--fanout", action="store_true", help="czas ogloszenia COORDINATOR po kolei i rownolegle")
+    args = parser.parse_args()
+    
+    if args.fanout:
+        print("Ogloszenie COORDINATOR przy opoznieniu lacza 5 ms:")
+        for r in fanout_benchmark([8, 32, 128]):
+            print(f"  {r['processes']:4d} procesow: po kolei {r['sequential'] * 1000:7.1f} ms, "
+                  f"rownolegle {r['parallel'] * 1000:7.1f} ms")
+        return
+    
+    if args.latency_sweep:
+        print(f"Procesy: {args.processes}, utrata wiadomosci: {args.drop:.0%}")
+        for r in latency_sweep([0.001, 0.005, 0.01, 0.02], args.processes, args.drop):
+            if r["convergence"] is None:
+                print(f"  opoznienie {r['latency'] * 1000:6.1f} ms: brak zbieznosci")
+                continue
+            print(f"  opoznienie {r['latency'] * 1000:6.1f} ms: zbieznosc {r['convergence'] * 1000:8.1f} ms, "
+                  f"wiadomosci {r['messages']:6.1f}, nieudane {r['failed']}")
+        return
+    
+    if args.memory:
+        per_node = memory_per_node(args.processes)
+        print(f"Procesy: {args.processes}, pamiec: {per_node:.1f} B/proces, "
+              f"razem: {per_node * args.processes / 2**20:.1f} MiB")
+        return
+    
+    # Domyslnie symulacja z 5 procesami i maksymalnie 10 zdarzeniami
+    simulator = BullySimulator(num_processes=args.processes, max_events=args.events)
     simulator.run()
 
 
@@ -7,6 +7,7 @@ class TestProcess(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_process_creation(self):
         process = self.network.processes[0]
@@ -27,6 +28,7 @@ class TestNetwork(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_network_size(self):
         self.assertEqual(len(self.network.processes), 5)
@@ -56,6 +58,7 @@ class TestElection(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_check_coordinator_alive(self):
         process = self.network.processes[0]
@@ -100,6 +103,7 @@ class TestMessagePassing(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_send_to_alive_process(self):
         sender = self.network.processes[0]
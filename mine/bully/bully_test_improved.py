@@ -1,12 +1,14 @@
+import threading
 import unittest
 import time
-from bully import Process, Network, MessageType
+from bully import Process, Network, MessageType, LinkModel
 
 
 class TestProcess(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_process_creation(self):
         process = self.network.processes[0]
@@ -31,6 +33,7 @@ class TestNetwork(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_network_size(self):
         self.assertEqual(len(self.network.processes), 5)
@@ -67,8 +70,20 @@ class TestNetwork(unittest.TestCase):
         for i, p in enumerate(self.network.processes):
             self.assertEqual(p.id, i)
     
+    def test_get_negative_process(self):
+        self.assertIsNone(self.network.get_process(-1))
+    
+    def test_processes_are_slotted(self):
+        self.assertFalse(hasattr(self.network.processes[0], "__dict__"))
+    
+    def test_lock_is_shared_by_stripe(self):
+        network = Network(200)
+        self.addCleanup(network.close)
+        self.assertIs(network.processes[0].lock, network.processes[len(network.locks)].lock)
+    
     def test_highest_id_is_coordinator(self):
         network = Network(3)
+        self.addCleanup(network.close)
         for p in network.processes:
             self.assertEqual(p.coordinator_id, 2)
 
@@ -77,6 +92,7 @@ class TestElection(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_check_coordinator_alive(self):
         process = self.network.processes[0]
@@ -176,6 +192,7 @@ class TestMessagePassing(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_send_to_alive_process(self):
         sender = self.network.processes[0]
@@ -230,6 +247,7 @@ class TestBecomeCoordinator(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_become_coordinator_sets_self(self):
         process = self.network.processes[2]
@@ -263,11 +281,43 @@ class TestBecomeCoordinator(unittest.TestCase):
             if p.alive:
                 self.assertEqual(p.coordinator_id, 2)
 
+    
+    def test_announcement_acknowledged_by_all_alive(self):
+        self.network.kill_process(4)
+        self.network.kill_process(1)
+        self.network.processes[3].become_coordinator()
+        announcement = self.network.announcements[-1]
+        self.assertEqual(announcement["sender"], 3)
+        self.assertEqual(announcement["acks"], 2)
+        self.assertEqual(announcement["expected"], 2)
+        self.assertGreaterEqual(announcement["converged_at"], announcement["started"])
+    
+    def test_close_shuts_down_fanout_pool(self):
+        with Network(5, verbose=False) as network:
+            network.processes[4].become_coordinator()
+            self.assertTrue(any(t.name.startswith("fanout") for t in threading.enumerate()))
+        self.assertIsNone(network.pool)
+        self.assertFalse(any(t.name.startswith("fanout") for t in threading.enumerate()))
+        # Rozgloszenie po zamknieciu idzie po kolei i nie tworzy nowej puli
+        announcement = network.broadcast(3, MessageType.COORDINATOR)
+        self.assertEqual(announcement["acks"], 4)
+        self.assertIsNone(network.pool)
+    
+    def test_sequential_broadcast(self):
+        network = Network(5, fanout_workers=0)
+        self.addCleanup(network.close)
+        network.kill_process(4)
+        network.processes[3].become_coordinator()
+        for p in network.processes:
+            if p.alive:
+                self.assertEqual(p.coordinator_id, 3)
+
 
 class TestEdgeCases(unittest.TestCase):
     
     def setUp(self):
         self.network = Network(5)
+        self.addCleanup(self.network.close)
     
     def test_revive_starts_election(self):
         self.network.kill_process(4)
@@ -286,14 +336,57 @@ class TestEdgeCases(unittest.TestCase):
     
     def test_network_with_one_process(self):
         network = Network(1)
+        self.addCleanup(network.close)
         self.assertEqual(len(network.processes), 1)
         self.assertEqual(network.processes[0].coordinator_id, 0)
     
     def test_network_with_two_processes(self):
         network = Network(2)
+        self.addCleanup(network.close)
         self.assertEqual(network.processes[0].coordinator_id, 1)
         self.assertEqual(network.processes[1].coordinator_id, 1)
 
 
+
+class TestLinkModel(unittest.TestCase):
+    
+    def test_default_link_is_perfect(self):
+        network = Network(3)
+        self.addCleanup(network.close)
+        self.assertTrue(network.transmit(0, 1))
+        self.assertEqual(network.messages, 1)
+    
+    def test_dropped_message_gets_no_response(self):
+        network = Network(5, link=LinkModel(drop_prob=1.0))
+        self.addCleanup(network.close)
+        sender = network.processes[0]
+        self.assertFalse(sender.send_message(1, MessageType.COORDINATOR))
+        self.assertEqual(network.link.dropped, 1)
+    
+    def test_partition_hides_coordinator(self):
+        link = LinkModel()
+        network = Network(5, link=link)
+        self.addCleanup(network.close)
+        link.partition([0, 1, 2], [3, 4])
+        self.assertFalse(network.processes[0].check_coordinator())
+        link.heal()
+        self.assertTrue(network.processes[0].check_coordinator())
+    
+    def test_latency_delays_delivery(self):
+        network = Network(3, link=LinkModel(latency=0.05))
+        self.addCleanup(network.close)
+        start = time.perf_counter()
+        network.processes[0].send_message(1, MessageType.COORDINATOR)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+    
+    def test_election_converges_with_latency(self):
+        network = Network(5, link=LinkModel(latency=0.002))
+        self.addCleanup(network.close)
+        network.kill_process(4)
+        network.processes[0].start_election()
+        time.sleep(0.5)
+        self.assertTrue(network.converged())
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Diagnoza wsadowa - wiele pacjentow naraz w NumPy
+
+Objawy kodowane sa wzgledem slownika objawow wystepujacych w regulach
+(objawy spoza regul nie moga niczego spelnic, wiec sa pomijane):
+- do 64 objawow: kazdy pacjent to jedna maska bitowa uint64; regula jest
+  spelniona, gdy (maska & maska_reguly) == maska_reguly,
+- wiecej objawow: macierz bool (pacjenci x objawy); liczba spelnionych
+  warunkow to iloczyn macierzy z macierza regul.
+
+Kolejnosc regul jest zachowana - kazdy pacjent dostaje wniosek pierwszej
+spelnionej reguly, dokladnie jak RuleEngine.diagnose. Po zmianie bazy
+regul (engine.version) kodowanie i maski budowane sa od nowa.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from expert_system import RuleEngine, _engine
+
+
+class BatchDiagnoser:
+
+    def __init__(self, engine=_engine, chunk_cells=1 << 24):
+        self.engine = engine
+        self.chunk_cells = chunk_cells  # limit elementow macierzy pacjenci x reguly na raz
+        self._build()
+
+    def _build(self):
+        """Slownik objawow i maski/macierz regul dla biezacej wersji bazy."""
+        engine = self.engine
+        self.version = engine.version
+        self.vocabulary = {s: i for i, s in enumerate(sorted(engine.index))}
+        self.conclusions = np.array([c for _, c in engine.rules] + [engine.default], dtype=object)
+        self.sizes = np.array([len(c) for c, _ in engine.rules], dtype=np.int32)
+        self.bits = len(self.vocabulary) <= 64
+        if self.bits:
+            self.masks = np.array([self._mask(c) for c, _ in engine.rules], dtype=np.uint64)
+        else:
+            self.matrix = np.zeros((len(engine.rules), len(self.vocabulary)), dtype=np.float32)
+            for number, (conditions, _) in enumerate(engine.rules):
+                self.matrix[number, [self.vocabulary[s] for s in conditions]] = 1
+
+    def _mask(self, symptoms):
+        mask = 0
+        vocabulary = self.vocabulary
+        for s in symptoms:
+            column = vocabulary.get(s)
+            if column is not None:
+                mask |= 1 << column
+        return mask
+
+    def _sync(self):
+        # Jak DiagnosisCache: zmiana bazy regul (engine.version) - przebudowa
+        if self.engine.version != self.version:
+            self._build()
+
+    def encode(self, records):
+        """Lista list objawow -> maski uint64 (N,) albo macierz bool (N, V)."""
+        self._sync()
+        if self.bits:
+            return np.fromiter((self._mask(r) for r in records), dtype=np.uint64, count=len(records))
+        vocabulary = self.vocabulary
+        rows, cols = [], []
+        for i, record in enumerate(records):
+            for s in record:
+                column = vocabulary.get(s)
+                if column is not None:
+                    rows.append(i)
+                    cols.append(column)
+        encoded = np.zeros((len(records), len(vocabulary)), dtype=bool)
+        encoded[rows, cols] = True
+        return encoded
+
+    def first_match(self, encoded):
+        """Numer pierwszej spelnionej reguly dla kazdego pacjenta (len(rules), gdy zadna).
+
+        encoded musi pochodzic z encode po ostatniej zmianie bazy regul.
+        """
+        if self.engine.version != self.version:
+            raise ValueError("Baza regul zmienila sie po zakodowaniu - zakoduj pacjentow ponownie")
+        n = len(encoded)
+        none = len(self.engine.rules)
+        if self.bits:
+            result = np.full(n, none, dtype=np.int32)
+            # Od najnizszego priorytetu - regula wczesniejsza nadpisuje pozniejsza
+            for number in range(none - 1, -1, -1):
+                mask = self.masks[number]
+                result[(encoded & mask) == mask] = number
+            return result
+
+        result = np.empty(n, dtype=np.int32)
+        chunk = max(1, self.chunk_cells // max(1, none))
+        for start in range(0, n, chunk):
+            hits = encoded[start:start + chunk].astype(np.float32) @ self.matrix.T
+            fired = hits == self.sizes
+            first = fired.argmax(axis=1)
+            first[~fired.any(axis=1)] = none
+            result[start:start + chunk] = first
+        return result
+
+    def diagnose_encoded(self, encoded):
+        return self.conclusions[self.first_match(encoded)]
+
+    def diagnose_batch(self, records):
+        """Diagnozy dla listy pacjentow (tablica obiektow, jak diagnose dla kazdego)."""
+        return self.diagnose_encoded(self.encode(records))
+
+
+def benchmark(num_records=1_000_000, engine=_engine, seed=0):
+    """Czas diagnozy num_records pacjentow: wsadowo vs diagnose w petli."""
+    rng = random.Random(seed)
+    vocabulary = sorted(engine.index) + ["zmeczenie", "bol_glowy"]
+    records = [rng.sample(vocabulary, rng.randint(1, 5)) for _ in range(num_records)]
+    batch = BatchDiagnoser(engine)
+
+    start = time.perf_counter()
+    encoded = batch.encode(records)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = batch.diagnose_encoded(encoded)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [engine.diagnose(r) for r in records]
+    loop_time = time.perf_counter() - start
+    assert list(batched) == single
+    return {"records": num_records, "encode": encode_time, "batch": batch_time, "loop": loop_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diagnoza wsadowa (maski bitowe / NumPy)")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--rules", type=int, default=0, help="losowa baza o tylu regulach (0 - wbudowana)")
+    args = parser.parse_args()
+
+    engine = _engine
+    if args.rules:
+        from expert_system import random_rules
+        engine = RuleEngine(random_rules(args.rules, num_symptoms=200))
+    stats = benchmark(args.records, engine)
+    print(f"Pacjenci: {stats['records']}, reguly: {len(engine.rules)}")
+    print(f"  kodowanie: {stats['encode']:.2f} s, diagnoza wsadowa: {stats['batch']:.3f} s")
+    print(f"  diagnose w petli: {stats['loop']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
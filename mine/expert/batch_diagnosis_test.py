@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from batch_diagnosis import BatchDiagnoser
+from expert_system import RuleEngine, diagnose, random_rules
+
+
+class TestBatchDiagnoser(unittest.TestCase):
+    
+    def check(self, engine, vocabulary, chunk_cells=1 << 24):
+        rng = random.Random(7)
+        records = [rng.sample(vocabulary, rng.randint(0, 6)) for _ in range(2000)]
+        batch = BatchDiagnoser(engine, chunk_cells=chunk_cells)
+        self.assertEqual(list(batch.diagnose_batch(records)), [engine.diagnose(r) for r in records])
+        return batch
+    
+    def test_builtin_rules_use_bitmasks(self):
+        batch = BatchDiagnoser()
+        self.assertTrue(batch.bits)
+        records = [["goraczka", "kaszel", "bol_miesni", "katar"], ["katar", "kaszel"], ["nieznany"], []]
+        self.assertEqual(list(batch.diagnose_batch(records)), [diagnose(r) for r in records])
+    
+    def test_bitmask_path_matches_engine(self):
+        engine = RuleEngine(random_rules(300, num_symptoms=40, max_conditions=3, seed=1))
+        batch = self.check(engine, [f"objaw_{i}" for i in range(45)])
+        self.assertTrue(batch.bits)
+    
+    def test_matrix_path_matches_engine(self):
+        engine = RuleEngine(random_rules(300, num_symptoms=120, max_conditions=2, seed=2))
+        engine.add_rule([], "Zdrowy")
+        batch = self.check(engine, [f"objaw_{i}" for i in range(125)], chunk_cells=5000)
+        self.assertFalse(batch.bits)
+    
+    def test_rule_change_rebuilds(self):
+        engine = RuleEngine()
+        batch = BatchDiagnoser(engine)
+        encoded = batch.encode([["wysypka"]])
+        engine.add_rule(["wysypka"], "Ospa")
+        with self.assertRaises(ValueError):
+            batch.first_match(encoded)  # stare kodowanie nie pasuje do nowej bazy
+        records = [["wysypka", "goraczka"], ["katar", "kaszel"], []]
+        self.assertEqual(list(batch.diagnose_batch(records)), [engine.diagnose(r) for r in records])
+        # Przejscie z masek na macierz, gdy slownik przekroczy 64 objawy
+        for i in range(70):
+            engine.add_rule([f"objaw_{i}"], f"Choroba_{i}")
+        records.append(["objaw_69"])
+        self.assertEqual(list(batch.diagnose_batch(records)), [engine.diagnose(r) for r in records])
+        self.assertFalse(batch.bits)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
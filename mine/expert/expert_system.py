@@ -1,24 +1,303 @@
 """
 Prosty system ekspertowy - diagnoza chorob (reguly if-then)
+
+Reguly sa danymi: lista (objawy, diagnoza) sprawdzana w kolejnosci -
+wygrywa pierwsza regula, ktorej wszystkie objawy wystepuja u pacjenta.
+RuleEngine trzyma indeks odwrotny objaw -> reguly, wiec diagnoza
+dotyka tylko regul zawierajacych podane objawy, a nie calej bazy.
 """
 
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import random
+import time
+from collections import OrderedDict
+
+UNKNOWN = "Nieznana choroba - idz do lekarza"
+
+RULES = [
+    (("goraczka", "kaszel", "bol_miesni"), "Grypa"),
+    (("katar", "kichanie", "swedzenie_oczu"), "Alergia"),
+    (("goraczka", "utrata_wechu"), "COVID-19"),
+    (("nudnosci", "wymioty", "biegunka"), "Zatrucie pokarmowe"),
+    (("bol_gardla", "goraczka"), "Angina"),
+    (("katar", "kaszel"), "Przeziebienie"),
+]
+
+
+def load_rules(path):
+    """Reguly z pliku JSON: lista obiektow {"if": [objawy], "then": diagnoza}."""
+    with open(path, encoding="utf-8") as f:
+        return [(tuple(rule["if"]), rule["then"]) for rule in json.load(f)]
+
+
+class RuleEngine:
+    """Reguly w kolejnosci priorytetu z indeksem odwrotnym objaw -> numery regul.
+
+    Listy w indeksie sa rosnace, wiec przy liczeniu spelnionych warunkow
+    mozna przerwac liste, gdy numer reguly przekroczy najlepsza znaleziona.
+    """
+
+    def __init__(self, rules=RULES, default=UNKNOWN):
+        self.rules = []
+        self.index = {}
+        self.always = None  # pierwsza regula bez warunkow (jesli jest)
+        self.default = default
+        self.version = 0  # rosnie przy kazdej zmianie bazy regul
+        for conditions, conclusion in rules:
+            self.add_rule(conditions, conclusion)
+
+    def add_rule(self, conditions, conclusion):
+        """Dopisuje regule z najnizszym priorytetem; zwraca jej numer."""
+        conditions = tuple(dict.fromkeys(conditions))  # bez powtorzen
+        number = len(self.rules)
+        self.rules.append((conditions, conclusion))
+        for symptom in conditions:
+            self.index.setdefault(symptom, []).append(number)
+        if not conditions and self.always is None:
+            self.always = number
+        self.version += 1
+        return number
+
+    def first_match(self, symptoms):
+        """Numer pierwszej spelnionej reguly albo None."""
+        best = self.always
+        rules = self.rules
+        counts = {}
+        for symptom in set(symptoms):
+            for number in self.index.get(symptom, ()):
+                if best is not None and number >= best:
+                    break
+                count = counts.get(number, 0) + 1
+                counts[number] = count
+                if count == len(rules[number][0]):
+                    best = number
+        return best
+
+    def diagnose(self, symptoms):
+        number = self.first_match(symptoms)
+        return self.default if number is None else self.rules[number][1]
+
+
+class DiagnosisCache:
+    """Pamiec podreczna diagnoz przed RuleEngine.diagnose.
+
+    Kluczem jest frozenset objawow, wiec kolejnosc i powtorzenia nie maja
+    znaczenia. Wpisow jest najwyzej maxsize (usuwany najdawniej uzyty),
+    a przy ttl (sekundy) wpis wygasa po tym czasie. Zmiana bazy regul
+    (engine.version) czysci pamiec przy najblizszym zapytaniu.
+    """
+
+    def __init__(self, engine, maxsize=4096, ttl=None, clock=time.monotonic):
+        self.engine = engine
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # objawy -> (diagnoza, czas wpisu)
+        self.version = engine.version
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    def diagnose(self, symptoms):
+        if self.engine.version != self.version:
+            self.entries.clear()
+            self.version = self.engine.version
+            self.invalidations += 1
+        key = frozenset(symptoms)
+        now = self.clock() if self.ttl is not None else 0.0
+        entry = self.entries.get(key)
+        if entry is not None:
+            if self.ttl is None or now - entry[1] < self.ttl:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry[0]
+            self.expired += 1
+            del self.entries[key]
+        self.misses += 1
+        result = self.engine.diagnose(key)
+        self.entries[key] = (result, now)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        queries = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / queries if queries else 0.0,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+            "size": len(self.entries),
+        }
+
+
+MAGIC = b"EXPRULES1"
+
+
+def compiled_path(rules_path):
+    return rules_path + ".compiled"
+
+
+def _engine_state(engine):
+    return (engine.rules, engine.index, engine.always, engine.default, engine.version)
+
+
+def _engine_from_state(state):
+    engine = RuleEngine.__new__(RuleEngine)
+    engine.rules, engine.index, engine.always, engine.default, engine.version = state
+    return engine
+
+
+def compile_rules(rules_path, out_path=None):
+    """Buduje RuleEngine z pliku JSON i zapisuje go jako skompilowany artefakt.
+
+    Plik: MAGIC, skrot SHA-256 zrodla (32 bajty), zapiklowany stan
+    RuleEngine (reguly i gotowy indeks) jako zwykle dane - nie instancja
+    klasy, bo ta przy uruchomieniu z wiersza polecen bylaby
+    __main__.RuleEngine i inne moduly nie moglyby jej wczytac. Zapis przez
+    plik tymczasowy i os.replace, wiec rownolegle procesy nie zobacza
+    polowy pliku.
+    """
+    out_path = out_path or compiled_path(rules_path)
+    with open(rules_path, "rb") as f:
+        source = f.read()
+    # Te same napisy jako te same obiekty - pickle zapisze kazdy objaw raz
+    names = {}
+    rules = [(tuple(names.setdefault(s, s) for s in rule["if"]), rule["then"]) for rule in json.loads(source)]
+    engine = RuleEngine(rules)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + hashlib.sha256(source).digest())
+        pickle.dump(_engine_state(engine), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, out_path)
+    return engine
+
+
+def load_engine(rules_path, out_path=None):
+    """RuleEngine dla pliku regul - z artefaktu, jesli jego skrot zgadza sie ze zrodlem.
+
+    W przeciwnym razie (brak artefaktu, zmienione reguly) kompiluje od nowa.
+    """
+    out_path = out_path or compiled_path(rules_path)
+    with open(rules_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).digest()
+    try:
+        with open(out_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header = len(MAGIC) + len(digest)
+            if data[:len(MAGIC)] == MAGIC and data[len(MAGIC):header] == digest:
+                return _engine_from_state(pickle.loads(data[header:]))
+    except Exception:
+        pass  # nieczytelny albo niezgodny artefakt - jak nieaktualny
+    return compile_rules(rules_path, out_path)
+
+
+_engine = RuleEngine()
+_cache = DiagnosisCache(_engine)
+
+
 def diagnose(symptoms):
-    if "goraczka" in symptoms and "kaszel" in symptoms and "bol_miesni" in symptoms:
-        return "Grypa"
-    if "katar" in symptoms and "kichanie" in symptoms and "swedzenie_oczu" in symptoms:
-        return "Alergia"
-    if "goraczka" in symptoms and "utrata_wechu" in symptoms:
-        return "COVID-19"
-    if "nudnosci" in symptoms and "wymioty" in symptoms and "biegunka" in symptoms:
-        return "Zatrucie pokarmowe"
-    if "bol_gardla" in symptoms and "goraczka" in symptoms:
-        return "Angina"
-    if "katar" in symptoms and "kaszel" in symptoms:
-        return "Przeziebienie"
-    return "Nieznana choroba - idz do lekarza"
-
-# Test
-print(diagnose(["goraczka", "kaszel", "bol_miesni"]))  # Grypa
-print(diagnose(["katar", "kichanie", "swedzenie_oczu"]))  # Alergia
-print(diagnose(["goraczka", "utrata_wechu"]))  # COVID-19
-print(diagnose(["nudnosci", "wymioty", "biegunka"]))  # Zatrucie pokarmowe
\ No newline at end of file
+    return _cache.diagnose(symptoms)
+
+
+def random_rules(num_rules, num_symptoms=2000, max_conditions=5, seed=0):
+    """Losowa baza wiedzy do pomiarow."""
+    rng = random.Random(seed)
+    vocabulary = [f"objaw_{i}" for i in range(num_symptoms)]
+    return [(tuple(rng.sample(vocabulary, rng.randint(1, max_conditions))), f"choroba_{i}")
+            for i in range(num_rules)]
+
+
+def benchmark(sizes=(100, 1000, 10_000, 50_000), queries=2000, seed=0):
+    """Sredni czas diagnozy (us) przy rosnacej bazie: indeks vs przeglad wszystkich regul."""
+    rng = random.Random(seed)
+    vocabulary = [f"objaw_{i}" for i in range(2000)]
+    patients = [rng.sample(vocabulary, 4) for _ in range(queries)]
+    rows = []
+    for size in sizes:
+        rules = random_rules(size, seed=seed)
+        engine = RuleEngine(rules)
+        start = time.perf_counter()
+        for symptoms in patients:
+            engine.diagnose(symptoms)
+        indexed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for symptoms in patients:
+            present = set(symptoms)
+            next((d for conditions, d in rules if all(s in present for s in conditions)), UNKNOWN)
+        linear = time.perf_counter() - start
+        rows.append((size, indexed / queries * 1e6, linear / queries * 1e6))
+    return rows
+
+
+def cache_benchmark(queries=200_000, combinations=50, num_rules=10_000, seed=0):
+    """Powtarzajace sie zestawy objawow: czas zapytania (us) z pamiecia podreczna i bez."""
+    rng = random.Random(seed)
+    vocabulary = [f"objaw_{i}" for i in range(2000)]
+    common = [rng.sample(vocabulary, 4) for _ in range(combinations)]
+    patients = [rng.sample(rng.choice(common), 4) for _ in range(queries)]
+    engine = RuleEngine(random_rules(num_rules, seed=seed))
+    cache = DiagnosisCache(engine)
+
+    start = time.perf_counter()
+    for symptoms in patients:
+        engine.diagnose(symptoms)
+    plain = time.perf_counter() - start
+    start = time.perf_counter()
+    for symptoms in patients:
+        cache.diagnose(symptoms)
+    cached = time.perf_counter() - start
+    return plain / queries * 1e6, cached / queries * 1e6, cache.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="System ekspertowy - diagnoza chorob")
+    parser.add_argument("symptoms", nargs="*", help="objawy pacjenta")
+    parser.add_argument("--rules", help="plik JSON z regulami (domyslnie wbudowane); "
+                        "skompilowana wersja zapisywana obok jako .compiled")
+    parser.add_argument("--compile", action="store_true", help="tylko skompiluj --rules i zakoncz")
+    parser.add_argument("--benchmark", action="store_true", help="pomiar czasu diagnozy dla duzych baz")
+    parser.add_argument("--cache-benchmark", action="store_true",
+                        help="pomiar pamieci podrecznej przy powtarzajacych sie objawach")
+    args = parser.parse_args()
+
+    if args.cache_benchmark:
+        plain, cached, stats = cache_benchmark()
+        print(f"Bez pamieci: {plain:.2f} us, z pamiecia: {cached:.2f} us "
+              f"(trafienia: {stats['hit_rate']:.1%}, wpisy: {stats['size']})")
+        return
+
+    if args.benchmark:
+        for size, indexed, linear in benchmark():
+            print(f"Reguly: {size:6d} | indeks: {indexed:8.2f} us | przeglad: {linear:9.2f} us")
+        return
+    if args.compile:
+        if not args.rules:
+            parser.error("--compile wymaga --rules")
+        engine = compile_rules(args.rules)
+        print(f"Skompilowano {len(engine.rules)} regul do {compiled_path(args.rules)}")
+        return
+    engine = load_engine(args.rules) if args.rules else _engine
+    if args.symptoms:
+        print(engine.diagnose(args.symptoms))
+        return
+
+    # Test
+    print(engine.diagnose(["goraczka", "kaszel", "bol_miesni"]))  # Grypa
+    print(engine.diagnose(["katar", "kichanie", "swedzenie_oczu"]))  # Alergia
+    print(engine.diagnose(["goraczka", "utrata_wechu"]))  # COVID-19
+    print(engine.diagnose(["nudnosci", "wymioty", "biegunka"]))  # Zatrucie pokarmowe
+
+
+if __name__ == "__main__":
+    main()
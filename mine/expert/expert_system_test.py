@@ -0,0 +1,155 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from expert_system import (MAGIC, RULES, UNKNOWN, DiagnosisCache, RuleEngine, compiled_path, diagnose,
+                           load_engine, load_rules, random_rules)
+
+
+def linear_diagnose(rules, symptoms):
+    present = set(symptoms)
+    for conditions, conclusion in rules:
+        if all(s in present for s in conditions):
+            return conclusion
+    return UNKNOWN
+
+
+class TestRuleEngine(unittest.TestCase):
+    
+    def test_builtin_rules(self):
+        self.assertEqual(diagnose(["goraczka", "kaszel", "bol_miesni"]), "Grypa")
+        self.assertEqual(diagnose(["bol_gardla", "goraczka"]), "Angina")
+        self.assertEqual(diagnose(["katar", "kaszel"]), "Przeziebienie")
+        self.assertEqual(diagnose([]), UNKNOWN)
+    
+    def test_first_match_wins(self):
+        # Grypa i Przeziebienie sa spelnione - Grypa jest wczesniej
+        self.assertEqual(diagnose(["katar", "kaszel", "goraczka", "bol_miesni"]), "Grypa")
+    
+    def test_matches_linear_scan(self):
+        rules = random_rules(3000, num_symptoms=60, max_conditions=3, seed=1)
+        engine = RuleEngine(rules)
+        rng = random.Random(2)
+        vocabulary = [f"objaw_{i}" for i in range(60)]
+        for _ in range(500):
+            symptoms = rng.sample(vocabulary, rng.randint(0, 6))
+            self.assertEqual(engine.diagnose(symptoms), linear_diagnose(rules, symptoms))
+    
+    def test_add_rule_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rules.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{"if": c, "then": d} for c, d in RULES], f)
+            engine = RuleEngine(load_rules(path))
+        self.assertEqual(engine.diagnose(["goraczka", "utrata_wechu"]), "COVID-19")
+        engine.add_rule(["wysypka"], "Ospa")
+        self.assertEqual(engine.diagnose(["wysypka", "goraczka"]), "Ospa")
+        engine.add_rule([], "Zdrowy")
+        self.assertEqual(engine.diagnose(["brak"]), "Zdrowy")
+
+
+
+class TestDiagnosisCache(unittest.TestCase):
+    
+    def test_canonical_key_and_stats(self):
+        cache = DiagnosisCache(RuleEngine())
+        self.assertEqual(cache.diagnose(["kaszel", "katar"]), "Przeziebienie")
+        self.assertEqual(cache.diagnose(["katar", "kaszel", "katar"]), "Przeziebienie")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+    
+    def test_lru_eviction(self):
+        cache = DiagnosisCache(RuleEngine(), maxsize=2)
+        cache.diagnose(["a"])
+        cache.diagnose(["b"])
+        cache.diagnose(["a"])
+        cache.diagnose(["c"])
+        self.assertEqual(list(cache.entries), [frozenset(["a"]), frozenset(["c"])])
+    
+    def test_ttl(self):
+        now = [0.0]
+        cache = DiagnosisCache(RuleEngine(), ttl=10, clock=lambda: now[0])
+        cache.diagnose(["katar"])
+        now[0] = 5.0
+        cache.diagnose(["katar"])
+        now[0] = 20.0
+        cache.diagnose(["katar"])
+        self.assertEqual((cache.hits, cache.misses, cache.expired), (1, 2, 1))
+    
+    def test_rule_change_invalidates(self):
+        engine = RuleEngine()
+        cache = DiagnosisCache(engine)
+        self.assertEqual(cache.diagnose(["wysypka"]), UNKNOWN)
+        engine.add_rule(["wysypka"], "Ospa")
+        self.assertEqual(cache.diagnose(["wysypka"]), "Ospa")
+        self.assertEqual(cache.invalidations, 1)
+
+
+
+class TestCompiledRules(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rules.json")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def write_rules(self, rules):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump([{"if": list(c), "then": d} for c, d in rules], f)
+    
+    def test_artifact_reused_until_rules_change(self):
+        self.write_rules(RULES)
+        engine = load_engine(self.path)
+        self.assertTrue(os.path.exists(compiled_path(self.path)))
+        mtime = os.path.getmtime(compiled_path(self.path))
+        again = load_engine(self.path)
+        self.assertEqual(again.rules, engine.rules)
+        self.assertEqual(again.index, engine.index)
+        self.assertEqual(os.path.getmtime(compiled_path(self.path)), mtime)
+        
+        self.write_rules(RULES + [(("wysypka",), "Ospa")])
+        self.assertEqual(load_engine(self.path).diagnose(["wysypka"]), "Ospa")
+    
+    def test_corrupt_artifact_is_rebuilt(self):
+        self.write_rules(RULES)
+        with open(compiled_path(self.path), "wb") as f:
+            f.write(b"smieci")
+        self.assertEqual(load_engine(self.path).diagnose(["katar", "kaszel"]), "Przeziebienie")
+    
+    def test_cli_artifact_loads_in_other_modules(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        self.write_rules(RULES + [(("wysypka",), "Ospa")])
+        subprocess.run([sys.executable, "expert_system.py", "--rules", self.path, "--compile"], cwd=here,
+                       check=True, capture_output=True)
+        mtime = os.path.getmtime(compiled_path(self.path))
+        self.assertEqual(load_engine(self.path).diagnose(["wysypka"]), "Ospa")
+        self.assertEqual(os.path.getmtime(compiled_path(self.path)), mtime)  # wczytany, nie przebudowany
+        result = subprocess.run([sys.executable, "pipeline.py", "--rules", self.path, "--workers", "0"],
+                                cwd=here, input='["wysypka"]\n', capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout)["diagnosis"], "Ospa")
+    
+    def test_foreign_pickle_is_rebuilt(self):
+        self.write_rules(RULES)
+        load_engine(self.path)
+        with open(compiled_path(self.path), "rb") as f:
+            header = f.read(len(MAGIC) + 32)
+        with open(compiled_path(self.path), "wb") as f:
+            f.write(header + b"c__main__\nBrak\n)\x81.")  # klasa, ktorej nie ma w tym procesie
+        self.assertEqual(load_engine(self.path).diagnose(["katar", "kaszel"]), "Przeziebienie")
+    
+    def test_import_has_no_side_effects(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        result = subprocess.run([sys.executable, "-c", "import expert_system"], cwd=here,
+                                capture_output=True, text=True)
+        self.assertEqual(result.stdout, "")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
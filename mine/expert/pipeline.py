@@ -0,0 +1,216 @@
+"""
+Strumieniowa diagnoza pacjentow z plikow CSV/JSONL
+
+Wejscie czytane jest fragmentami po --chunk rekordow (plik albo "-" dla
+stdin), fragmenty diagnozowane sa w procesach roboczych (BatchDiagnoser),
+a wyniki wypisywane w kolejnosci wejscia. W locie jest najwyzej
+2 * workers fragmentow, wiec pamiec nie zalezy od rozmiaru pliku.
+
+Formaty:
+- JSONL: w kazdej linii obiekt z polem "symptoms" (lista) albo sama lista;
+  na wyjsciu ten sam obiekt z polem "diagnosis",
+- CSV: z naglowkiem; kolumna --column (domyslnie "symptoms") zawiera objawy
+  rozdzielone --sep (domyslnie ";"); na wyjsciu dochodzi kolumna "diagnosis".
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from batch_diagnosis import BatchDiagnoser
+from expert_system import _engine, load_engine
+
+_batch = None  # BatchDiagnoser procesu roboczego
+
+
+def _init(rules_path):
+    global _batch
+    _batch = BatchDiagnoser(load_engine(rules_path) if rules_path else _engine)
+
+
+def _symptoms(record, number):
+    symptoms = record.get("symptoms", []) if isinstance(record, dict) else record
+    if not isinstance(symptoms, list) or not all(isinstance(s, str) for s in symptoms):
+        raise ValueError(f"Rekord JSONL nr {number}: oczekiwano listy objawow (napisow) albo obiektu "
+                         f"z taka lista w polu \"symptoms\", jest {json.dumps(record, ensure_ascii=False)[:80]}")
+    return symptoms
+
+
+def _diagnose_jsonl(job):
+    first, lines = job
+    records = []
+    for i, line in enumerate(lines):
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Rekord JSONL nr {first + i}: niepoprawny JSON ({e})") from None
+    symptoms = [_symptoms(r, first + i) for i, r in enumerate(records)]
+    out = []
+    for record, diagnosis in zip(records, _batch.diagnose_batch(symptoms)):
+        if not isinstance(record, dict):
+            record = {"symptoms": record}
+        record["diagnosis"] = diagnosis
+        out.append(json.dumps(record, ensure_ascii=False))
+    return out
+
+
+def _diagnose_csv(job):
+    rows, column, sep = job
+    symptoms = [[s for s in row[column].split(sep) if s] if column < len(row) else [] for row in rows]
+    return [row + [diagnosis] for row, diagnosis in zip(rows, _batch.diagnose_batch(symptoms))]
+
+
+def detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+class Pipeline:
+    """Czyta fragmenty, diagnozuje (rownolegle) i zapisuje wyniki w kolejnosci wejscia."""
+
+    def __init__(self, rules_path=None, workers=0, chunk=10_000, fmt="jsonl", column="symptoms", sep=";"):
+        self.rules_path = rules_path
+        self.workers = workers
+        self.chunk = chunk
+        self.fmt = fmt
+        self.column = column
+        self.sep = sep
+        self.writer = None
+        self.records = 0
+        self.elapsed = 0.0
+
+    def _jsonl_jobs(self, source):
+        lines = (line for line in source if line.strip())
+        first = 1  # numer pierwszego rekordu fragmentu (do komunikatow bledow)
+        while True:
+            chunk = list(islice(lines, self.chunk))
+            if not chunk:
+                return
+            yield _diagnose_jsonl, (first, chunk), len(chunk)
+            first += len(chunk)
+
+    def _csv_jobs(self, reader, column):
+        while True:
+            rows = list(islice(reader, self.chunk))
+            if not rows:
+                return
+            yield _diagnose_csv, (rows, column, self.sep), len(rows)
+
+    def run(self, source, out, progress=None):
+        """Przetwarza cale wejscie; progress(pipeline) wolane po kazdym fragmencie."""
+        start = time.perf_counter()
+        if self.fmt == "jsonl":
+            jobs = self._jsonl_jobs(source)
+        else:
+            reader = csv.reader(source)
+            header = next(reader, None)
+            if header is None:
+                return self.stats()
+            if self.column not in header:
+                raise ValueError(f"Brak kolumny {self.column!r} w CSV; kolumny: {', '.join(header)}")
+            self.writer = csv.writer(out, lineterminator="\n")
+            self.writer.writerow(header + ["diagnosis"])
+            jobs = self._csv_jobs(reader, header.index(self.column))
+
+        pending = deque()
+        executor = None
+        if self.workers:
+            if self.rules_path:
+                load_engine(self.rules_path)  # kompilacja raz, procesy robocze tylko wczytuja
+            executor = ProcessPoolExecutor(self.workers, initializer=_init, initargs=(self.rules_path,))
+        else:
+            _init(self.rules_path)
+        try:
+            for fn, job, size in jobs:
+                if executor is None:
+                    pending.append((_done(fn(job)), size))
+                else:
+                    pending.append((executor.submit(fn, job), size))
+                # Ograniczona liczba fragmentow w locie - reszta wejscia czeka
+                while pending and (len(pending) > 2 * max(1, self.workers) or pending[0][0].done()):
+                    self._finish(out, pending.popleft(), start, progress)
+            while pending:
+                self._finish(out, pending.popleft(), start, progress)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.elapsed = time.perf_counter() - start
+        return self.stats()
+
+    def _finish(self, out, item, start, progress):
+        future, size = item
+        result = future.result()
+        if self.fmt == "jsonl":
+            out.write("\n".join(result) + "\n")
+        else:
+            self.writer.writerows(result)
+        self.records += size
+        self.elapsed = time.perf_counter() - start
+        if progress is not None:
+            progress(self)
+
+    def stats(self):
+        return {
+            "records": self.records,
+            "elapsed": self.elapsed,
+            "records_per_s": self.records / self.elapsed if self.elapsed > 0 else 0.0,
+        }
+
+
+class _done:
+    """Gotowy wynik z interfejsem Future (tryb bez procesow roboczych)."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def done(self):
+        return True
+
+    def result(self):
+        return self.value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strumieniowa diagnoza pacjentow (CSV/JSONL)")
+    parser.add_argument("input", nargs="?", default="-", help="plik wejsciowy albo - (stdin)")
+    parser.add_argument("-o", "--output", default="-", help="plik wyjsciowy albo - (stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="domyslnie wg rozszerzenia (stdin: jsonl)")
+    parser.add_argument("--rules", help="plik JSON z regulami (domyslnie wbudowane)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 - bez procesow roboczych")
+    parser.add_argument("--chunk", type=int, default=10_000, help="rekordow na fragment")
+    parser.add_argument("--column", default="symptoms", help="kolumna CSV z objawami")
+    parser.add_argument("--sep", default=";", help="separator objawow w kolumnie CSV")
+    parser.add_argument("--progress", action="store_true", help="licznik na stderr po kazdym fragmencie")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.input)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+
+    def progress(p):
+        print(f"\r{p.records} rekordow, {p.records / p.elapsed if p.elapsed else 0:.0f}/s",
+              end="", file=sys.stderr)
+
+    pipeline = Pipeline(args.rules, args.workers, args.chunk, fmt, args.column, args.sep)
+    try:
+        stats = pipeline.run(source, out, progress if args.progress else None)
+    except ValueError as error:  # zle wejscie (takze json.JSONDecodeError)
+        parser.error(str(error))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    if args.progress:
+        print(file=sys.stderr)
+    print(f"Rekordy: {stats['records']}, czas: {stats['elapsed']:.2f} s, "
+          f"{stats['records_per_s']:.0f} rekordow/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import io
+import json
+import random
+import unittest
+
+from expert_system import RULES, diagnose
+from pipeline import Pipeline
+
+
+def patients(n, seed=0):
+    rng = random.Random(seed)
+    vocabulary = sorted({s for conditions, _ in RULES for s in conditions}) + ["bol_glowy"]
+    return [rng.sample(vocabulary, rng.randint(0, 4)) for _ in range(n)]
+
+
+class TestPipeline(unittest.TestCase):
+    
+    def test_jsonl_keeps_order(self):
+        records = patients(500)
+        source = io.StringIO("".join(json.dumps({"id": i, "symptoms": r}) + "\n" for i, r in enumerate(records)))
+        out = io.StringIO()
+        stats = Pipeline(workers=2, chunk=37).run(source, out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(stats["records"], 500)
+        self.assertEqual([r["id"] for r in results], list(range(500)))
+        self.assertEqual([r["diagnosis"] for r in results], [diagnose(r) for r in records])
+    
+    def test_csv(self):
+        records = patients(100, seed=1)
+        source = io.StringIO("id,symptoms\n" + "".join(f"{i},{';'.join(r)}\n" for i, r in enumerate(records)))
+        out = io.StringIO()
+        Pipeline(workers=0, chunk=16, fmt="csv").run(source, out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "id,symptoms,diagnosis")
+        self.assertEqual([line.rsplit(",", 1)[1] for line in lines[1:]], [diagnose(r) for r in records])
+    
+    def test_missing_csv_column(self):
+        source = io.StringIO("id,objawy\n1,katar\n")
+        with self.assertRaisesRegex(ValueError, "'symptoms'.*id, objawy"):
+            Pipeline(workers=0, fmt="csv").run(source, io.StringIO())
+    
+    def test_invalid_jsonl_record(self):
+        for bad in ('"katar"', '{"symptoms": "katar"}', "42", '["katar", ["x"]]', '{"symptoms": [1]}', '["katar"'):
+            source = io.StringIO('["katar", "kaszel"]\n' + bad + "\n")
+            with self.assertRaisesRegex(ValueError, "nr 2"):
+                Pipeline(workers=0, chunk=1).run(source, io.StringIO())
+        with self.assertRaisesRegex(ValueError, "nr 2"):
+            Pipeline(workers=1).run(io.StringIO('[]\n"x"\n'), io.StringIO())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,183 @@
+"""
+Wnioskowanie w przod (forward chaining) na sieci Rete
+
+Kazda regula to ciag warunkow (faktow) i wniosek. Wniosek jest nowym
+faktem, wiec moze spelnic warunki innych regul (np. "infekcja" -> "Grypa").
+
+Siec:
+- pamiec alfa: fakt -> wezly beta, ktore go testuja,
+- wezly beta: lancuch warunkow reguly; reguly o wspolnym poczatku
+  (po posortowaniu warunkow) dziela te same wezly,
+- produkcje: numery regul podpiete pod ostatni wezel lancucha.
+
+Stan dopasowania (fakty, spelnione wezly) trzyma ReteSession, wiec dodanie
+faktu odwiedza tylko wezly, ktore ten fakt testuja, i ich potomkow - nie
+przelicza calej bazy regul.
+"""
+
+import argparse
+from collections import deque
+
+from expert_system import RULES, UNKNOWN
+
+
+class BetaNode:
+    __slots__ = ("fact", "parent", "children", "productions")
+
+    def __init__(self, fact, parent):
+        self.fact = fact
+        self.parent = parent
+        self.children = []
+        self.productions = []  # numery regul spelnionych w tym wezle
+
+
+class ReteNetwork:
+    """Skompilowana siec regul (wspolna dla wszystkich sesji)."""
+
+    def __init__(self, rules=RULES, default=UNKNOWN):
+        self.rules = []
+        self.root = BetaNode(None, None)
+        self.alpha = {}  # fakt -> wezly beta testujace ten fakt
+        self.nodes = {}  # (id rodzica, fakt) -> wezel (wspoldzielenie)
+        self.default = default
+        for conditions, conclusion in rules:
+            self.add_rule(conditions, conclusion)
+
+    def add_rule(self, conditions, conclusion):
+        """Dopisuje regule z najnizszym priorytetem; zwraca jej numer."""
+        number = len(self.rules)
+        conditions = tuple(sorted(set(conditions)))
+        self.rules.append((conditions, conclusion))
+        node = self.root
+        for fact in conditions:
+            key = (id(node), fact)
+            child = self.nodes.get(key)
+            if child is None:
+                child = BetaNode(fact, node)
+                node.children.append(child)
+                self.nodes[key] = child
+                self.alpha.setdefault(fact, []).append(child)
+            node = child
+        node.productions.append(number)
+        return number
+
+    @property
+    def final(self):
+        """Numery regul, ktorych wniosek nie jest warunkiem zadnej reguly (diagnozy)."""
+        return [n for n, (_, conclusion) in enumerate(self.rules) if conclusion not in self.alpha]
+
+    def session(self, facts=()):
+        session = ReteSession(self)
+        session.add_facts(facts)
+        return session
+
+    def diagnose(self, symptoms):
+        return self.session(symptoms).diagnosis()
+
+
+class ReteSession:
+    """Fakty jednej konsultacji; fakty mozna dodawac po jednym."""
+
+    def __init__(self, network):
+        self.network = network
+        self.facts = set()
+        self.satisfied = set()  # wezly beta, ktorych wszystkie warunki sa faktami
+        self.fired = []  # numery regul w kolejnosci odpalenia
+        self.activations = 0  # odwiedzone wezly beta (koszt wnioskowania)
+        self.final = set(network.final)
+        self.new = []
+        # Reguly bez warunkow odpalaja od razu, a ich wnioski moga spelniac inne reguly
+        agenda = deque()
+        self._activate(network.root, agenda)
+        self._run(agenda)
+
+    def add_fact(self, fact):
+        """Dodaje fakt i wnioskuje w przod; zwraca nowe wywnioskowane fakty."""
+        return self.add_facts([fact])
+
+    def add_facts(self, facts):
+        self.new = []
+        self._run(deque(facts))
+        return self.new
+
+    def _run(self, agenda):
+        alpha = self.network.alpha
+        root = self.network.root
+        while agenda:
+            fact = agenda.popleft()
+            if fact in self.facts:
+                continue
+            self.facts.add(fact)
+            for node in alpha.get(fact, ()):
+                if node.parent is root or node.parent in self.satisfied:
+                    self._activate(node, agenda)
+
+    def _activate(self, node, agenda):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            self.satisfied.add(node)
+            self.activations += 1
+            for number in node.productions:
+                self.fired.append(number)
+                conclusion = self.network.rules[number][1]
+                if conclusion not in self.facts:
+                    self.new.append(conclusion)
+                    agenda.append(conclusion)
+            for child in node.children:
+                if child.fact in self.facts:
+                    stack.append(child)
+
+    def diagnosis(self):
+        """Wniosek pierwszej (wg kolejnosci regul) odpalonej reguly koncowej."""
+        final = [n for n in self.fired if n in self.final]
+        if not final:
+            return self.network.default
+        return self.network.rules[min(final)][1]
+
+
+# Przyklad wnioskow posrednich: objawy -> infekcja/podraznienie -> diagnoza
+CHAINED_RULES = [
+    (("goraczka", "dreszcze"), "infekcja"),
+    (("infekcja", "kaszel", "bol_miesni"), "Grypa"),
+    (("infekcja", "utrata_wechu"), "COVID-19"),
+    (("katar", "kichanie"), "podraznienie_nosa"),
+    (("podraznienie_nosa", "swedzenie_oczu"), "Alergia"),
+    (("infekcja", "bol_gardla"), "Angina"),
+    (("katar", "kaszel"), "Przeziebienie"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konsultacja z wnioskowaniem w przod (Rete)")
+    parser.add_argument("symptoms", nargs="*", help="objawy dodawane po kolei (bez - tryb interaktywny)")
+    parser.add_argument("--chained", action="store_true", help="reguly z wnioskami posrednimi")
+    args = parser.parse_args()
+
+    network = ReteNetwork(CHAINED_RULES if args.chained else RULES)
+    session = network.session()
+    print(f"Reguly: {len(network.rules)}, wezly beta: {len(network.nodes)}")
+
+    def consult(symptom):
+        new = session.add_fact(symptom)
+        if new:
+            print(f"  wnioski: {', '.join(new)}")
+        print(f"  diagnoza: {session.diagnosis()} (odwiedzone wezly: {session.activations})")
+
+    if args.symptoms:
+        for symptom in args.symptoms:
+            print(f"+ {symptom}")
+            consult(symptom)
+        return
+    while True:
+        try:
+            symptom = input("objaw (Enter - koniec): ").strip()
+        except EOFError:
+            break
+        if not symptom:
+            break
+        consult(symptom)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import random
+import unittest
+
+from expert_system import RuleEngine, random_rules
+from rete import CHAINED_RULES, ReteNetwork
+
+
+class TestRete(unittest.TestCase):
+    
+    def test_matches_rule_engine(self):
+        rules = random_rules(2000, num_symptoms=50, max_conditions=3, seed=3)
+        network = ReteNetwork(rules)
+        engine = RuleEngine(rules)
+        rng = random.Random(4)
+        vocabulary = [f"objaw_{i}" for i in range(50)]
+        for _ in range(300):
+            symptoms = rng.sample(vocabulary, rng.randint(0, 6))
+            self.assertEqual(network.diagnose(symptoms), engine.diagnose(symptoms))
+    
+    def test_derived_facts(self):
+        session = ReteNetwork(CHAINED_RULES).session()
+        self.assertEqual(session.add_fact("goraczka"), [])
+        self.assertEqual(session.add_fact("dreszcze"), ["infekcja"])
+        session.add_fact("kaszel")
+        self.assertEqual(session.add_fact("bol_miesni"), ["Grypa"])
+        self.assertEqual(session.diagnosis(), "Grypa")
+    
+    def test_unconditional_rule_chains(self):
+        network = ReteNetwork([((), "sezon_grypowy"), (("sezon_grypowy",), "czujnosc"),
+                               (("czujnosc", "goraczka"), "Grypa")])
+        session = network.session()
+        self.assertEqual(session.facts, {"sezon_grypowy", "czujnosc"})
+        self.assertEqual(session.add_fact("goraczka"), ["Grypa"])
+        self.assertEqual(network.diagnose(["goraczka"]), "Grypa")
+    
+    def test_shared_nodes(self):
+        network = ReteNetwork([(("a", "b", "c"), "x"), (("a", "b", "d"), "y"), (("b", "a"), "z")])
+        # a -> b wspolne dla trzech regul, potem c i d
+        self.assertEqual(len(network.nodes), 4)
+    
+    def test_incremental_fact_touches_few_nodes(self):
+        rules = random_rules(5000, num_symptoms=500, max_conditions=4, seed=5)
+        session = ReteNetwork(rules).session(["objaw_1", "objaw_2", "objaw_3"])
+        before = session.activations
+        session.add_fact("objaw_4")
+        self.assertLess(session.activations - before, 50)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,286 @@
+"""
+Tryb aktorow dla systemu skautow i zbieraczy
+
+Kazdy skaut i zbieracz to osobne zadanie asyncio z wlasna skrzynka
+odbiorcza. Srodowisko w kazdym kroku wysyla wszystkim aktorom TICK i czeka,
+az kazdy go obsluzy (bariera kroku). Z workers > 0 sam ruch agenta
+wykonywany jest w puli watkow, wiec agenci naprawde konkuruja o tablice.
+
+Tablica (Blackboard) jest bezpieczna watkowo, ma numer wersji i powiadamia
+subskrybentow o kazdej zmianie. Zbieracze subskrybuja tablice - dzieki temu
+mozna zmierzyc opoznienie powiadomien i rywalizacje o blokade w zaleznosci
+od liczby agentow.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from multi_agent_system import Environment, KnownResources
+
+
+class CountingLock:
+    """threading.Lock liczacy pobrania, pobrania z czekaniem i czas czekania."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0
+
+    def acquire(self):
+        if not self.lock.acquire(blocking=False):
+            t0 = time.perf_counter()
+            self.lock.acquire()
+            self.contended += 1
+            self.wait_time += time.perf_counter() - t0
+        self.acquisitions += 1
+
+    def release(self):
+        self.lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Blackboard(KnownResources):
+    """KnownResources z blokada, wersja i powiadomieniami o zmianach.
+
+    Subskrybent to funkcja wywolywana po kazdej zmianie jako
+    callback(op, pos, version, sent), gdzie op to "add", "discard" albo "clear",
+    a sent to czas time.perf_counter() zmiany. Powiadomienia wysylane sa
+    po zwolnieniu blokady.
+    """
+
+    def __init__(self, positions=(), bucket=8):
+        self.lock = CountingLock()
+        self.subscribers = []
+        super().__init__(positions, bucket)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def _notify(self, op, pos, version):
+        sent = time.perf_counter()
+        for callback in list(self.subscribers):
+            callback(op, pos, version, sent)
+
+    def add(self, pos):
+        with self.lock:
+            before = self.version
+            super().add(pos)
+            version = self.version
+        if version != before:
+            self._notify("add", pos, version)
+
+    def discard(self, pos):
+        with self.lock:
+            before = self.version
+            super().discard(pos)
+            version = self.version
+        if version != before:
+            self._notify("discard", pos, version)
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+            version = self.version
+        self._notify("clear", None, version)
+
+    def nearest_k(self, row, col, k):
+        with self.lock:
+            return super().nearest_k(row, col, k)
+
+
+class ActorEnvironment(Environment):
+    """Environment, w ktorym agenci dzialaja jako aktorzy asyncio.
+
+    workers - 0: ruch agenta wykonuje jego zadanie asyncio,
+              N: ruch wykonywany w puli N watkow.
+    Zmiany wspolnego stanu swiata (zasoby na planszy, dostarczenia, mapa
+    odwiedzin skautow) ida pod world_lock; tablica ma wlasna blokade.
+    """
+    blackboard_class = Blackboard
+
+    def __init__(self, *args, workers=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = workers
+        self.world_lock = CountingLock()
+        self.latencies = []  # opoznienia powiadomien tablicy (s)
+        self.pending = 0
+        self.idle = None
+        self.error = None  # pierwszy wyjatek aktora, rzucany dalej z run()
+
+    def step_scout(self, scout, explore=None):
+        if scout.visited is not None:
+            # VisitedMap jest wspolna - wybor kubelka i celu pod ta sama
+            # blokada co visit w scan, inaczej claim iteruje po zmienianym slowniku
+            with self.world_lock:
+                action = scout.choose_action(explore)
+        else:
+            action = scout.choose_action(explore)
+        scout.move(action)
+        # Sprawdzenie pola i wpis na tablice musza byc atomowe wzgledem
+        # podniesienia zasobu - inaczej na tablicy zostalby "duch"
+        with self.world_lock:
+            scout.scan(self.resources)
+
+    def step_collector(self, collector):
+        action = collector.choose_action()
+        collector.move(action)
+        with self.world_lock:
+            self.interact(collector)
+
+    async def _actor(self, agent, mailbox, act, executor):
+        loop = asyncio.get_running_loop()
+        while True:
+            msg = await mailbox.get()
+            if msg[0] == "BOARD":
+                self.latencies.append(time.perf_counter() - msg[1])
+                continue
+            try:
+                if executor is None:
+                    act(agent)
+                else:
+                    await loop.run_in_executor(executor, act, agent)
+            except Exception as error:
+                # Aktor konczy prace; run() nie moze czekac na niego w nieskonczonosc
+                if self.error is None:
+                    self.error = error
+                self.idle.set()
+                return
+            finally:
+                self.pending -= 1
+                if self.pending == 0:
+                    self.idle.set()
+
+    async def run(self, max_steps=10_000):
+        """Uruchamia aktorow do konca epizodu albo max_steps krokow; zwraca statystyki.
+
+        Wyjatek z ruchu ktoregokolwiek aktora przerywa epizod i jest rzucany dalej.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(self.workers) if self.workers else None
+        self.idle = asyncio.Event()
+        self.error = None
+        board = self.known_resources
+        board.lock.reset_stats()
+        self.world_lock.reset_stats()
+        self.latencies = []
+
+        actors = [(scout, self.step_scout) for scout in self.scouts]
+        actors += [(collector, self.step_collector) for collector in self.collectors]
+        mailboxes = [asyncio.Queue() for _ in actors]
+        tasks = [asyncio.create_task(self._actor(agent, mailbox, act, executor))
+                 for (agent, act), mailbox in zip(actors, mailboxes)]
+
+        # Zbieracze dostaja powiadomienia o zmianach tablicy do swoich skrzynek
+        collector_boxes = mailboxes[len(self.scouts):]
+
+        def on_change(op, pos, version, sent):
+            for mailbox in collector_boxes:
+                loop.call_soon_threadsafe(mailbox.put_nowait, ("BOARD", sent))
+
+        board.subscribe(on_change)
+        t0 = time.perf_counter()
+        steps = 0
+        try:
+            while steps < max_steps and not self.done:
+                if self.assigner is not None:
+                    self.assigner.update()
+                self.idle.clear()
+                self.pending = len(actors)
+                for mailbox in mailboxes:
+                    mailbox.put_nowait(("TICK",))
+                if actors:
+                    await self.idle.wait()
+                if self.error is not None:
+                    raise self.error
+                steps += 1
+            # Powiadomienia z ostatniego kroku moga jeszcze czekac w kolejce petli
+            await asyncio.sleep(0)
+        finally:
+            elapsed = time.perf_counter() - t0
+            board.unsubscribe(on_change)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if executor is not None:
+                executor.shutdown()
+
+        latencies = sorted(self.latencies)
+        return {
+            "steps": steps,
+            "completed": self.done,
+            "steps_per_s": steps / elapsed if elapsed > 0 else 0.0,
+            "board": lock_stats(board.lock),
+            "world": lock_stats(self.world_lock),
+            "notifications": len(latencies),
+            "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p99": latencies[int(0.99 * (len(latencies) - 1))] if latencies else 0.0,
+        }
+
+
+def lock_stats(lock):
+    return {"acquisitions": lock.acquisitions, "contended": lock.contended, "wait_time": lock.wait_time}
+
+
+def run_actors(max_steps=10_000, workers=0, **config):
+    """Synchroniczna otoczka: jeden epizod w trybie aktorow."""
+    env = ActorEnvironment(workers=workers, **config)
+    return asyncio.run(env.run(max_steps))
+
+
+def contention_study(agent_counts=(4, 16, 64, 256), workers=(0, 4), grid_size=64, steps=200, seed=0):
+    """Rywalizacja o tablice i opoznienie powiadomien w zaleznosci od liczby agentow.
+
+    Polowa agentow to skauci (frontier), polowa zbieracze; zasobow jest tyle,
+    ile pol na boku planszy, wiec epizod nie konczy sie przed steps krokami.
+    """
+    rows = []
+    for count in agent_counts:
+        for pool in workers:
+            stats = run_actors(max_steps=steps, workers=pool, grid_size=grid_size,
+                               num_scouts=count // 2, num_collectors=count - count // 2,
+                               num_resources=grid_size, seed=seed, exploration="frontier")
+            stats.update(agents=count, workers=pool)
+            rows.append(stats)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skauci i zbieracze jako aktorzy - pomiar tablicy")
+    parser.add_argument("--agents", type=int, nargs="+", default=[4, 16, 64, 256])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4],
+                        help="watki puli (0 - ruch wykonywany w zadaniu asyncio)")
+    parser.add_argument("--grid", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def contention(lock):
+        share = lock["contended"] / lock["acquisitions"] if lock["acquisitions"] else 0.0
+        return f"{lock['acquisitions']:7d} {share:6.1%} {lock['wait_time'] * 1e3:8.2f}ms"
+
+    print(f"{'agenci':>6s} {'watki':>5s} | {'kroki/s':>8s} | {'tablica: blokady, czekalo, czas':>31s} | "
+          f"{'swiat: blokady, czekalo, czas':>29s} | {'powiadom.':>9s} {'sr. opozn.':>10s} {'p99':>9s}")
+    for row in contention_study(args.agents, args.workers, args.grid, args.steps, args.seed):
+        print(f"{row['agents']:6d} {row['workers']:5d} | {row['steps_per_s']:8.1f} | "
+              f"{contention(row['board']):>31s} | {contention(row['world']):>29s} | "
+              f"{row['notifications']:9d} {row['latency_mean'] * 1e3:8.3f}ms {row['latency_p99'] * 1e3:7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import asyncio
+import sys
+import unittest
+from actor_env import ActorEnvironment, Blackboard, run_actors
+
+
+class TestBlackboard(unittest.TestCase):
+    
+    def test_notifies_only_on_change(self):
+        board = Blackboard()
+        events = []
+        board.subscribe(lambda op, pos, version, sent: events.append((op, pos, version)))
+        board.add((1, 2))
+        board.add((1, 2))
+        board.discard((3, 3))
+        board.discard((1, 2))
+        self.assertEqual(events, [("add", (1, 2), 1), ("discard", (1, 2), 2)])
+    
+    def test_counts_lock_acquisitions(self):
+        board = Blackboard([(0, 0), (5, 5)])
+        board.lock.reset_stats()
+        board.nearest(1, 1)
+        board.add((2, 2))
+        self.assertEqual(board.lock.acquisitions, 2)
+        self.assertEqual(board.lock.contended, 0)
+
+
+class TestActorEnvironment(unittest.TestCase):
+    
+    def test_episode_completes(self):
+        for workers in (0, 3):
+            stats = run_actors(max_steps=5_000, workers=workers, grid_size=16, num_scouts=3,
+                               num_collectors=3, num_resources=12, seed=1, exploration="frontier")
+            self.assertTrue(stats["completed"], workers)
+            self.assertGreater(stats["notifications"], 0)
+    
+    def test_frontier_scouts_in_threads(self):
+        # Czeste przelaczanie watkow - wyscig claim/visit na VisitedMap wychodzil tu od razu
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            env = ActorEnvironment(grid_size=64, num_scouts=16, num_collectors=2, num_resources=64,
+                                   seed=0, workers=4, exploration="frontier")
+            asyncio.run(asyncio.wait_for(env.run(max_steps=200), 30))
+        finally:
+            sys.setswitchinterval(interval)
+        visited = env.visited
+        self.assertEqual(visited.remaining, visited.cells.count(0))
+        self.assertEqual(sum(visited.unvisited.values()), visited.remaining)
+    
+    def test_actor_error_is_raised(self):
+        for workers in (0, 2):
+            env = ActorEnvironment(grid_size=16, num_scouts=2, num_collectors=2, num_resources=8,
+                                   seed=1, workers=workers)
+            
+            def broken(collector):
+                if collector.id == 1:
+                    raise ZeroDivisionError("zepsuty zbieracz")
+                ActorEnvironment.step_collector(env, collector)
+            env.step_collector = broken
+            with self.assertRaises(ZeroDivisionError):
+                asyncio.run(asyncio.wait_for(env.run(max_steps=100), 30))
+    
+    def test_board_stays_consistent(self):
+        env = ActorEnvironment(grid_size=16, num_scouts=4, num_collectors=4, num_resources=20,
+                               seed=2, workers=4)
+        asyncio.run(env.run(max_steps=300))
+        self.assertLessEqual(set(env.known_resources), env.resources)
+        carried = sum(c.carry for c in env.collectors)
+        self.assertEqual(env.total_delivered + carried + len(env.resources), 20)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
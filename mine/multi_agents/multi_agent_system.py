@@ -1,6 +1,13 @@
+import argparse
+import heapq
+import os
 import random
+import sys
 import time
-import os
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "agents"))
+from grid import GridRenderer, NavGrid, place_resources, random_walls  # noqa: E402
 
 GRID_SIZE = 8
 NUM_SCOUTS = 2
@@ -9,19 +16,270 @@ NUM_RESOURCES = 6
 BASE_POS = (4, 4)
 SIM_STEPS = 50
 
-# Wspolna tablica - znane zasoby
-known_resources = set()
+ACTIONS = ["UP", "DOWN", "LEFT", "RIGHT"]
+
+
+class KnownResources(set):
+    """Zbior znanych zasobow (blackboard) z indeksem przestrzennym.
+    
+    Oprocz zwyklego zbioru pozycji trzyma kubelki bucket x bucket pol,
+    aktualizowane przy kazdej zmianie - wszystkie metody zmieniajace zbior
+    (update, pop, |=, -= ...) ida przez add/discard. Najblizszy zasob (Manhattan)
+    szukany jest pierscieniami kubelkow wokol zapytania, wiec koszt zalezy
+    od zageszczenia zasobow w poblizu, a nie od ich liczby.
+    """
+    
+    def __init__(self, positions=(), bucket=8):
+        super().__init__()
+        self.bucket = bucket
+        self.buckets = {}
+        self.version = 0  # rosnie przy kazdej zmianie zawartosci
+        for pos in positions:
+            self.add(pos)
+    
+    def _key(self, pos):
+        return pos[0] // self.bucket, pos[1] // self.bucket
+    
+    def add(self, pos):
+        if pos not in self:
+            super().add(pos)
+            self.buckets.setdefault(self._key(pos), set()).add(pos)
+            self.version += 1
+    
+    def discard(self, pos):
+        if pos in self:
+            super().discard(pos)
+            key = self._key(pos)
+            cell = self.buckets[key]
+            cell.discard(pos)
+            if not cell:
+                del self.buckets[key]
+            self.version += 1
+    
+    def remove(self, pos):
+        if pos not in self:
+            raise KeyError(pos)
+        self.discard(pos)
+    
+    def clear(self):
+        super().clear()
+        self.buckets.clear()
+        self.version += 1
+    
+    def pop(self):
+        for pos in self:
+            self.discard(pos)
+            return pos
+        raise KeyError("pop from an empty set")
+    
+    def update(self, *others):
+        for other in others:
+            for pos in other:
+                self.add(pos)
+    
+    def difference_update(self, *others):
+        for other in others:
+            for pos in list(other):
+                self.discard(pos)
+    
+    def intersection_update(self, *others):
+        keep = set(self).intersection(*others)
+        for pos in [pos for pos in self if pos not in keep]:
+            self.discard(pos)
+    
+    def symmetric_difference_update(self, other):
+        for pos in set(other):
+            if pos in self:
+                self.discard(pos)
+            else:
+                self.add(pos)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+    
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+    
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+    
+    def nearest(self, row, col):
+        """Najblizszy znany zasob w metryce Manhattan (None, gdy brak)."""
+        found = self.nearest_k(row, col, 1)
+        return found[0] if found else None
+    
+    def nearest_k(self, row, col, k):
+        """k najblizszych znanych zasobow, od najblizszego."""
+        def dist(r):
+            return abs(r[0] - row) + abs(r[1] - col)
+        
+        if len(self) <= 32:
+            # Przy kilku zasobach prosty przeglad jest najtanszy
+            return heapq.nsmallest(k, self, key=dist)
+        b = self.bucket
+        qr, qc = row // b, col // b
+        found = []
+        ring = 0
+        while True:
+            for key in self._ring(qr, qc, ring):
+                found.extend(self.buckets.get(key, ()))
+            # Kazde pole w pierscieniu ring+1 jest dalej niz ring*b
+            if len(found) >= min(k, len(self)):
+                best = heapq.nsmallest(k, found, key=dist)
+                if dist(best[-1]) <= ring * b:
+                    return best
+            ring += 1
+    
+    @staticmethod
+    def _ring(qr, qc, ring):
+        """Klucze kubelkow w odleglosci Czebyszewa ring od (qr, qc)."""
+        if ring == 0:
+            yield qr, qc
+            return
+        for dc in range(-ring, ring + 1):
+            yield qr - ring, qc + dc
+            yield qr + ring, qc + dc
+        for dr in range(-ring + 1, ring):
+            yield qr + dr, qc - ring
+            yield qr + dr, qc + ring
+
+
+def step_towards(row, col, target):
+    """Krok (zachlanny, Manhattan) z (row, col) w strone target."""
+    dr = target[0] - row
+    dc = target[1] - col
+    if abs(dr) >= abs(dc):
+        return "DOWN" if dr > 0 else "UP"
+    return "RIGHT" if dc > 0 else "LEFT"
+
+
+def navigate(agent, target):
+    """Krok agenta w strone target - po polu odleglosci, gdy na planszy sa przeszkody."""
+    if agent.nav is not None:
+        return agent.nav.step(agent.row, agent.col, target) or "WAIT"
+    return step_towards(agent.row, agent.col, target)
+
+
+class VisitedMap:
+    """Wspolna mapa odwiedzonych pol do eksploracji frontier.
+    
+    Plansza jest podzielona na kubelki bucket x bucket z licznikiem
+    nieodwiedzonych pol. Skaut rezerwuje najblizszy kubelek, ktory ma jeszcze
+    nieodwiedzone pola i nie jest zajety przez innego skauta, po czym
+    przeszukuje go do konca. Skauci rozchodza sie wiec po planszy zamiast
+    chodzic po wlasnych i cudzych sladach.
+    """
+    
+    def __init__(self, grid_size, bucket=8):
+        self.grid_size = grid_size
+        self.bucket = bucket
+        self.cells = bytearray(grid_size * grid_size)
+        self.remaining = grid_size * grid_size
+        self.unvisited = {}  # kubelek -> liczba nieodwiedzonych pol
+        for r in range(0, grid_size, bucket):
+            for c in range(0, grid_size, bucket):
+                size = min(bucket, grid_size - r) * min(bucket, grid_size - c)
+                self.unvisited[(r // bucket, c // bucket)] = size
+        self.claims = {}  # id skauta -> kubelek
+    
+    def is_visited(self, row, col):
+        return self.cells[row * self.grid_size + col] == 1
+    
+    def visit(self, row, col):
+        i = row * self.grid_size + col
+        if self.cells[i]:
+            return False
+        self.cells[i] = 1
+        self.remaining -= 1
+        key = (row // self.bucket, col // self.bucket)
+        self.unvisited[key] -= 1
+        if not self.unvisited[key]:
+            del self.unvisited[key]
+        return True
+    
+    def claim(self, scout_id, row, col):
+        """Rezerwuje dla skauta najblizszy kubelek z nieodwiedzonymi polami.
+        
+        Kubelki zajete przez innych skautow wybierane sa dopiero wtedy, gdy
+        wolnych juz nie ma. Zwraca klucz kubelka albo None, gdy wszystko odwiedzone.
+        """
+        self.claims.pop(scout_id, None)
+        taken = set(self.claims.values())
+        penalty = 2 * self.grid_size
+        best, best_dist = None, None
+        for key in self.unvisited:
+            dist = self._bucket_dist(key, row, col) + (penalty if key in taken else 0)
+            if best_dist is None or dist < best_dist:
+                best, best_dist = key, dist
+        if best is not None:
+            self.claims[scout_id] = best
+        return best
+    
+    def _bucket_dist(self, key, row, col):
+        """Odleglosc Manhattan od (row, col) do prostokata kubelka."""
+        b = self.bucket
+        top, left = key[0] * b, key[1] * b
+        bottom = min(top + b, self.grid_size) - 1
+        right = min(left + b, self.grid_size) - 1
+        return max(top - row, 0, row - bottom) + max(left - col, 0, col - right)
+    
+    def nearest_in_bucket(self, key, row, col):
+        """Najblizsze nieodwiedzone pole w kubelku (None, gdy brak)."""
+        b, n = self.bucket, self.grid_size
+        # Zwykle najblizsze jest pole obok - wtedy nie trzeba przegladac kubelka
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if (0 <= r < n and 0 <= c < n and (r // b, c // b) == key
+                    and not self.cells[r * n + c]):
+                return r, c
+        best, best_dist = None, None
+        for r in range(key[0] * b, min(key[0] * b + b, n)):
+            base = r * n
+            for c in range(key[1] * b, min(key[1] * b + b, n)):
+                if not self.cells[base + c]:
+                    dist = abs(r - row) + abs(c - col)
+                    if best_dist is None or dist < best_dist:
+                        best, best_dist = (r, c), dist
+        return best
 
 
 class Scout:
     
-    def __init__(self, agent_id):
+    def __init__(self, agent_id, known_resources, grid_size=GRID_SIZE, base_pos=BASE_POS, rng=random,
+                 visited=None, nav=None):
         self.id = agent_id
-        self.row, self.col = BASE_POS
+        self.known_resources = known_resources  # wspolna tablica (blackboard)
+        self.grid_size = grid_size
+        self.rng = rng
+        self.row, self.col = base_pos
         self.symbol = "S"
+        self.visited = visited  # VisitedMap w trybie frontier, None - losowy spacer
+        self.nav = nav  # NavGrid, gdy na planszy sa przeszkody
+        self.target = None
     
-    def choose_action(self):
-        return random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+    def choose_action(self, explore=None):
+        if self.visited is not None:
+            return self._frontier_action()
+        if explore is not None:
+            return ACTIONS[explore]
+        return self.rng.choice(ACTIONS)
+    
+    def _frontier_action(self):
+        visited = self.visited
+        if self.target is None or visited.is_visited(*self.target):
+            key = visited.claims.get(self.id)
+            if key not in visited.unvisited:
+                key = visited.claim(self.id, self.row, self.col)
+            if key is None:
+                return "WAIT"  # cala plansza odwiedzona
+            self.target = visited.nearest_in_bucket(key, self.row, self.col)
+        return navigate(self, self.target)
     
     def move(self, action):
         new_row, new_col = self.row, self.col
@@ -30,54 +288,56 @@ class Scout:
         elif action == "LEFT": new_col -= 1
         elif action == "RIGHT": new_col += 1
         
-        if 0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE:
+        if self.nav is not None:
+            if self.nav.passable(new_row, new_col):
+                self.row, self.col = new_row, new_col
+        elif 0 <= new_row < self.grid_size and 0 <= new_col < self.grid_size:
             self.row, self.col = new_row, new_col
     
     def scan(self, resources):
+        if self.visited is not None:
+            self.visited.visit(self.row, self.col)
         if (self.row, self.col) in resources:
-            known_resources.add((self.row, self.col))
+            self.known_resources.add((self.row, self.col))
             return True
         return False
 
 
 class Collector:
     
-    def __init__(self, agent_id):
+    def __init__(self, agent_id, known_resources, grid_size=GRID_SIZE, base_pos=BASE_POS, rng=random,
+                 nav=None):
         self.id = agent_id
-        self.row, self.col = BASE_POS
+        self.known_resources = known_resources  # wspolna tablica (blackboard)
+        self.grid_size = grid_size
+        self.base_pos = base_pos
+        self.rng = rng
+        self.row, self.col = base_pos
         self.carry = False
         self.target = None
         self.delivered = 0
         self.symbol = "C"
+        self.coordinated = False  # cel przydziela AuctionAssigner, a nie sam zbieracz
+        self.nav = nav  # NavGrid, gdy na planszy sa przeszkody
     
     def choose_action(self):
+        known_resources = self.known_resources
         if self.carry:
             # Idz do bazy
-            dr = BASE_POS[0] - self.row
-            dc = BASE_POS[1] - self.col
-            if abs(dr) >= abs(dc):
-                return "DOWN" if dr > 0 else "UP"
-            else:
-                return "RIGHT" if dc > 0 else "LEFT"
+            return navigate(self, self.base_pos)
         
-        elif known_resources:
+        if not self.coordinated and known_resources:
             # Idz do najblizszego znanego zasobu
             if not self.target or self.target not in known_resources:
-                self.target = min(known_resources, 
-                    key=lambda r: abs(r[0]-self.row) + abs(r[1]-self.col))
-            
-            dr = self.target[0] - self.row
-            dc = self.target[1] - self.col
-            if abs(dr) >= abs(dc):
-                return "DOWN" if dr > 0 else "UP"
-            else:
-                return "RIGHT" if dc > 0 else "LEFT"
+                self.target = known_resources.nearest(self.row, self.col)
+        
+        if self.target is not None and self.target in known_resources:
+            return navigate(self, self.target)
         
-        else:
-            # Czekaj lub losowa eksploracja w poblizu bazy
-            if random.random() < 0.3:
-                return random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
-            return "WAIT"
+        # Czekaj lub losowa eksploracja w poblizu bazy
+        if self.rng.random() < 0.3:
+            return self.rng.choice(ACTIONS)
+        return "WAIT"
     
     def move(self, action):
         if action == "WAIT":
@@ -89,110 +349,322 @@ class Collector:
         elif action == "LEFT": new_col -= 1
         elif action == "RIGHT": new_col += 1
         
-        if 0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE:
+        if self.nav is not None:
+            if self.nav.passable(new_row, new_col):
+                self.row, self.col = new_row, new_col
+        elif 0 <= new_row < self.grid_size and 0 <= new_col < self.grid_size:
             self.row, self.col = new_row, new_col
 
 
+class AuctionAssigner:
+    """Wspolny przydzial zasobow zbieraczom algorytmem aukcyjnym (Bertsekas).
+    
+    Zbieracz licytuje zasob, ktory daje mu najwieksza wartosc
+    (M - odleglosc - cena). Przebity zbieracz wraca do kolejki. Ceny
+    i przydzialy zostaja miedzy krokami, wiec po zmianie na tablicy licytuja
+    tylko zbieracze bez celu. Kazdy zbieracz rozwaza k najblizszych zasobow
+    z indeksu przestrzennego - koszt kroku nie rosnie z liczba zasobow.
+    """
+    
+    def __init__(self, collectors, known_resources, grid_size=GRID_SIZE, k=8):
+        self.collectors = collectors
+        self.known_resources = known_resources
+        self.k = k
+        self.max_value = 2 * grid_size  # wieksze od kazdej odleglosci na planszy
+        self.prices = {}  # zasob -> cena
+        self.owner = {}  # zasob -> id zbieracza
+        self.assignment = {}  # id zbieracza -> zasob
+        self.last_state = None
+        self.auctions = 0
+        for collector in collectors:
+            collector.coordinated = True
+    
+    def update(self):
+        """Aktualizuje przydzial, jesli zmienila sie tablica albo wolni zbieracze."""
+        free = {c.id for c in self.collectors if not c.carry}
+        state = (self.known_resources.version, frozenset(free))
+        if state == self.last_state:
+            return
+        self.last_state = state
+        
+        # Usun przydzialy nieaktualnych zasobow i zbieraczy, ktorzy juz cos niosa
+        for cid, res in list(self.assignment.items()):
+            if cid not in free or res not in self.known_resources:
+                del self.assignment[cid]
+                del self.owner[res]
+        # Cena wolnego zasobu nie ma juz znaczenia - zaczyna od zera
+        self.prices = {res: price for res, price in self.prices.items() if res in self.owner}
+        
+        by_id = {c.id: c for c in self.collectors}
+        queue = deque(cid for cid in sorted(free) if cid not in self.assignment)
+        if self.known_resources and queue:
+            self.auctions += 1
+            self._auction(queue, by_id, 1 / (len(free) + 1))
+        
+        for c in self.collectors:
+            c.target = self.assignment.get(c.id)
+    
+    def _auction(self, queue, by_id, eps):
+        while queue:
+            cid = queue.popleft()
+            c = by_id[cid]
+            # Wartosc 0 to "brak przydzialu" - lepsza niz przeplacony zasob
+            best, best_value, second_value = None, 0.0, 0.0
+            for res in self.known_resources.nearest_k(c.row, c.col, self.k):
+                value = self.max_value - abs(res[0] - c.row) - abs(res[1] - c.col) - self.prices.get(res, 0.0)
+                if value > best_value:
+                    best, best_value, second_value = res, value, best_value
+                elif value > second_value:
+                    second_value = value
+            if best is None:
+                continue
+            
+            self.prices[best] = self.prices.get(best, 0.0) + best_value - second_value + eps
+            previous = self.owner.get(best)
+            if previous is not None:
+                del self.assignment[previous]
+                queue.append(previous)
+            self.owner[best] = cid
+            self.assignment[cid] = best
+
+
 class Environment:
-    def __init__(self):
-        self.scouts = [Scout(i) for i in range(NUM_SCOUTS)]
-        self.collectors = [Collector(i) for i in range(NUM_COLLECTORS)]
-        self.resources = set()
+    blackboard_class = KnownResources
+    
+    def __init__(self, grid_size=GRID_SIZE, num_scouts=NUM_SCOUTS, num_collectors=NUM_COLLECTORS,
+                 num_resources=NUM_RESOURCES, base_pos=None, seed=None, assignment="greedy",
+                 exploration="random", walls=0):
+        self.grid_size = grid_size
+        self.num_resources = num_resources
+        self.base_pos = base_pos or (grid_size // 2, grid_size // 2)
+        self.rng = random.Random(seed) if seed is not None else random
+        # Wspolna tablica - znane zasoby (osobna dla kazdego srodowiska)
+        self.known_resources = self.blackboard_class(bucket=max(4, grid_size // 32))
+        
+        # walls - liczba odcinkow scian; bez scian agenci ida zachlannie (Manhattan)
+        self.nav = None
+        if walls:
+            obstacles = random_walls(grid_size, walls, self.rng, keep={self.base_pos})
+            self.nav = NavGrid(grid_size, obstacles, self.base_pos)
+        
+        # "random" - losowy spacer skautow, "frontier" - wspolna mapa odwiedzonych pol
+        self.visited = None
+        if exploration == "frontier":
+            self.visited = VisitedMap(grid_size, bucket=max(4, grid_size // 32))
+            self.visited.visit(*self.base_pos)
+            if self.nav is not None:
+                # Sciany i pola odciete od bazy nie sa do odwiedzenia
+                for i, d in enumerate(self.nav.base_field):
+                    if d < 0:
+                        self.visited.visit(*divmod(i, grid_size))
+        
+        args = (self.known_resources, grid_size, self.base_pos, self.rng)
+        self.scouts = [Scout(i, *args, visited=self.visited, nav=self.nav) for i in range(num_scouts)]
+        self.collectors = [Collector(i, *args, nav=self.nav) for i in range(num_collectors)]
         self.total_delivered = 0
+        self.renderer = None
+        # "greedy" - kazdy zbieracz sam wybiera najblizszy zasob, "auction" - wspolny przydzial
+        self.assigner = None
+        if assignment == "auction":
+            self.assigner = AuctionAssigner(self.collectors, self.known_resources, grid_size)
         
-        while len(self.resources) < NUM_RESOURCES:
-            r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            if (r, c) != BASE_POS:
-                self.resources.add((r, c))
+        self.resources = place_resources(grid_size, num_resources, self.rng, self.base_pos, self.nav)
+    
+    @property
+    def done(self):
+        return self.total_delivered >= self.num_resources
+    
+    @property
+    def discovered(self):
+        """Czy nie zostal juz zaden nieznany zasob (znane sa podzbiorem lezacych)"""
+        return len(self.known_resources) == len(self.resources)
     
-    def step(self):
+    def step(self, directions=None):
+        """directions - opcjonalnie kierunki eksploracji skautow (indeksy ACTIONS)"""
         # Ruch skautow
         for scout in self.scouts:
-            action = scout.choose_action()
-            scout.move(action)
-            scout.scan(self.resources)
+            self.step_scout(scout, None if directions is None else directions[scout.id])
         
         # Ruch zbieraczy
+        if self.assigner is not None:
+            self.assigner.update()
         for collector in self.collectors:
-            action = collector.choose_action()
-            collector.move(action)
-            
-            # Podnies zasob
-            pos = (collector.row, collector.col)
-            if not collector.carry and pos in self.resources:
-                collector.carry = True
-                collector.symbol = "*"
-                self.resources.remove(pos)
-                if pos in known_resources:
-                    known_resources.remove(pos)
-                collector.target = None
-            
-            # Dostarcz do bazy
-            if collector.carry and pos == BASE_POS:
-                collector.carry = False
-                collector.symbol = "C"
-                collector.delivered += 1
-                self.total_delivered += 1
+            self.step_collector(collector)
+    
+    def step_scout(self, scout, explore=None):
+        action = scout.choose_action(explore)
+        scout.move(action)
+        scout.scan(self.resources)
+    
+    def step_collector(self, collector):
+        action = collector.choose_action()
+        collector.move(action)
+        self.interact(collector)
+    
+    def interact(self, collector):
+        """Podniesienie zasobu / dostarczenie do bazy na polu zbieracza."""
+        # Podnies zasob
+        pos = (collector.row, collector.col)
+        if not collector.carry and pos in self.resources:
+            collector.carry = True
+            collector.symbol = "*"
+            self.resources.remove(pos)
+            self.known_resources.discard(pos)
+            collector.target = None
+        
+        # Dostarcz do bazy
+        if collector.carry and pos == self.base_pos:
+            collector.carry = False
+            collector.symbol = "C"
+            collector.delivered += 1
+            self.total_delivered += 1
+    
+    def cells(self):
+        """Pola planszy inne niz puste - O(S + C + R) zamiast przegladania calej planszy"""
+        cells = {}
+        if self.nav is not None:
+            for pos in self.nav.obstacles:
+                cells[pos] = "#"
+        for pos in self.resources:
+            cells[pos] = "R"  # Nieznany zasob
+        for pos in self.known_resources:
+            cells[pos] = "!"  # Znany zasob
+        cells[self.base_pos] = "B"
+        for collector in reversed(self.collectors):
+            cells[(collector.row, collector.col)] = collector.symbol
+        for scout in self.scouts:
+            cells[(scout.row, scout.col)] = "S"
+        return cells
     
     def display(self, step_num):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        
-        print(f"=== KROK {step_num} === Dostarczone: {self.total_delivered}/{NUM_RESOURCES}")
-        print(f"Znane zasoby (blackboard): {len(known_resources)}")
-        print("+" + "-" * 17 + "+")
-        
-        for r in range(GRID_SIZE):
-            print("| ", end="")
-            for c in range(GRID_SIZE):
-                # Kto jest na polu?
-                scouts_here = [s for s in self.scouts if s.row == r and s.col == c]
-                collectors_here = [c for c in self.collectors if c.row == r and c.col == c]
-                
-                if scouts_here:
-                    symbol = "S"
-                elif collectors_here:
-                    symbol = collectors_here[0].symbol
-                elif (r, c) == BASE_POS:
-                    symbol = "B"
-                elif (r, c) in known_resources:
-                    symbol = "!"  # Znany zasob
-                elif (r, c) in self.resources:
-                    symbol = "R"  # Nieznany zasob
-                else:
-                    symbol = "."
-                
-                print(symbol + " ", end="")
-            print("|")
-        
-        print("+" + "-" * 17 + "+")
-        print("S=skaut, C=zbieracz, *=zbieracz z zasobem")
-        print("R=nieznany zasob, !=znany zasob, B=baza")
+        if self.renderer is None:
+            self.renderer = GridRenderer(self.grid_size, self.grid_size)
+        
+        header = [
+            f"=== KROK {step_num} === Dostarczone: {self.total_delivered}/{self.num_resources}",
+            f"Znane zasoby (blackboard): {len(self.known_resources)}",
+        ]
+        footer = [
+            "S=skaut, C=zbieracz, *=zbieracz z zasobem",
+            "R=nieznany zasob, !=znany zasob, B=baza, #=sciana",
+        ]
+        self.renderer.render(header, self.cells(), footer)
+
+
+def run_episode(seed, max_steps=10_000, known_map=False, **config):
+    """Jeden epizod bez wyswietlania; zwraca liczbe krokow do zebrania wszystkiego
+    i krok, w ktorym odkryto ostatni zasob (discovery).
+    
+    known_map - wszystkie zasoby sa od poczatku na tablicy (mierzy samo zbieranie)
+    """
+    env = Environment(seed=seed, **config)
+    if known_map:
+        for pos in env.resources:
+            env.known_resources.add(pos)
+    steps = 0
+    discovery = 0 if env.discovered else None
+    while steps < max_steps and not env.done:
+        env.step()
+        steps += 1
+        if discovery is None and env.discovered:
+            discovery = steps
+    return {"steps": steps, "completed": env.done, "delivered": env.total_delivered,
+            "discovery": discovery}
+
+
+def compare_assignment(episodes=50, **config):
+    """Srednia liczba krokow do zebrania wszystkich zasobow: greedy vs auction.
+    
+    Zasoby sa od razu znane - inaczej wynik zalezy glownie od tego,
+    jak szybko skauci je znajda.
+    """
+    results = {}
+    for mode in ("greedy", "auction"):
+        runs = [run_episode(seed, known_map=True, assignment=mode, **config) for seed in range(episodes)]
+        results[mode] = sum(r["steps"] for r in runs) / episodes
+    return results
+
+
+def compare_exploration(grid_sizes=(8, 16, 32, 64, 128, 256, 512), episodes=5, num_scouts=4,
+                        num_collectors=4, max_steps=None):
+    """Losowy spacer vs frontier: srednio krokow do odkrycia wszystkiego i do konca.
+    
+    Liczba zasobow rosnie z bokiem planszy. Epizody przerwane po max_steps
+    (domyslnie 4 * pole planszy, najwyzej 200 000) licza sie jako max_steps
+    i sa zliczane osobno.
+    """
+    rows = []
+    for size in grid_sizes:
+        limit = max_steps or min(4 * size * size, 200_000)
+        config = dict(grid_size=size, num_scouts=num_scouts, num_collectors=num_collectors,
+                      num_resources=max(NUM_RESOURCES, size))
+        row = {"grid": size}
+        for mode in ("random", "frontier"):
+            runs = [run_episode(seed, max_steps=limit, exploration=mode, **config) for seed in range(episodes)]
+            row[mode] = {
+                "discovery": sum(r["discovery"] or limit for r in runs) / episodes,
+                "steps": sum(r["steps"] for r in runs) / episodes,
+                "incomplete": sum(not r["completed"] for r in runs),
+            }
+        rows.append(row)
+    return rows
 
 
 def main():
-    global known_resources
-    known_resources = set()
+    parser = argparse.ArgumentParser(description="System agentowy - skauci i zbieracze")
+    parser.add_argument("--grid", type=int, default=GRID_SIZE)
+    parser.add_argument("--scouts", type=int, default=NUM_SCOUTS)
+    parser.add_argument("--collectors", type=int, default=NUM_COLLECTORS)
+    parser.add_argument("--resources", type=int, default=NUM_RESOURCES)
+    parser.add_argument("--max-steps", type=int, default=SIM_STEPS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--assignment", choices=["greedy", "auction"], default="greedy")
+    parser.add_argument("--compare-assignment", action="store_true",
+                        help="porownaj greedy i auction na serii epizodow")
+    parser.add_argument("--exploration", choices=["random", "frontier"], default="random")
+    parser.add_argument("--walls", type=int, default=0, help="liczba odcinkow scian na planszy")
+    parser.add_argument("--compare-exploration", type=int, nargs="*", metavar="GRID",
+                        help="porownaj losowy spacer i frontier dla podanych rozmiarow planszy")
+    args = parser.parse_args()
+    
+    if args.compare_exploration is not None:
+        sizes = args.compare_exploration or (8, 16, 32, 64, 128, 256, 512)
+        print(f"{'plansza':>9s} | {'odkrycie random':>15s} {'frontier':>9s} | {'koniec random':>13s} {'frontier':>9s}")
+        for row in compare_exploration(sizes, num_scouts=args.scouts, num_collectors=args.collectors):
+            rnd, fr = row["random"], row["frontier"]
+            note = f"  (nieukonczone random: {rnd['incomplete']})" if rnd["incomplete"] else ""
+            print(f"{row['grid']:4d}x{row['grid']:<4d} | {rnd['discovery']:15.0f} {fr['discovery']:9.0f} | "
+                  f"{rnd['steps']:13.0f} {fr['steps']:9.0f}{note}")
+        return
+    
+    if args.compare_assignment:
+        results = compare_assignment(grid_size=args.grid, num_scouts=args.scouts,
+                                     num_collectors=args.collectors, num_resources=args.resources)
+        for mode, steps in results.items():
+            print(f"  {mode:8s}: srednio {steps:.1f} krokow do zebrania wszystkiego")
+        return
     
-    env = Environment()
+    env = Environment(args.grid, args.scouts, args.collectors, args.resources, seed=args.seed,
+                      assignment=args.assignment, exploration=args.exploration, walls=args.walls)
     
     print("SYSTEM AGENTOWY - SKAUCI I ZBIERACZE")
-    print(f"Skauci: {NUM_SCOUTS}, Zbieracze: {NUM_COLLECTORS}")
-    print(f"Zasoby: {NUM_RESOURCES}")
+    print(f"Skauci: {args.scouts}, Zbieracze: {args.collectors}")
+    print(f"Zasoby: {args.resources}")
     input("Enter aby rozpoczac...")
     
-    for step in range(SIM_STEPS):
+    for step in range(args.max_steps):
         env.display(step)
         env.step()
         time.sleep(0.3)
         
-        if env.total_delivered >= NUM_RESOURCES:
+        if env.done:
             env.display(step + 1)
             print(f"\n*** SUKCES w {step+1} krokach! ***")
             break
     else:
-        env.display(SIM_STEPS)
-        print(f"\n*** Koniec. Zebrano: {env.total_delivered}/{NUM_RESOURCES} ***")
+        env.display(args.max_steps)
+        print(f"\n*** Koniec. Zebrano: {env.total_delivered}/{args.resources} ***")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
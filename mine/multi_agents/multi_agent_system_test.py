@@ -0,0 +1,150 @@
+import unittest
+import random
+from multi_agent_system import Environment, KnownResources, VisitedMap, run_episode
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class TestKnownResources(unittest.TestCase):
+    
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(0)
+        for bucket in (1, 4, 16):
+            known = KnownResources(bucket=bucket)
+            for _ in range(500):
+                known.add((rng.randrange(300), rng.randrange(300)))
+            for _ in range(200):
+                q = (rng.randrange(300), rng.randrange(300))
+                expected = min(manhattan(q, r) for r in known)
+                self.assertEqual(manhattan(q, known.nearest(*q)), expected)
+    
+    def test_buckets_follow_discard(self):
+        known = KnownResources([(1, 1), (2, 2)], bucket=4)
+        known.discard((1, 1))
+        known.remove((2, 2))
+        self.assertEqual(len(known), 0)
+        self.assertEqual(known.buckets, {})
+        self.assertIsNone(known.nearest(0, 0))
+    
+    def test_all_mutators_keep_buckets(self):
+        def check(known):
+            indexed = set().union(*known.buckets.values()) if known.buckets else set()
+            self.assertEqual(indexed, set(known))
+            for q in ((0, 0), (7, 3), (20, 20)):
+                expected = min((manhattan(q, r) for r in known), default=None)
+                found = known.nearest(*q)
+                self.assertEqual(None if found is None else manhattan(q, found), expected)
+        
+        known = KnownResources([(1, 1), (2, 2)], bucket=4)
+        version = known.version
+        known.update([(9, 9), (3, 3)], {(15, 0)})
+        check(known)
+        known |= {(6, 6)}
+        known -= {(1, 1)}
+        check(known)
+        known.difference_update([(2, 2)], [(3, 3)])
+        check(known)
+        known ^= {(9, 9), (12, 12)}
+        check(known)
+        known.symmetric_difference_update([(12, 12), (0, 1)])
+        check(known)
+        known &= {(6, 6), (15, 0), (0, 1), (5, 5)}
+        check(known)
+        known.intersection_update([(6, 6), (0, 1)])
+        check(known)
+        self.assertEqual(set(known), {(6, 6), (0, 1)})
+        popped = {known.pop(), known.pop()}
+        self.assertEqual(popped, {(6, 6), (0, 1)})
+        check(known)
+        with self.assertRaises(KeyError):
+            known.pop()
+        self.assertIsInstance(known, KnownResources)
+        self.assertGreater(known.version, version)
+    
+    def test_environment_uses_index(self):
+        env = Environment(seed=2)
+        for _ in range(200):
+            env.step()
+        self.assertIsInstance(env.known_resources, KnownResources)
+        indexed = set().union(*env.known_resources.buckets.values()) if env.known_resources.buckets else set()
+        self.assertEqual(indexed, set(env.known_resources))
+    
+    def test_nearest_k_sorted(self):
+        known = KnownResources([(0, 5), (0, 1), (0, 3), (9, 9)])
+        self.assertEqual(known.nearest_k(0, 0, 3), [(0, 1), (0, 3), (0, 5)])
+    
+    def test_version_changes(self):
+        known = KnownResources()
+        known.add((1, 1))
+        known.add((1, 1))
+        known.discard((1, 1))
+        self.assertEqual(known.version, 2)
+
+
+class TestAuctionAssigner(unittest.TestCase):
+    
+    def test_collectors_get_distinct_targets(self):
+        env = Environment(grid_size=16, num_scouts=0, num_collectors=4, num_resources=10,
+                          seed=1, assignment="auction")
+        for pos in env.resources:
+            env.known_resources.add(pos)
+        env.assigner.update()
+        targets = [c.target for c in env.collectors]
+        self.assertNotIn(None, targets)
+        self.assertEqual(len(set(targets)), 4)
+    
+    def test_auction_collects_everything(self):
+        result = run_episode(3, known_map=True, grid_size=16, num_scouts=0, num_collectors=4,
+                             num_resources=12, assignment="auction")
+        self.assertTrue(result["completed"])
+
+
+class TestFrontierExploration(unittest.TestCase):
+    
+    def test_visit_updates_buckets(self):
+        visited = VisitedMap(6, bucket=4)
+        self.assertEqual(visited.unvisited, {(0, 0): 16, (0, 1): 8, (1, 0): 8, (1, 1): 4})
+        self.assertTrue(visited.visit(5, 5))
+        self.assertFalse(visited.visit(5, 5))
+        self.assertEqual(visited.unvisited[(1, 1)], 3)
+        self.assertEqual(visited.remaining, 35)
+    
+    def test_scouts_claim_different_buckets(self):
+        visited = VisitedMap(16, bucket=4)
+        first = visited.claim(0, 8, 8)
+        second = visited.claim(1, 8, 8)
+        self.assertNotEqual(first, second)
+    
+    def test_frontier_covers_grid(self):
+        env = Environment(grid_size=16, num_scouts=2, num_collectors=0, num_resources=10,
+                          seed=0, exploration="frontier")
+        for _ in range(16 * 16):
+            env.step()
+        self.assertEqual(env.visited.remaining, 0)
+        self.assertTrue(env.discovered)
+    
+    def test_frontier_discovers_faster_than_random(self):
+        config = dict(grid_size=32, num_scouts=4, num_collectors=4, num_resources=32, max_steps=20_000)
+        frontier = [run_episode(seed, exploration="frontier", **config)["discovery"] for seed in range(3)]
+        walk = [run_episode(seed, exploration="random", **config)["discovery"] or 20_000 for seed in range(3)]
+        self.assertLess(sum(frontier), sum(walk))
+
+
+class TestWalls(unittest.TestCase):
+    
+    def test_agents_avoid_walls(self):
+        env = Environment(grid_size=24, num_scouts=3, num_collectors=3, num_resources=15, seed=4,
+                          walls=12, exploration="frontier")
+        for _ in range(3000):
+            env.step()
+            for agent in env.scouts + env.collectors:
+                self.assertNotIn((agent.row, agent.col), env.nav.obstacles)
+            if env.done:
+                break
+        self.assertTrue(env.done)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,273 @@
+"""
+Podzial planszy na kafelki (domain decomposition) dla systemu skautow i zbieraczy
+
+Plansza dzielona jest na poziome pasy wierszy (kafelki). Kazdy kafelek
+ma wlasny proces roboczy, ktory:
+- posiada zasoby lezace w jego pasie (tylko on moze je odkryc i podniesc),
+- kroku je agentow, ktorzy aktualnie stoja w jego pasie,
+- trzyma kopie wspolnej tablicy znanych zasobow.
+
+Krok globalny to bariera: proces glowny wysyla kazdemu kafelkowi agentow,
+ktorzy do niego przeszli, i zmiany tablicy z pozostalych kafelkow, a potem
+czeka na wszystkie odpowiedzi. Agent, ktory wyszedl poza swoj pas, wraca
+w odpowiedzi jako stan (krotka) i trafia do kafelka-sasiada w kolejnym kroku.
+Zasob ma jednego wlasciciela, wiec dwa kafelki nigdy nie podniosa tego samego.
+"""
+
+import argparse
+import bisect
+import multiprocessing
+import random
+import time
+
+from multi_agent_system import (GRID_SIZE, NUM_COLLECTORS, NUM_RESOURCES, NUM_SCOUTS,
+                                Collector, Environment, KnownResources, Scout, place_resources)
+
+
+class DeltaBoard(KnownResources):
+    """Kopia tablicy w kafelku; zapamietuje zmiany lokalne do rozeslania."""
+
+    def __init__(self, positions=(), bucket=8):
+        self.deltas = []
+        super().__init__(positions, bucket)
+
+    def add(self, pos):
+        if pos not in self:
+            self.deltas.append(("add", pos))
+        super().add(pos)
+
+    def discard(self, pos):
+        if pos in self:
+            self.deltas.append(("discard", pos))
+        super().discard(pos)
+
+    def apply(self, deltas):
+        """Zmiany z innych kafelkow - nie sa ponownie rozsylane."""
+        for op, pos in deltas:
+            if op == "add":
+                KnownResources.add(self, pos)
+            else:
+                KnownResources.discard(self, pos)
+
+    def take_deltas(self):
+        deltas, self.deltas = self.deltas, []
+        return deltas
+
+
+class Tile(Environment):
+    """Pas wierszy [top, bottom) planszy z wlasnymi zasobami i agentami."""
+    blackboard_class = DeltaBoard
+
+    def __init__(self, top, bottom, grid_size, base_pos, resources, seed=None):
+        super().__init__(grid_size, 0, 0, 0, base_pos=base_pos, seed=seed)
+        self.top = top
+        self.bottom = bottom
+        self.resources = set(resources)
+
+    def owns(self, row):
+        return self.top <= row < self.bottom
+
+    def arrive(self, state):
+        """Odtwarza agenta z krotki stanu; zwraca go po sprawdzeniu pola."""
+        kind, agent_id, row, col = state[:4]
+        args = (agent_id, self.known_resources, self.grid_size, self.base_pos, self.rng)
+        if kind == "S":
+            agent = Scout(*args)
+            agent.row, agent.col = row, col
+            self.scouts.append(agent)
+            agent.scan(self.resources)
+        else:
+            agent = Collector(*args)
+            agent.row, agent.col = row, col
+            agent.carry, agent.target, agent.delivered = state[4:]
+            agent.symbol = "*" if agent.carry else "C"
+            self.collectors.append(agent)
+            # Pole, na ktore zbieracz wszedl, nalezy do tego kafelka
+            self.interact(agent)
+        return agent
+
+    def step(self, incoming=(), deltas=()):
+        """Krok kafelka; zwraca (wychodzacy agenci, zmiany tablicy, dostarczone)."""
+        self.known_resources.apply(deltas)
+        before = self.total_delivered
+        for state in incoming:
+            self.arrive(state)
+        super().step()
+
+        outgoing = []
+        staying = []
+        for scout in self.scouts:
+            if self.owns(scout.row):
+                staying.append(scout)
+            else:
+                outgoing.append(("S", scout.id, scout.row, scout.col))
+        self.scouts = staying
+        staying = []
+        for c in self.collectors:
+            if self.owns(c.row):
+                staying.append(c)
+            else:
+                outgoing.append(("C", c.id, c.row, c.col, c.carry, c.target, c.delivered))
+        self.collectors = staying
+        return outgoing, self.known_resources.take_deltas(), self.total_delivered - before
+
+
+def _worker(conn, tile):
+    while True:
+        cmd, data = conn.recv()
+        if cmd == "step":
+            conn.send(tile.step(*data))
+        elif cmd == "count":
+            conn.send(len(tile.scouts) + len(tile.collectors))
+        elif cmd == "close":
+            conn.close()
+            break
+
+
+class TiledEnvironment:
+    """Jedna duza plansza podzielona na tiles kafelkow.
+
+    parallel=True - kazdy kafelek w osobnym procesie, False - wszystkie
+    w procesie glownym (ten sam protokol, bez IPC). Zasoby losowane sa
+    tak samo jak w Environment z tym samym ziarnem. spawn="random" rozstawia
+    agentow losowo zamiast w bazie (rowne obciazenie kafelkow od poczatku).
+    """
+
+    def __init__(self, grid_size=GRID_SIZE, num_scouts=NUM_SCOUTS, num_collectors=NUM_COLLECTORS,
+                 num_resources=NUM_RESOURCES, base_pos=None, seed=None, tiles=4, parallel=True,
+                 spawn="base"):
+        self.grid_size = grid_size
+        self.num_resources = num_resources
+        self.base_pos = base_pos or (grid_size // 2, grid_size // 2)
+        rng = random.Random(seed)
+
+        resources = place_resources(grid_size, num_resources, rng, self.base_pos)
+
+        tiles = max(1, min(tiles, grid_size))
+        self.tops = [i * grid_size // tiles for i in range(tiles)]
+        bottoms = self.tops[1:] + [grid_size]
+        self.tiles = []
+        for i, (top, bottom) in enumerate(zip(self.tops, bottoms)):
+            owned = [pos for pos in resources if top <= pos[0] < bottom]
+            tile_seed = None if seed is None else seed * tiles + i
+            self.tiles.append(Tile(top, bottom, grid_size, self.base_pos, owned, seed=tile_seed))
+
+        def position():
+            if spawn == "random":
+                return rng.randrange(grid_size), rng.randrange(grid_size)
+            return self.base_pos
+
+        self.incoming = [[] for _ in self.tiles]
+        for i in range(num_scouts):
+            self._route(("S", i) + position())
+        for i in range(num_collectors):
+            self._route(("C", i) + position() + (False, None, 0))
+        self.deltas = [[] for _ in self.tiles]
+        self.total_delivered = 0
+
+        self.conns = []
+        self.procs = []
+        if parallel:
+            for tile in self.tiles:
+                parent, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(target=_worker, args=(child, tile), daemon=True)
+                proc.start()
+                child.close()
+                self.conns.append(parent)
+                self.procs.append(proc)
+
+    def _route(self, state):
+        self.incoming[bisect.bisect_right(self.tops, state[2]) - 1].append(state)
+
+    @property
+    def done(self):
+        return self.total_delivered >= self.num_resources
+
+    def step(self):
+        """Krok globalny: wszystkie kafelki rownolegle, potem wymiana agentow i zmian tablicy."""
+        requests = []
+        for i in range(len(self.tiles)):
+            # Kazdy kafelek dostaje zmiany tablicy ze wszystkich pozostalych
+            others = [d for j, deltas in enumerate(self.deltas) if j != i for d in deltas]
+            requests.append((self.incoming[i], others))
+
+        if self.conns:
+            for conn, request in zip(self.conns, requests):
+                conn.send(("step", request))
+            results = [conn.recv() for conn in self.conns]
+        else:
+            results = [tile.step(*request) for tile, request in zip(self.tiles, requests)]
+
+        self.incoming = [[] for _ in self.tiles]
+        for outgoing, deltas, delivered in results:
+            for state in outgoing:
+                self._route(state)
+            self.total_delivered += delivered
+        self.deltas = [deltas for _, deltas, _ in results]
+
+    def agent_counts(self):
+        """Liczba agentow w kazdym kafelku (obciazenie procesow)."""
+        if self.conns:
+            for conn in self.conns:
+                conn.send(("count", None))
+            counts = [conn.recv() for conn in self.conns]
+        else:
+            counts = [len(t.scouts) + len(t.collectors) for t in self.tiles]
+        return [count + len(incoming) for count, incoming in zip(counts, self.incoming)]
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(("close", None))
+        for proc in self.procs:
+            proc.join()
+        self.conns, self.procs = [], []
+
+
+def run_episode(seed, max_steps=10_000, **config):
+    """Jeden epizod na kafelkach; zwraca liczbe krokow do zebrania wszystkiego."""
+    env = TiledEnvironment(seed=seed, **config)
+    steps = 0
+    try:
+        while steps < max_steps and not env.done:
+            env.step()
+            steps += 1
+    finally:
+        env.close()
+    return {"steps": steps, "completed": env.done, "delivered": env.total_delivered}
+
+
+def throughput(grid_size=4096, num_agents=20_000, steps=50, tile_counts=(1, 2, 4, 8), seed=0):
+    """Kroki agentow na sekunde dla roznej liczby kafelkow (procesow)."""
+    rows = []
+    for tiles in tile_counts:
+        env = TiledEnvironment(grid_size, num_agents // 2, num_agents - num_agents // 2,
+                               num_resources=grid_size, seed=seed, tiles=tiles, spawn="random")
+        env.step()  # rozgrzewka - start procesow
+        start = time.perf_counter()
+        for _ in range(steps):
+            env.step()
+        elapsed = time.perf_counter() - start
+        counts = env.agent_counts()
+        env.close()
+        rows.append({"tiles": tiles, "agent_steps_per_s": num_agents * steps / elapsed,
+                     "imbalance": max(counts) / (sum(counts) / len(counts))})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skauci i zbieracze na planszy podzielonej na kafelki")
+    parser.add_argument("--grid", type=int, default=4096)
+    parser.add_argument("--agents", type=int, default=20_000)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--tiles", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Plansza {args.grid}x{args.grid}, agenci: {args.agents}, rdzenie: {multiprocessing.cpu_count()}")
+    for row in throughput(args.grid, args.agents, args.steps, args.tiles, args.seed):
+        print(f"  kafelki: {row['tiles']:3d} | krokow agentow/s: {row['agent_steps_per_s']:10.0f} | "
+              f"nierownowaga: {row['imbalance']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import unittest
+from multi_agent_system import Environment
+from tiled_env import DeltaBoard, TiledEnvironment, run_episode
+
+
+class TestDeltaBoard(unittest.TestCase):
+    
+    def test_records_only_local_changes(self):
+        board = DeltaBoard()
+        board.add((1, 1))
+        board.apply([("add", (2, 2)), ("discard", (1, 1))])
+        board.discard((2, 2))
+        self.assertEqual(board.take_deltas(), [("add", (1, 1)), ("discard", (2, 2))])
+        self.assertEqual(board.take_deltas(), [])
+        self.assertEqual(len(board), 0)
+
+
+class TestTiledEnvironment(unittest.TestCase):
+    
+    def test_resources_partitioned_like_environment(self):
+        env = TiledEnvironment(grid_size=20, num_resources=30, seed=5, tiles=3, parallel=False)
+        owned = [tile.resources for tile in env.tiles]
+        self.assertEqual(set().union(*owned), Environment(grid_size=20, num_resources=30, seed=5).resources)
+        self.assertEqual(sum(len(r) for r in owned), 30)
+    
+    def test_agents_are_not_lost(self):
+        env = TiledEnvironment(grid_size=16, num_scouts=6, num_collectors=6, num_resources=8,
+                               seed=0, tiles=4, parallel=False, spawn="random")
+        for _ in range(100):
+            env.step()
+            self.assertEqual(sum(env.agent_counts()), 12)
+        for tile in env.tiles:
+            for agent in tile.scouts + tile.collectors:
+                self.assertTrue(tile.owns(agent.row))
+    
+    def test_episode_completes(self):
+        for parallel in (False, True):
+            result = run_episode(1, grid_size=16, num_scouts=3, num_collectors=3, num_resources=10,
+                                 tiles=3, parallel=parallel)
+            self.assertTrue(result["completed"], parallel)
+            self.assertEqual(result["delivered"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,71 @@
+"""
+Model łącza dla symulacji elekcji (pierścień i tyran)
+
+Opóźnienia (stałe albo z rozkładu), gubienie wiadomości i podziały sieci.
+Rozkłady opóźnień to funkcje (rng) -> sekundy.
+"""
+
+import random
+
+
+def constant(value):
+    return lambda rng: value
+
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean):
+    return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+
+
+def normal(mean, std):
+    return lambda rng: max(0.0, rng.gauss(mean, std))
+
+
+class LinkModel:
+    """Lokalny model sieci: opóźnienie łączy, gubienie wiadomości i podziały.
+    
+    Domyślnie łącze jest idealne (brak opóźnień i strat).
+    """
+    
+    def __init__(self, latency=0.0, drop_prob=0.0, seed=None):
+        # Opóźnienie: liczba sekund albo rozkład (rng) -> sekundy
+        self.latency = latency
+        self.drop_prob = drop_prob
+        self.rng = random.Random(seed)
+        self.link_latency = {}  # (nadawca, odbiorca) -> opóźnienie konkretnego łącza
+        self.groups = {}  # id procesu -> numer grupy przy podziale sieci
+        self.dropped = 0
+    
+    def set_latency(self, sender_id, target_id, latency):
+        """Ustawia opóźnienie jednego łącza (liczba albo rozkład)."""
+        self.link_latency[(sender_id, target_id)] = latency
+    
+    def partition(self, *groups):
+        """Dzieli sieć - procesy z różnych grup nie mogą się komunikować."""
+        self.groups = {pid: i for i, group in enumerate(groups) for pid in group}
+    
+    def heal(self):
+        """Usuwa podział sieci."""
+        self.groups = {}
+    
+    def connected(self, sender_id, target_id):
+        if not self.groups:
+            return True
+        return self.groups.get(sender_id) == self.groups.get(target_id)
+    
+    def delay(self, sender_id, target_id):
+        latency = self.link_latency.get((sender_id, target_id), self.latency)
+        return latency(self.rng) if callable(latency) else latency
+    
+    def transmit(self, sender_id, target_id):
+        """Zwraca opóźnienie wiadomości albo None, jeśli wiadomość przepadła."""
+        if not self.connected(sender_id, target_id):
+            self.dropped += 1
+            return None
+        if self.drop_prob and self.rng.random() < self.drop_prob:
+            self.dropped += 1
+            return None
+        return self.delay(sender_id, target_id)
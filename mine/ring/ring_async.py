@@ -0,0 +1,145 @@
+"""
+Asynchroniczna wersja algorytmu pierścieniowego (asyncio)
+Systemy rozproszone - Zadanie 2
+
+Każdy proces ma własną skrzynkę odbiorczą (asyncio.Queue) i pętlę,
+która obsługuje wiadomości po kolei. Wysłanie wiadomości nie wywołuje
+od razu następnika - wiadomość trafia do łącza z opóźnieniem, więc:
+- widać opóźnienie na każdym przeskoku,
+- kilka elekcji może krążyć po pierścieniu jednocześnie.
+
+Sama logika elekcji (ELECTION z listą kandydatów, COORDINATOR ze zwycięzcą)
+jest dziedziczona z ring_election.Process.
+"""
+
+import asyncio
+
+from ring_election import Candidates, LinkModel, Process, RingNetwork
+
+
+class AsyncProcess(Process):
+    __slots__ = ("mailbox",)
+
+    def __init__(self, process_id):
+        super().__init__(process_id)
+        self.mailbox = asyncio.Queue()
+
+    def deliver(self, target, msg_type, payload):
+        """Wrzuca wiadomość do łącza zamiast wywoływać następnika."""
+        if msg_type == "ELECTION":
+            payload = Candidates(payload)  # każdy przeskok ma własną kopię listy
+        self.network.transmit(self, target, (msg_type, payload, self.id))
+
+    async def run(self):
+        """Pętla obsługi skrzynki odbiorczej."""
+        while True:
+            msg_type, payload, sender_id = await self.mailbox.get()
+            try:
+                self.handle(msg_type, payload, sender_id)
+            finally:
+                self.network.message_done()
+
+
+class AsyncRingNetwork(RingNetwork):
+    process_class = AsyncProcess
+
+    def __init__(self, num_processes, link_delay=0.01, verbose=True, link=None):
+        # link_delay to skrót dla stałego opóźnienia; pełny model przez link=
+        super().__init__(num_processes, verbose=verbose, link=link or LinkModel(latency=link_delay))
+        self.tasks = []
+        self.in_flight = set()
+        self.pending = 0
+        self.idle = None
+
+    def transmit(self, sender, target, msg):
+        """Wysyła wiadomość przez łącze (nie blokuje nadawcy)."""
+        self.messages += 1
+        delay = self.link.transmit(sender.id, target.id)
+        if delay is None:
+            return  # wiadomość zgubiona
+        self.pending += 1
+        self.idle.clear()
+        task = asyncio.get_running_loop().create_task(self._link(target, msg, delay))
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+
+    async def _link(self, target, msg, delay):
+        await asyncio.sleep(delay)
+        await target.mailbox.put(msg)
+
+    def message_done(self):
+        """Wywoływane po obsłużeniu wiadomości przez odbiorcę."""
+        self.pending -= 1
+        if self.pending == 0:
+            self.idle.set()
+
+    def start(self):
+        """Uruchamia pętle wszystkich procesów."""
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.tasks = [asyncio.create_task(p.run()) for p in self.processes]
+
+    async def stop(self):
+        """Zatrzymuje pętle procesów."""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def run_elections(self, initiators):
+        """Uruchamia równolegle elekcje z podanych procesów i mierzy czasy.
+
+        Zwraca słownik z czasem okrążenia dla każdego inicjatora (latency),
+        czasem do wygaśnięcia ruchu w sieci (convergence), liczbą wiadomości
+        i przepustowością (zakończone elekcje na sekundę).
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        self.reset_stats()
+
+        t0 = loop.time()
+        for pid in initiators:
+            self.processes[pid].start_election()
+        await self.idle.wait()
+        elapsed = loop.time() - t0
+        await self.stop()
+
+        return {
+            "elections": len(initiators),
+            "completed": len(self.lap_times),
+            "latency": dict(self.lap_times),
+            "convergence": elapsed,
+            "messages": self.messages,
+            "throughput": len(self.lap_times) / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+async def measure(num_processes=10, concurrent=3, link_delay=0.01):
+    """Zabija koordynatora i uruchamia kilka elekcji naraz."""
+    network = AsyncRingNetwork(num_processes, link_delay=link_delay, verbose=False)
+    network.kill_process(num_processes - 1)
+    initiators = list(range(0, num_processes - 1, max(1, (num_processes - 1) // concurrent)))
+    return await network.run_elections(initiators[:concurrent])
+
+
+def measure_sync(**kwargs):
+    """Synchroniczna otoczka na measure()."""
+    return asyncio.run(measure(**kwargs))
+
+
+def main():
+    print("=" * 60)
+    print("ASYNCHRONICZNY PIERŚCIEŃ - POMIAR ELEKCJI")
+    print("=" * 60)
+    for concurrent in (1, 2, 4, 8):
+        stats = measure_sync(num_processes=16, concurrent=concurrent, link_delay=0.005)
+        avg_latency = sum(stats["latency"].values()) / max(1, len(stats["latency"]))
+        print(f"Elekcje równoległe: {concurrent:2d} | "
+              f"śr. okrążenie: {avg_latency * 1000:7.1f} ms | "
+              f"zbieżność: {stats['convergence'] * 1000:7.1f} ms | "
+              f"wiadomości: {stats['messages']:4d} | "
+              f"przepustowość: {stats['throughput']:6.1f} elekcji/s")
+
+
+if __name__ == "__main__":
+    main()
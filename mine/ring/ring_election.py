@@ -10,42 +10,82 @@ Algorytm pierścieniowy:
 5. Inicjator wysyła wiadomość COORDINATOR z ID zwycięzcy
 """
 
+import argparse
+import itertools
 import time
 import random
+import tracemalloc
+from collections import deque
+
+from link_model import LinkModel, constant, exponential, normal, uniform  # noqa: F401
+
+
+class Candidates(list):
+    """Lista kandydatów z szybkim sprawdzaniem przynależności (O(1) zamiast O(n))."""
+    
+    def __init__(self, ids=()):
+        super().__init__(ids)
+        self.members = set(self)
+    
+    def append(self, process_id):
+        super().append(process_id)
+        self.members.add(process_id)
+    
+    def __contains__(self, process_id):
+        return process_id in self.members
 
 
 class Process:
+    # Bez __dict__ - przy milionie węzłów liczy się każdy bajt
+    __slots__ = ("id", "network", "next_process", "coordinator_id", "alive")
+    
     def __init__(self, process_id):
         self.id = process_id
+        self.network = None
         self.next_process = None  # następnik w pierścieniu
         self.coordinator_id = None
         self.alive = True
     
+    @property
+    def verbose(self):
+        return self.network is None or self.network.verbose
+    
+    def log(self, msg):
+        if self.verbose:
+            print(msg)
+    
     def find_next_alive(self):
-        """Znajduje najbliższy żywy proces w pierścieniu."""
+        """Znajduje najbliższy żywy (i osiągalny) proces w pierścieniu."""
         next_p = self.next_process
         visited = set()
         while next_p and next_p.id not in visited:
-            if next_p.alive:
+            if next_p.alive and self.reachable(next_p):
                 return next_p
             visited.add(next_p.id)
             next_p = next_p.next_process
         return None
     
+    def reachable(self, other):
+        """Czy łącze do procesu działa (np. nie ma podziału sieci)."""
+        return self.network is None or self.network.link.connected(self.id, other.id)
+    
     def start_election(self):
         """Rozpoczyna elekcję - wysyła wiadomość z własnym ID."""
         if not self.alive:
             return
         
-        print(f"\n[P{self.id}] Rozpoczynam elekcję pierścieniową!")
-        self.send_election([self.id])
+        self.log(f"\n[P{self.id}] Rozpoczynam elekcję pierścieniową!")
+        if self.network is not None:
+            self.network.record_election_start(self.id)
+        self.send_election(Candidates([self.id]))
     
     def send_election(self, candidates):
         """Wysyła listę kandydatów do następnika."""
         next_alive = self.find_next_alive()
         if next_alive:
-            print(f"  [P{self.id}] -> [P{next_alive.id}]: ELECTION {candidates}")
-            next_alive.receive_election(candidates, self.id)
+            if self.verbose:  # nie formatuj długiej listy, gdy nikt jej nie czyta
+                self.log(f"  [P{self.id}] -> [P{next_alive.id}]: ELECTION {candidates}")
+            self.deliver(next_alive, "ELECTION", candidates)
     
     def receive_election(self, candidates, initiator_id):
         """Odbiera wiadomość elekcyjną."""
@@ -56,8 +96,11 @@ class Process:
         if self.id in candidates:
             # Wybieram proces o najwyższym ID
             winner = max(candidates)
-            print(f"\n[P{self.id}] Wiadomość okrążyła pierścień. Kandydaci: {candidates}")
-            print(f"*** Zwycięzca elekcji: P{winner} ***\n")
+            if self.network is not None:
+                self.network.record_lap(candidates[0])
+            if self.verbose:  # jak w send_election - lista kandydatów jest długa
+                self.log(f"\n[P{self.id}] Wiadomość okrążyła pierścień. Kandydaci: {candidates}")
+            self.log(f"*** Zwycięzca elekcji: P{winner} ***\n")
             self.send_coordinator(winner)
         else:
             # Dodaję siebie do listy i przekazuję dalej
@@ -69,8 +112,8 @@ class Process:
         self.coordinator_id = winner_id
         next_alive = self.find_next_alive()
         if next_alive and next_alive.coordinator_id != winner_id:
-            print(f"  [P{self.id}] -> [P{next_alive.id}]: COORDINATOR P{winner_id}")
-            next_alive.receive_coordinator(winner_id)
+            self.log(f"  [P{self.id}] -> [P{next_alive.id}]: COORDINATOR P{winner_id}")
+            self.deliver(next_alive, "COORDINATOR", winner_id)
     
     def receive_coordinator(self, winner_id):
         """Odbiera informację o nowym koordynatorze."""
@@ -79,14 +122,39 @@ class Process:
         
         if self.coordinator_id != winner_id:
             self.coordinator_id = winner_id
-            print(f"  [P{self.id}] przyjął koordynatora P{winner_id}")
+            self.log(f"  [P{self.id}] przyjął koordynatora P{winner_id}")
             self.send_coordinator(winner_id)
+    
+    def deliver(self, target, msg_type, payload):
+        """Przekazuje wiadomość do następnika (synchronicznie)."""
+        if self.network is None:
+            target.handle(msg_type, payload, self.id)
+        else:
+            self.network.messages += 1
+            self.network.dispatch(target, msg_type, payload, self.id)
+    
+    def handle(self, msg_type, payload, sender_id):
+        """Obsługuje odebraną wiadomość."""
+        if msg_type == "ELECTION":
+            self.receive_election(payload, sender_id)
+        else:
+            self.receive_coordinator(payload)
 
 
 class RingNetwork:
-    def __init__(self, num_processes):
+    process_class = Process
+    
+    def __init__(self, num_processes, verbose=True, link=None):
+        self.verbose = verbose
+        self.link = link or LinkModel()
+        self.outbox = deque()
+        self.delivering = False
+        self.reset_stats()
+        
         # Tworzę procesy
-        self.processes = [Process(i) for i in range(num_processes)]
+        self.processes = [self.process_class(i) for i in range(num_processes)]
+        for p in self.processes:
+            p.network = self
         
         # Łączę w pierścień: 0 -> 1 -> 2 -> ... -> n-1 -> 0
         for i in range(num_processes):
@@ -97,58 +165,197 @@ class RingNetwork:
         for p in self.processes:
             p.coordinator_id = initial_coord
         
-        print(f"Pierścień: {' -> '.join(f'P{p.id}' for p in self.processes)} -> P0")
-        print(f"Początkowy koordynator: P{initial_coord}\n")
+        if self.verbose:  # opis całego pierścienia - O(n) formatowania
+            self.log(f"Pierścień: {' -> '.join(f'P{p.id}' for p in self.processes)} -> P0")
+        self.log(f"Początkowy koordynator: P{initial_coord}\n")
+    
+    def log(self, msg):
+        if self.verbose:
+            print(msg)
+    
+    def reset_stats(self):
+        """Zeruje liczniki wiadomości i elekcji."""
+        self.messages = 0
+        self.elections = 0
+        self.clock = 0.0  # czas symulowany (suma opóźnień łączy)
+        self.start_times = {}
+        self.lap_times = []  # (inicjator, czas okrążenia w sekundach)
+    
+    def record_election_start(self, process_id):
+        self.elections += 1
+        self.start_times[process_id] = time.perf_counter()
+    
+    def record_lap(self, initiator_id):
+        """Zapisuje czas okrążenia pierścienia przez wiadomość ELECTION."""
+        start = self.start_times.pop(initiator_id, None)
+        if start is not None:
+            self.lap_times.append((initiator_id, time.perf_counter() - start))
+    
+    def dispatch(self, target, msg_type, payload, sender_id):
+        """Doręcza wiadomość.
+        
+        Kolejne przeskoki obsługiwane są w pętli, a nie rekurencyjnie,
+        więc elekcja w długim pierścieniu nie przepełnia stosu.
+        Wiadomości idą po kolei, więc opóźnienie łącza po prostu
+        przesuwa zegar symulacji.
+        """
+        delay = self.link.transmit(sender_id, target.id)
+        if delay is None:
+            self.log(f"  [P{sender_id}] -> [P{target.id}]: wiadomość {msg_type} zgubiona")
+            return
+        self.clock += delay
+        self.outbox.append((target, msg_type, payload, sender_id))
+        if self.delivering:
+            return
+        self.delivering = True
+        try:
+            while self.outbox:
+                target, msg_type, payload, sender_id = self.outbox.popleft()
+                target.handle(msg_type, payload, sender_id)
+        finally:
+            self.outbox.clear()
+            self.delivering = False
+    
+    def converged(self):
+        """Czy wszystkie żywe procesy uznają najwyższy żywy proces za koordynatora."""
+        alive = [p for p in self.processes if p.alive]
+        return bool(alive) and all(p.coordinator_id == alive[-1].id for p in alive)
     
     def kill_process(self, process_id):
         """Zabija proces."""
         self.processes[process_id].alive = False
-        print(f"\n!!! Proces P{process_id} został zabity !!!")
+        self.log(f"\n!!! Proces P{process_id} został zabity !!!")
     
     def revive_process(self, process_id):
         """Wskrzesza proces."""
         self.processes[process_id].alive = True
-        print(f"\n!!! Proces P{process_id} został wskrzeszony !!!")
+        self.log(f"\n!!! Proces P{process_id} został wskrzeszony !!!")
+
+
+# --- Generatory scenariuszy ---
+# Każdy generator dostaje sieć i własny generator losowy (random.Random)
+# i zwraca nieskończony ciąg zdarzeń (zdarzenie, id_procesu).
+# Zdarzenia: "check", "kill", "revive", "noop".
+
+def random_scenario(network, rng):
+    """Losowe zdarzenia (domyślny scenariusz symulatora)."""
+    while True:
+        alive = [p.id for p in network.processes if p.alive]
+        dead = [p.id for p in network.processes if not p.alive]
+        
+        event = rng.choice(["check", "kill", "revive"] if dead else ["check", "kill"])
+        if event in ("check", "kill") and alive:
+            yield event, rng.choice(alive)
+        elif event == "revive" and dead:
+            yield event, rng.choice(dead)
+        else:
+            yield "noop", None
+
+
+def mass_kill_scenario(network, rng, fraction=0.5):
+    """Jednoczesna awaria części procesów (razem z koordynatorem), potem sprawdzenia."""
+    alive = [p.id for p in network.processes if p.alive]
+    if alive:
+        coord = max(alive)
+        others = [pid for pid in alive if pid != coord]
+        count = min(len(others), max(0, int(len(alive) * fraction) - 1))
+        for pid in [coord] + rng.sample(others, count):
+            yield "kill", pid
+    while True:
+        alive = [p.id for p in network.processes if p.alive]
+        yield ("check", rng.choice(alive)) if alive else ("noop", None)
+
+
+def rolling_restart_scenario(network, rng):
+    """Restart procesów po kolei, od najwyższego ID: kill, check, revive, check."""
+    while True:
+        for pid in reversed(range(len(network.processes))):
+            for event in ("kill", "check", "revive", "check"):
+                if event in ("kill", "revive"):
+                    yield event, pid
+                else:
+                    alive = [p.id for p in network.processes if p.alive]
+                    yield ("check", rng.choice(alive)) if alive else ("noop", None)
+
+
+def flapping_scenario(network, rng, flappers=2, flip_prob=0.5):
+    """Kilka procesów (w tym koordynator) na zmianę pada i wstaje."""
+    ids = [p.id for p in network.processes]
+    # Koordynator zawsze niestabilny, nawet dla flappers=0
+    unstable = [max(ids)] + rng.sample(ids[:-1], max(0, min(flappers, len(ids)) - 1))
+    while True:
+        if rng.random() < flip_prob:
+            pid = rng.choice(unstable)
+            yield ("kill" if network.processes[pid].alive else "revive"), pid
+        else:
+            alive = [p.id for p in network.processes if p.alive]
+            yield ("check", rng.choice(alive)) if alive else ("noop", None)
+
+
+SCENARIOS = {
+    "random": random_scenario,
+    "mass_kill": mass_kill_scenario,
+    "rolling_restart": rolling_restart_scenario,
+    "flapping": flapping_scenario,
+}
 
 
 class RingSimulator:
-    def __init__(self, num_processes=5, max_events=8):
-        self.network = RingNetwork(num_processes)
+    def __init__(self, num_processes=5, max_events=8, headless=False, seed=None, scenario=None):
+        # headless: bez opóźnień i bez wypisywania - tylko metryki
+        self.headless = headless
+        self.network = RingNetwork(num_processes, verbose=not headless)
         self.max_events = max_events
+        self.rng = random.Random(seed)
+        self.scenario = scenario or random_scenario
+    
+    def say(self, msg):
+        if not self.headless:
+            print(msg)
     
     def run(self):
-        print("=" * 60)
-        print("SYMULACJA ALGORYTMU PIERŚCIENIOWEGO")
-        print("=" * 60)
+        """Uruchamia symulację i zwraca metryki przebiegu."""
+        self.say("=" * 60)
+        self.say("SYMULACJA ALGORYTMU PIERŚCIENIOWEGO")
+        self.say("=" * 60)
         
-        for event_num in range(1, self.max_events + 1):
-            time.sleep(1)
-            print(f"\n--- Zdarzenie {event_num}/{self.max_events} ---")
-            
-            alive = [p for p in self.network.processes if p.alive]
-            dead = [p for p in self.network.processes if not p.alive]
+        events = itertools.islice(self.scenario(self.network, self.rng), self.max_events)
+        for event_num, (event, pid) in enumerate(events, 1):
+            if not self.headless:
+                time.sleep(1)
+            self.say(f"\n--- Zdarzenie {event_num}/{self.max_events} ---")
             
-            event = random.choice(["check", "kill", "revive"] if dead else ["check", "kill"])
-            
-            if event == "check" and alive:
-                checker = random.choice(alive)
+            if event == "check":
+                checker = self.network.processes[pid]
                 coord = self.network.processes[checker.coordinator_id]
-                print(f"[P{checker.id}] Sprawdzam koordynatora P{checker.coordinator_id}...")
+                self.say(f"[P{checker.id}] Sprawdzam koordynatora P{checker.coordinator_id}...")
                 if not coord.alive:
-                    print(f"[P{checker.id}] Koordynator nie żyje!")
+                    self.say(f"[P{checker.id}] Koordynator nie żyje!")
                     checker.start_election()
                 else:
-                    print(f"[P{checker.id}] Koordynator żyje.")
+                    self.say(f"[P{checker.id}] Koordynator żyje.")
             
-            elif event == "kill" and alive:
-                victim = random.choice(alive)
-                self.network.kill_process(victim.id)
+            elif event == "kill":
+                self.network.kill_process(pid)
             
-            elif event == "revive" and dead:
-                revived = random.choice(dead)
-                self.network.revive_process(revived.id)
+            elif event == "revive":
+                self.network.revive_process(pid)
         
-        self.print_final_state()
+        if not self.headless:
+            self.print_final_state()
+        return self.metrics()
+    
+    def metrics(self):
+        """Zbiorcze metryki przebiegu."""
+        net = self.network
+        laps = [t for _, t in net.lap_times]
+        return {
+            "elections": net.elections,
+            "messages": net.messages,
+            "messages_per_election": net.messages / net.elections if net.elections else 0.0,
+            "avg_lap_time": sum(laps) / len(laps) if laps else 0.0,
+            "max_lap_time": max(laps, default=0.0),
+        }
     
     def print_final_state(self):
         print("\n" + "=" * 60)
@@ -160,6 +367,123 @@ class RingSimulator:
             print(f"P{p.id}: {status}, koordynator=P{p.coordinator_id}{is_coord}")
 
 
+def run_batch(runs, scenario="random", num_processes=5, max_events=8, seed=0):
+    """Uruchamia wiele symulacji w trybie headless i uśrednia metryki.
+    
+    Przebieg i ma ziarno seed + i, więc cała seria jest powtarzalna.
+    """
+    start = time.perf_counter()
+    results = [
+        RingSimulator(num_processes, max_events, headless=True, seed=seed + i,
+                      scenario=SCENARIOS[scenario]).run()
+        for i in range(runs)
+    ]
+    elapsed = time.perf_counter() - start
+    
+    elections = sum(r["elections"] for r in results)
+    messages = sum(r["messages"] for r in results)
+    with_laps = [r["avg_lap_time"] for r in results if r["elections"]]
+    return {
+        "runs": runs,
+        "elections": elections,
+        "elections_per_run": elections / runs if runs else 0.0,
+        "messages_per_election": messages / elections if elections else 0.0,
+        "avg_lap_time": sum(with_laps) / len(with_laps) if with_laps else 0.0,
+        "runs_per_second": runs / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def memory_per_node(num_processes):
+    """Mierzy pamięć zajmowaną przez sieć (tracemalloc) w bajtach na węzeł."""
+    tracemalloc.start()
+    network = RingNetwork(num_processes, verbose=False)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del network
+    return current / num_processes
+
+
+def latency_sweep(latencies, num_processes=16, drop_prob=0.0, runs=200, timeout=1.0,
+                  max_attempts=50, seed=0):
+    """Jak czas zbieżności elekcji i liczba wiadomości rosną z opóźnieniem łączy.
+    
+    Dla każdego średniego opóźnienia (rozkład wykładniczy) zabija koordynatora
+    i uruchamia elekcję. Jeśli wiadomość przepadnie, elekcję po upływie
+    timeout (czasu symulowanego) ponawia proces, który wciąż widzi martwego
+    koordynatora.
+    """
+    results = []
+    for mean in latencies:
+        times, messages, failed = [], [], 0
+        for i in range(runs):
+            link = LinkModel(latency=exponential(mean), drop_prob=drop_prob, seed=seed + i)
+            network = RingNetwork(num_processes, verbose=False, link=link)
+            network.kill_process(num_processes - 1)
+            initiator = network.processes[0]
+            for _ in range(max_attempts):
+                initiator.start_election()
+                if network.converged():
+                    break
+                # Elekcję ponawia proces, który wciąż widzi martwego koordynatora
+                network.clock += timeout
+                initiator = next(p for p in network.processes
+                                 if p.alive and not network.processes[p.coordinator_id].alive)
+            if network.converged():
+                times.append(network.clock)
+                messages.append(network.messages)
+            else:
+                failed += 1
+        results.append({
+            "latency": mean,
+            "convergence": sum(times) / len(times) if times else None,
+            "messages": sum(messages) / len(messages) if messages else None,
+            "failed": failed,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja algorytmu pierścieniowego")
+    parser.add_argument("--processes", type=int, default=5)
+    parser.add_argument("--events", type=int, default=8)
+    parser.add_argument("--headless", action="store_true", help="seria symulacji bez opóźnień i wypisywania")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--memory", action="store_true", help="zmierz pamięć na węzeł dla --processes")
+    parser.add_argument("--latency-sweep", action="store_true", help="zbieżność elekcji w funkcji opóźnienia")
+    parser.add_argument("--drop", type=float, default=0.0, help="prawdopodobieństwo zgubienia wiadomości")
+    args = parser.parse_args()
+    
+    if args.latency_sweep:
+        print(f"Procesy: {args.processes}, utrata wiadomości: {args.drop:.0%}")
+        for r in latency_sweep([0.001, 0.005, 0.01, 0.05, 0.1], args.processes, args.drop):
+            if r["convergence"] is None:
+                print(f"  opóźnienie {r['latency'] * 1000:6.1f} ms: brak zbieżności")
+                continue
+            print(f"  opóźnienie {r['latency'] * 1000:6.1f} ms: zbieżność {r['convergence'] * 1000:8.1f} ms, "
+                  f"wiadomości {r['messages']:6.1f}, nieudane {r['failed']}")
+        return
+    
+    if args.memory:
+        per_node = memory_per_node(args.processes)
+        print(f"Węzły: {args.processes}, pamięć: {per_node:.1f} B/węzeł, "
+              f"razem: {per_node * args.processes / 2**20:.1f} MiB")
+        return
+    
+    if not args.headless:
+        simulator = RingSimulator(num_processes=args.processes, max_events=args.events,
+                                  seed=args.seed, scenario=SCENARIOS[args.scenario])
+        simulator.run()
+        return
+    
+    stats = run_batch(args.runs, args.scenario, args.processes, args.events, args.seed or 0)
+    print(f"Scenariusz: {args.scenario}, przebiegi: {stats['runs']}")
+    print(f"  Elekcje na przebieg:       {stats['elections_per_run']:.2f}")
+    print(f"  Wiadomości na elekcję:     {stats['messages_per_election']:.2f}")
+    print(f"  Średni czas okrążenia:     {stats['avg_lap_time'] * 1e6:.1f} us")
+    print(f"  Przebiegi na sekundę:      {stats['runs_per_second']:.0f}")
+
+
 if __name__ == "__main__":
-    simulator = RingSimulator(num_processes=5, max_events=8)
-    simulator.run()
\ No newline at end of file
+    main()
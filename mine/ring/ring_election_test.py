@@ -0,0 +1,135 @@
+import unittest
+import asyncio
+import itertools
+import random
+from ring_election import LinkModel, RingNetwork, RingSimulator, SCENARIOS, exponential
+from ring_async import AsyncRingNetwork
+
+
+class TestRingElection(unittest.TestCase):
+    
+    def setUp(self):
+        self.network = RingNetwork(5, verbose=False)
+    
+    def test_initial_coordinator(self):
+        for p in self.network.processes:
+            self.assertEqual(p.coordinator_id, 4)
+    
+    def test_ring_is_closed(self):
+        self.assertIs(self.network.processes[4].next_process, self.network.processes[0])
+    
+    def test_election_highest_alive_wins(self):
+        self.network.kill_process(4)
+        self.network.processes[1].start_election()
+        for p in self.network.processes:
+            if p.alive:
+                self.assertEqual(p.coordinator_id, 3)
+    
+    def test_find_next_alive_skips_dead(self):
+        self.network.kill_process(1)
+        self.assertEqual(self.network.processes[0].find_next_alive().id, 2)
+    
+    def test_messages_and_laps_counted(self):
+        self.network.kill_process(4)
+        self.network.processes[0].start_election()
+        self.assertEqual(self.network.elections, 1)
+        self.assertEqual(len(self.network.lap_times), 1)
+        # 4 przeskoki ELECTION + 3 przeskoki COORDINATOR
+        self.assertEqual(self.network.messages, 7)
+    
+    def test_long_ring_election_without_recursion(self):
+        network = RingNetwork(20000, verbose=False)
+        network.kill_process(19999)
+        network.processes[0].start_election()
+        self.assertEqual(network.processes[123].coordinator_id, 19998)
+        self.assertFalse(hasattr(network.processes[0], "__dict__"))
+
+
+class TestAsyncRing(unittest.TestCase):
+    
+    def test_election_highest_alive_wins(self):
+        network = AsyncRingNetwork(6, link_delay=0, verbose=False)
+        network.kill_process(5)
+        stats = asyncio.run(network.run_elections([0]))
+        self.assertEqual(stats["completed"], 1)
+        for p in network.processes:
+            if p.alive:
+                self.assertEqual(p.coordinator_id, 4)
+    
+    def test_concurrent_elections_agree(self):
+        network = AsyncRingNetwork(8, link_delay=0.001, verbose=False)
+        network.kill_process(7)
+        stats = asyncio.run(network.run_elections([0, 2, 4]))
+        self.assertEqual(stats["completed"], 3)
+        self.assertGreater(stats["messages"], 0)
+        for p in network.processes:
+            if p.alive:
+                self.assertEqual(p.coordinator_id, 6)
+    
+    def test_partition_splits_ring(self):
+        link = LinkModel()
+        network = AsyncRingNetwork(6, verbose=False, link=link)
+        link.partition([0, 1, 2], [3, 4, 5])
+        network.kill_process(5)
+        asyncio.run(network.run_elections([0]))
+        self.assertEqual(network.processes[1].coordinator_id, 2)
+
+
+class TestLinkModel(unittest.TestCase):
+    
+    def test_latency_advances_clock(self):
+        network = RingNetwork(5, verbose=False, link=LinkModel(latency=0.01))
+        network.kill_process(4)
+        network.processes[0].start_election()
+        self.assertAlmostEqual(network.clock, 0.07)
+    
+    def test_per_link_latency(self):
+        link = LinkModel(latency=exponential(0.01), seed=1)
+        link.set_latency(0, 1, 0.5)
+        self.assertEqual(link.delay(0, 1), 0.5)
+    
+    def test_dropped_message_stops_election(self):
+        network = RingNetwork(5, verbose=False, link=LinkModel(drop_prob=1.0))
+        network.kill_process(4)
+        network.processes[0].start_election()
+        self.assertFalse(network.converged())
+        self.assertEqual(network.link.dropped, 1)
+    
+    def test_partition_skips_unreachable(self):
+        link = LinkModel()
+        network = RingNetwork(5, verbose=False, link=link)
+        link.partition([0, 2], [1, 3, 4])
+        self.assertEqual(network.processes[0].find_next_alive().id, 2)
+        link.heal()
+        self.assertEqual(network.processes[0].find_next_alive().id, 1)
+
+
+class TestHeadlessSimulator(unittest.TestCase):
+    
+    def test_same_seed_same_metrics(self):
+        a = RingSimulator(8, 40, headless=True, seed=7).run()
+        b = RingSimulator(8, 40, headless=True, seed=7).run()
+        self.assertEqual(a["elections"], b["elections"])
+        self.assertEqual(a["messages"], b["messages"])
+    
+    def test_mass_kill_triggers_election(self):
+        sim = RingSimulator(10, 20, headless=True, seed=1, scenario=SCENARIOS["mass_kill"])
+        metrics = sim.run()
+        self.assertGreaterEqual(metrics["elections"], 1)
+        coords = {p.coordinator_id for p in sim.network.processes if p.alive}
+        alive = [p.id for p in sim.network.processes if p.alive]
+        self.assertEqual(coords, {max(alive)})
+    
+    def test_all_scenarios_run(self):
+        for scenario in SCENARIOS.values():
+            metrics = RingSimulator(6, 30, headless=True, seed=3, scenario=scenario).run()
+            self.assertIn("messages_per_election", metrics)
+    
+    def test_flapping_without_extra_flappers(self):
+        network = RingNetwork(5, verbose=False)
+        events = SCENARIOS["flapping"](network, random.Random(0), flappers=0, flip_prob=1.0)
+        self.assertEqual({pid for _, pid in itertools.islice(events, 20)}, {4})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
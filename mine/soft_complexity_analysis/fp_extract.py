@@ -0,0 +1,326 @@
+"""
+Punkty funkcyjne z kodu zrodlowego Pythona (ast)
+
+Pliki .py drzewa katalogow parsowane sa modulem ast w procesach roboczych,
+a punkty wejscia klasyfikowane wg HEURISTICS (slownik, mozna podac wlasny
+w JSON przez --heuristics):
+- ILF: klasy danych (bazy/dekoratory z "data_bases"/"data_decorators"),
+  zlozonosc wg liczby pol,
+- EIF: uzywane biblioteki zewnetrzne z "external" (raz na cale drzewo),
+  zlozonosc wg liczby roznych uzywanych skladowych biblioteki,
+- EI/EQ/EO: publiczne funkcje i metody wg dekoratorow ("decorators")
+  albo przedrostka nazwy ("prefixes"); zlozonosc wg liczby parametrow (DET)
+  i liczby klas danych uzywanych w ciele (FTR). Klasy danych zbierane sa
+  z calego drzewa (Extractor), wiec FTR liczy sie tez dla modeli z innego
+  pliku (np. models.py); wystarczy, ze nazwa klasy pada w ciele funkcji.
+Wynik to lista (typ, zlozonosc, nazwa) jak cinema_functions, wiec trafia
+prosto do calculate_ufp / calculate_fp.
+
+Pamiec podreczna (JSON) trzyma wynik kazdego pliku razem z mtime, rozmiarem
+i skrotem SHA-256: plik o tym samym mtime i rozmiarze nie jest nawet czytany,
+plik z nowym mtime, ale tym samym skrotem nie jest parsowany ponownie
+(skrot liczy proces roboczy przy jedynym odczycie pliku).
+Zmiana heurystyk uniewaznia cala pamiec.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from function_points import COMPLEXITY, TYPES, calculate_fp, calculate_ufp, print_report
+
+HEURISTICS = {
+    # Transakcje wg dekoratora (ostatni czlon nazwy, np. app.post -> "post")
+    "decorators": {
+        "post": "EI", "put": "EI", "patch": "EI", "delete": "EI",
+        "get": "EQ",
+        "command": "EI",
+    },
+    # Transakcje wg przedrostka nazwy funkcji (pierwszy pasujacy)
+    "prefixes": [
+        ["create_", "EI"], ["add_", "EI"], ["update_", "EI"], ["delete_", "EI"], ["remove_", "EI"],
+        ["set_", "EI"], ["save_", "EI"], ["register_", "EI"], ["import_", "EI"],
+        ["get_", "EQ"], ["find_", "EQ"], ["list_", "EQ"], ["search_", "EQ"], ["fetch_", "EQ"],
+        ["load_", "EQ"], ["query_", "EQ"], ["show_", "EQ"],
+        ["report_", "EO"], ["export_", "EO"], ["print_", "EO"], ["render_", "EO"],
+        ["generate_", "EO"], ["calculate_", "EO"], ["send_", "EO"],
+    ],
+    # Klasy danych (ILF)
+    "data_bases": ["Model", "Base", "NamedTuple", "TypedDict", "Document", "Table"],
+    "data_decorators": ["dataclass"],
+    # Biblioteki zewnetrzne (EIF)
+    "external": ["requests", "httpx", "urllib", "boto3", "redis", "psycopg2", "pymongo", "sqlite3", "smtplib"],
+    # Progi: <= low -> Low, <= high -> Average, wiecej -> High
+    "ilf_fields": [5, 15],
+    "eif_members": [5, 15],
+    "transaction_dets": [4, 15],
+    "transaction_ftrs": [1, 2],
+}
+
+CACHE_FORMAT = 2  # zmiana zapisu wyniku pliku w pamieci podrecznej
+SKIP_DIRS = {".git", ".hg", ".svn", "__pycache__", ".venv", "venv", "env", "node_modules", ".tox", "build", "dist"}
+
+
+def _level(value, thresholds):
+    low, high = thresholds
+    return "Low" if value <= low else "Average" if value <= high else "High"
+
+
+def _name(node):
+    """Ostatni czlon nazwy (x.y.z -> z, wywolanie f(...) -> f)."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+
+def _fields(cls):
+    fields = set()
+    for node in cls.body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            fields.add(node.target.id)
+        elif isinstance(node, ast.Assign):
+            fields.update(t.id for t in node.targets if isinstance(t, ast.Name))
+    return fields
+
+
+def _transaction(func, heuristics):
+    for decorator in func.decorator_list:
+        kind = heuristics["decorators"].get(_name(decorator))
+        if kind:
+            return kind
+    for prefix, kind in heuristics["prefixes"]:
+        if func.name.startswith(prefix):
+            return kind
+    return None
+
+
+def _transaction_complexity(dets, ftrs, heuristics):
+    det_level = _level(dets, heuristics["transaction_dets"])
+    ftr_level = _level(ftrs, heuristics["transaction_ftrs"])
+    return max(det_level, ftr_level, key=COMPLEXITY.get)
+
+
+def _scan(source, path, heuristics):
+    """ILF i EIF pliku, nazwy jego klas danych i transakcje [typ, DET, uzyte nazwy, nazwa]."""
+    tree = ast.parse(source, path)
+    data_bases = set(heuristics["data_bases"])
+    data_decorators = set(heuristics["data_decorators"])
+    external = set(heuristics["external"])
+    functions = []
+
+    # Klasy danych - ich nazwy potrzebne tez do liczenia FTR transakcji
+    data_classes = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            if ({_name(b) for b in node.bases} & data_bases
+                    or {_name(d) for d in node.decorator_list} & data_decorators):
+                data_classes[node.name] = len(_fields(node))
+    for name, count in data_classes.items():
+        functions.append(("ILF", _level(count, heuristics["ilf_fields"]), f"{path}:{name}"))
+
+    # Biblioteki zewnetrzne; zlozonosc wg liczby roznych uzywanych skladowych
+    used = {}  # biblioteka -> nazwy skladowych
+    aliases = {}  # nazwa w pliku -> biblioteka
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                root = alias.name.split(".")[0]
+                if root in external:
+                    used.setdefault(root, set())
+                    aliases[alias.asname or root] = root
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            root = (node.module or "").split(".")[0]
+            if root in external:
+                used.setdefault(root, set()).update(alias.name for alias in node.names)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in aliases:
+            used[aliases[node.value.id]].add(node.attr)
+    for root, members in used.items():
+        functions.append(("EIF", _level(len(members), heuristics["eif_members"]), root))
+
+    transactions = []
+
+    def visit(body, owner):
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                visit(node.body, f"{owner}{node.name}.")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith("_"):
+                kind = _transaction(node, heuristics)
+                if kind is None:
+                    continue
+                args = node.args
+                dets = len(args.posonlyargs + args.args + args.kwonlyargs) + bool(args.vararg) + bool(args.kwarg)
+                if args.args and args.args[0].arg in ("self", "cls"):
+                    dets -= 1
+                names = sorted({n.id for n in ast.walk(node) if isinstance(n, ast.Name)})
+                transactions.append([kind, dets, names, f"{path}:{owner}{node.name}"])
+
+    visit(tree.body, "")
+    return functions, sorted(data_classes), transactions
+
+
+def analyse_source(source, path="<string>", heuristics=HEURISTICS):
+    """Funkcje (typ, zlozonosc, nazwa) jednego pliku; EIF nazwane sa samym modulem.
+    
+    FTR liczone sa tylko wzgledem klas danych z tego pliku - dla calego
+    drzewa (modele w innych plikach) sluzy Extractor.
+    """
+    functions, data_classes, transactions = _scan(source, path, heuristics)
+    data_classes = set(data_classes)
+    for kind, dets, names, label in transactions:
+        ftrs = len(data_classes.intersection(names))
+        functions.append((kind, _transaction_complexity(dets, ftrs, heuristics), label))
+    return functions
+
+
+def _analyse_file(job):
+    """(nazwa, skrot, wynik pliku); wynik None, gdy skrot rowny known_hash (tresc bez zmian)."""
+    path, name, heuristics, known_hash = job
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == known_hash:
+        return name, digest, None
+    try:
+        functions, data_classes, transactions = _scan(data, name, heuristics)
+    except (SyntaxError, ValueError):
+        # plik, ktorego nie da sie sparsowac, nie wnosi punktow
+        functions, data_classes, transactions = [], [], []
+    return name, digest, {"functions": [list(f) for f in functions], "classes": data_classes,
+                          "transactions": transactions}
+
+
+def iter_sources(root):
+    """Pliki .py pod root (sciezki wzgledne z "/"), bez katalogow ukrytych i srodowisk."""
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for file in sorted(files):
+            if file.endswith(".py"):
+                yield os.path.relpath(os.path.join(directory, file), root).replace(os.sep, "/")
+
+
+class Extractor:
+    """Analiza drzewa zrodel z pamiecia podreczna wynikow per plik."""
+
+    def __init__(self, heuristics=HEURISTICS, workers=0, cache_path=None, chunksize=16):
+        self.heuristics = heuristics
+        self.workers = workers
+        self.cache_path = cache_path
+        self.chunksize = chunksize
+        self.key = hashlib.sha256(json.dumps([CACHE_FORMAT, heuristics], sort_keys=True).encode()).hexdigest()
+        self.files = {}  # sciezka -> {"mtime", "size", "hash", "functions", "classes", "transactions"}
+        self.analysed = 0
+        self.cached = 0
+        self.elapsed = 0.0
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cache = json.load(f)
+                if cache.get("heuristics") == self.key:
+                    self.files = cache["files"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def analyse(self, root):
+        """Funkcje calego drzewa (typ, zlozonosc, nazwa); EIF policzone raz na biblioteke."""
+        start = time.perf_counter()
+        self.analysed = self.cached = 0
+        files = {}
+        jobs = []
+        for name in iter_sources(root):
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            entry = self.files.get(name)
+            if entry is not None and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                files[name] = entry
+                self.cached += 1
+                continue
+            # Nowy mtime - proces roboczy porowna skrot z zapamietanym i sparsuje tylko zmieniony plik
+            files[name] = dict(entry or {}, mtime=stat.st_mtime_ns, size=stat.st_size)
+            jobs.append((path, name, self.heuristics, entry and entry["hash"]))
+
+        if self.workers and len(jobs) > 1:
+            with ProcessPoolExecutor(self.workers) as executor:
+                results = list(executor.map(_analyse_file, jobs, chunksize=self.chunksize))
+        else:
+            results = [_analyse_file(job) for job in jobs]
+        for name, digest, result in results:
+            if result is None:  # dotkniety, ale bez zmian
+                self.cached += 1
+                continue
+            files[name].update(result, hash=digest)
+            self.analysed += 1
+
+        self.files = files
+        if self.cache_path:
+            self.save()
+        self.elapsed = time.perf_counter() - start
+        return self.functions()
+
+    def functions(self):
+        result = []
+        libraries = {}  # biblioteka -> najwyzsza zlozonosc w drzewie
+        # FTR wzgledem klas danych z calego drzewa, nie tylko z pliku transakcji
+        data_classes = {c for entry in self.files.values() for c in entry["classes"]}
+        for name in sorted(self.files):
+            entry = self.files[name]
+            for func_type, complexity, label in entry["functions"]:
+                if func_type == "EIF":
+                    if COMPLEXITY[complexity] >= COMPLEXITY[libraries.get(label, "Low")]:
+                        libraries[label] = complexity
+                    continue
+                result.append((func_type, complexity, label))
+            for kind, dets, names, label in entry["transactions"]:
+                ftrs = len(data_classes.intersection(names))
+                result.append((kind, _transaction_complexity(dets, ftrs, self.heuristics), label))
+        return result + [("EIF", complexity, label) for label, complexity in libraries.items()]
+
+    def save(self):
+        tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"heuristics": self.key, "files": self.files}, f)
+        os.replace(tmp, self.cache_path)
+
+    def stats(self):
+        return {"files": len(self.files), "analysed": self.analysed, "cached": self.cached, "elapsed": self.elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Punkty funkcyjne z kodu Pythona (ast)")
+    parser.add_argument("root", help="katalog ze zrodlami")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 - bez procesow roboczych")
+    parser.add_argument("--cache", help="plik JSON z pamiecia podreczna wynikow per plik")
+    parser.add_argument("--heuristics", help="plik JSON z heurystykami (nadpisuje klucze HEURISTICS)")
+    parser.add_argument("--gsc", type=int, nargs=14, default=[3] * 14, metavar="N", help="14 wartosci GSC 0-5")
+    parser.add_argument("--report", action="store_true", help="pelny raport z lista funkcji")
+    args = parser.parse_args()
+
+    heuristics = dict(HEURISTICS)
+    if args.heuristics:
+        with open(args.heuristics, encoding="utf-8") as f:
+            heuristics.update(json.load(f))
+    extractor = Extractor(heuristics, args.workers, args.cache)
+    functions = extractor.analyse(args.root)
+    stats = extractor.stats()
+    print(f"Pliki: {stats['files']} (przeanalizowane: {stats['analysed']}, z pamieci: {stats['cached']}), "
+          f"czas: {stats['elapsed']:.2f} s", file=sys.stderr)
+
+    if args.report:
+        print_report(functions, args.gsc)
+        return
+    for func_type in TYPES:
+        print(f"  {func_type}: {sum(1 for f in functions if f[0] == func_type)}")
+    print(f"UFP = {calculate_ufp(functions)}, FP = {calculate_fp(functions, args.gsc):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from fp_extract import HEURISTICS, Extractor, analyse_source
+from function_points import calculate_ufp
+
+SHOP = '''
+from dataclasses import dataclass
+import requests as http
+
+
+@dataclass
+class Order:
+    id: int
+    customer: str
+    total: float
+
+
+class Shop:
+    def create_order(self, customer, items):
+        return Order(1, customer, 0.0)
+
+    def get_order(self, order_id):
+        return http.get(f"/orders/{order_id}").json()
+
+    def _helper(self):
+        pass
+
+
+@app.post("/orders")
+def checkout(cart):
+    http.post("/pay", json=cart)
+
+
+def export_orders(a, b, c, d, e, f, g, h, i, j, k, l, m, n, o, p):
+    pass
+
+
+def unrelated():
+    pass
+'''
+
+
+class TestAnalyseSource(unittest.TestCase):
+    
+    def test_classification(self):
+        functions = analyse_source(SHOP, "shop.py")
+        by_name = {name: (kind, complexity) for kind, complexity, name in functions}
+        self.assertEqual(by_name["shop.py:Order"], ("ILF", "Low"))
+        self.assertEqual(by_name["requests"], ("EIF", "Low"))
+        self.assertEqual(by_name["shop.py:Shop.create_order"], ("EI", "Low"))
+        self.assertEqual(by_name["shop.py:Shop.get_order"], ("EQ", "Low"))
+        self.assertEqual(by_name["shop.py:checkout"], ("EI", "Low"))
+        self.assertEqual(by_name["shop.py:export_orders"], ("EO", "High"))
+        self.assertNotIn("shop.py:unrelated", by_name)
+        self.assertNotIn("shop.py:Shop._helper", by_name)
+        self.assertEqual(calculate_ufp(functions), 7 + 5 + 3 + 3 + 3 + 7)
+    
+    def test_custom_heuristics(self):
+        heuristics = dict(HEURISTICS, prefixes=[["unrelated", "EQ"]], decorators={})
+        names = {name for _, _, name in analyse_source(SHOP, "shop.py", heuristics)}
+        self.assertIn("shop.py:unrelated", names)
+        self.assertNotIn("shop.py:checkout", names)
+
+
+class TestExtractor(unittest.TestCase):
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = os.path.join(self.root, ".fp_cache.json")
+        os.makedirs(os.path.join(self.root, "pkg", "__pycache__"))
+        self.write("pkg/shop.py", SHOP)
+        self.write("pkg/__pycache__/skip.py", SHOP)
+        self.write("pkg/broken.py", "def get_x(:\n")
+        for i in range(5):
+            self.write(f"mod_{i}.py", f"import requests\n\ndef get_item_{i}(x):\n    return requests.get(x)\n")
+    
+    def tearDown(self):
+        shutil.rmtree(self.root)
+    
+    def write(self, name, text):
+        with open(os.path.join(self.root, name), "w") as f:
+            f.write(text)
+    
+    def test_cache(self):
+        first = Extractor(cache_path=self.cache)
+        functions = first.analyse(self.root)
+        self.assertEqual(first.stats()["analysed"], 7)
+        self.assertEqual(sum(1 for f in functions if f[0] == "EIF"), 1)  # requests raz na drzewo
+        self.assertEqual(len(functions), 6 + 5)
+        
+        again = Extractor(cache_path=self.cache)
+        self.assertEqual(again.analyse(self.root), functions)
+        self.assertEqual((again.analysed, again.cached), (0, 7))
+        
+        # Ta sama tresc z nowym mtime - bez parsowania; zmiana tresci - tylko ten plik
+        path = os.path.join(self.root, "mod_0.py")
+        os.utime(path, ns=(0, 0))
+        self.write("mod_1.py", "def list_all():\n    pass\n")
+        changed = Extractor(cache_path=self.cache)
+        result = changed.analyse(self.root)
+        self.assertEqual((changed.analysed, changed.cached), (1, 6))
+        self.assertIn(("EQ", "Low", "mod_1.py:list_all"), result)
+        self.assertNotIn(("EQ", "Low", "mod_1.py:get_item_1"), result)
+        
+        other = Extractor(dict(HEURISTICS, prefixes=[]), cache_path=self.cache)
+        other.analyse(self.root)
+        self.assertEqual(other.analysed, 7)  # inne heurystyki - pamiec nieaktualna
+    
+    def test_ftr_across_files(self):
+        models = "".join(f"@dataclass\nclass Model{i}:\n    id: int\n\n\n" for i in range(3))
+        self.write("pkg/models.py", "from dataclasses import dataclass\n\n\n" + models)
+        self.write("pkg/handlers.py", "from models import Model0, Model1, Model2\n\n\n"
+                   "def create_all(x):\n    return Model0(x), Model1(x), Model2(x)\n")
+        functions = Extractor().analyse(self.root)
+        self.assertIn(("EI", "High", "pkg/handlers.py:create_all"), functions)  # 3 FTR z models.py
+        # Sam plik bez modeli - FTR = 0
+        with open(os.path.join(self.root, "pkg", "handlers.py")) as f:
+            self.assertIn(("EI", "Low", "handlers.py:create_all"), analyse_source(f.read(), "handlers.py"))
+    
+    def test_workers_match_inline(self):
+        self.assertEqual(Extractor(workers=2).analyse(self.root), Extractor().analyse(self.root))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
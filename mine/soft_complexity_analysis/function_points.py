@@ -1,3 +1,23 @@
+"""
+Punkty funkcyjne (IFPUG) - UFP, VAF, FP
+
+Obliczenia (calculate_*, batch_*) nic nie wypisuja; raport tekstowy dla
+jednego projektu robi print_report. Tryb wsadowy czyta portfel projektow
+strumieniowo (JSONL albo CSV z licznikami funkcji) i liczy UFP/TDI/VAF/FP
+dla calych fragmentow naraz - wagi pobierane sa z tablicy NumPy indeksami
+typu i zlozonosci zamiast slownikow dla kazdej funkcji osobno.
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
 # Tablica wag IFPUG
 WEIGHTS = {
     #        Low  Avg  High
@@ -10,14 +30,25 @@ WEIGHTS = {
 
 COMPLEXITY = {"Low": 0, "Average": 1, "High": 2}
 
+# Te same wagi jako tablica (typ x zlozonosc) do obliczen wsadowych
+TYPES = list(WEIGHTS)
+TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+WEIGHT_TABLE = np.array([WEIGHTS[t] for t in TYPES], dtype=np.int64)
+# Kolumny licznikow w CSV: EI_Low, EI_Average, ..., EIF_High (kolejnosc jak WEIGHT_TABLE.ravel())
+COUNT_COLUMNS = [f"{t}_{c}" for t in TYPES for c in COMPLEXITY]
+# typ -> zlozonosc -> numer w WEIGHT_TABLE.ravel()
+FLAT_INDEX = {t: {c: TYPE_INDEX[t] * len(COMPLEXITY) + i for c, i in COMPLEXITY.items()} for t in TYPES}
+NUM_GSC = 14
+GSC_COLUMNS = [f"gsc_{i}" for i in range(1, NUM_GSC + 1)]
+
 # Unadjusted Function Points
+def ufp_breakdown(functions):
+    """Waga kazdej funkcji: lista (nazwa, typ, zlozonosc, waga)."""
+    return [(name, func_type, complexity, WEIGHTS[func_type][COMPLEXITY[complexity]])
+            for func_type, complexity, name in functions]
+
 def calculate_ufp(functions):
-    ufp = 0
-    for func_type, complexity, name in functions:
-        weight = WEIGHTS[func_type][COMPLEXITY[complexity]]
-        ufp += weight
-        print(f"  {name}: {func_type} ({complexity}) = {weight} pkt")
-    return ufp
+    return sum(WEIGHTS[func_type][COMPLEXITY[complexity]] for func_type, complexity, _ in functions)
 
 # Value Adjustment Factor
 def calculate_vaf(gsc):
@@ -27,33 +58,287 @@ def calculate_vaf(gsc):
 
 # Function Points
 def calculate_fp(functions, gsc):
-    print("\n" + "=" * 50)
-    print("RAPORT PUNKTOW FUNKCYJNYCH")
-    print("=" * 50)
+    vaf, _ = calculate_vaf(gsc)
+    return calculate_ufp(functions) * vaf
+
+def print_report(functions, gsc, out=None):
+    """Raport punktow funkcyjnych jednego projektu; zwraca FP."""
+    out = out or sys.stdout
+    def say(text=""):
+        print(text, file=out)
+    
+    say("\n" + "=" * 50)
+    say("RAPORT PUNKTOW FUNKCYJNYCH")
+    say("=" * 50)
     
-    print("\n1. FUNKCJE SYSTEMU:")
-    print("-" * 50)
+    say("\n1. FUNKCJE SYSTEMU:")
+    say("-" * 50)
+    for name, func_type, complexity, weight in ufp_breakdown(functions):
+        say(f"  {name}: {func_type} ({complexity}) = {weight} pkt")
     ufp = calculate_ufp(functions)
     
-    print("-" * 50)
-    print(f"   UFP (Unadjusted Function Points) = {ufp}")
+    say("-" * 50)
+    say(f"   UFP (Unadjusted Function Points) = {ufp}")
     
-    print("\n2. WSPOLCZYNNIKI WPLYWU (GSC):")
-    print("-" * 50)
+    say("\n2. WSPOLCZYNNIKI WPLYWU (GSC):")
+    say("-" * 50)
     vaf, tdi = calculate_vaf(gsc)
-    print(f"   TDI (Total Degree of Influence) = {tdi}")
-    print(f"   VAF = 0.65 + (0.01 x {tdi}) = {vaf:.2f}")
+    say(f"   TDI (Total Degree of Influence) = {tdi}")
+    say(f"   VAF = 0.65 + (0.01 x {tdi}) = {vaf:.2f}")
     
     fp = ufp * vaf
     
-    print("\n3. WYNIK KONCOWY:")
-    print("-" * 50)
-    print(f"   FP = UFP x VAF = {ufp} x {vaf:.2f} = {fp:.1f}")
-    print("=" * 50)
+    say("\n3. WYNIK KONCOWY:")
+    say("-" * 50)
+    say(f"   FP = UFP x VAF = {ufp} x {vaf:.2f} = {fp:.1f}")
+    say("=" * 50)
     
     return fp
 
 
+class FunctionPointModel:
+    """Punkty funkcyjne projektu aktualizowane przyrostowo.
+    
+    Trzyma liczniki funkcji (typ x zlozonosc), UFP i TDI, wiec dodanie,
+    usuniecie czy przeklasyfikowanie funkcji albo zmiana GSC to O(1)
+    zamiast ponownego calculate_fp. Kazda zmiana trafia do history.
+    """
+    
+    def __init__(self, functions=(), gsc=None):
+        self.functions = {}  # nazwa -> (typ, zlozonosc)
+        self.counts = {t: [0] * len(COMPLEXITY) for t in TYPES}
+        self.gsc = list(gsc) if gsc is not None else [0] * NUM_GSC
+        if len(self.gsc) != NUM_GSC:
+            raise ValueError(f"GSC musi miec {NUM_GSC} wartosci")
+        for value in self.gsc:
+            self._check_gsc(value)
+        self.ufp = 0
+        self.tdi = sum(self.gsc)
+        self.history = []
+        for func_type, complexity, name in functions:
+            self._check_new(name)
+            self._insert(name, func_type, complexity)
+    
+    @property
+    def vaf(self):
+        return 0.65 + (0.01 * self.tdi)
+    
+    @property
+    def fp(self):
+        return self.ufp * self.vaf
+    
+    def _check_new(self, name):
+        if name in self.functions:
+            raise ValueError(f"Funkcja {name!r} juz istnieje")
+    
+    @staticmethod
+    def _check_gsc(value):
+        if not 0 <= value <= 5:
+            raise ValueError("Wartosc GSC musi byc z zakresu 0-5")
+    
+    def _insert(self, name, func_type, complexity):
+        weight = WEIGHTS[func_type][COMPLEXITY[complexity]]  # KeyError dla nieznanego typu/zlozonosci
+        self.functions[name] = (func_type, complexity)
+        self.counts[func_type][COMPLEXITY[complexity]] += 1
+        self.ufp += weight
+    
+    def _delete(self, name):
+        func_type, complexity = self.functions.pop(name)
+        self.counts[func_type][COMPLEXITY[complexity]] -= 1
+        self.ufp -= WEIGHTS[func_type][COMPLEXITY[complexity]]
+        return func_type, complexity
+    
+    def _record(self, action, name, before, after):
+        self.history.append({"action": action, "name": name, "before": before, "after": after,
+                             "ufp": self.ufp, "fp": self.fp})
+    
+    def add(self, func_type, complexity, name):
+        self._check_new(name)
+        self._insert(name, func_type, complexity)
+        self._record("add", name, None, (func_type, complexity))
+        return self.fp
+    
+    def remove(self, name):
+        before = self._delete(name)
+        self._record("remove", name, before, None)
+        return self.fp
+    
+    def reclassify(self, name, func_type=None, complexity=None):
+        """Zmienia typ i/lub zlozonosc istniejacej funkcji."""
+        before = self.functions[name]
+        after = (func_type or before[0], complexity or before[1])
+        WEIGHTS[after[0]][COMPLEXITY[after[1]]]  # walidacja przed zmiana stanu
+        self._delete(name)
+        self._insert(name, *after)
+        self._record("reclassify", name, before, after)
+        return self.fp
+    
+    def set_gsc(self, index, value):
+        """Ustawia GSC numer index (0-13) na wartosc 0-5."""
+        if not 0 <= index < NUM_GSC:
+            raise ValueError(f"Numer GSC musi byc z zakresu 0-{NUM_GSC - 1}")
+        self._check_gsc(value)
+        before = self.gsc[index]
+        self.gsc[index] = value
+        self.tdi += value - before
+        self._record("gsc", index, before, value)
+        return self.fp
+    
+    def apply(self, changes):
+        """Zmiany jako krotki: ("add", typ, zlozonosc, nazwa), ("remove", nazwa),
+        ("reclassify", nazwa, typ, zlozonosc), ("gsc", numer, wartosc); zwraca FP.
+        
+        Zestaw zmian jest atomowy - blad w dowolnej zmianie cofa wczesniejsze
+        (razem z ich wpisami w history) i jest zglaszany dalej.
+        """
+        handlers = {"add": self.add, "remove": self.remove, "reclassify": self.reclassify, "gsc": self.set_gsc}
+        mark = len(self.history)
+        try:
+            for action, *args in changes:
+                handlers[action](*args)
+        except Exception:
+            while len(self.history) > mark:
+                self._undo(self.history.pop())
+            raise
+        return self.fp
+    
+    def _undo(self, entry):
+        """Odwraca zmiane opisana wpisem history (bez nowego wpisu)."""
+        name, before, after = entry["name"], entry["before"], entry["after"]
+        if entry["action"] == "gsc":
+            self.gsc[name] = before
+            self.tdi += before - after
+            return
+        if after is not None:
+            self._delete(name)
+        if before is not None:
+            self._insert(name, *before)
+    
+    def function_list(self):
+        """Funkcje w formacie calculate_ufp / calculate_fp."""
+        return [(func_type, complexity, name) for name, (func_type, complexity) in self.functions.items()]
+
+
+# Obliczenia wsadowe
+def _adjust(ufp, gsc):
+    tdi = gsc.sum(axis=1)
+    vaf = 0.65 + 0.01 * tdi
+    return {"ufp": ufp, "tdi": tdi, "vaf": vaf, "fp": ufp * vaf}
+
+def batch_fp(projects):
+    """projects - lista (functions, gsc); zwraca slownik tablic ufp, tdi, vaf, fp."""
+    sizes = np.fromiter((len(functions) for functions, _ in projects), dtype=np.intp, count=len(projects))
+    codes = np.array([FLAT_INDEX[func_type][complexity]
+                      for functions, _ in projects for func_type, complexity, _ in functions], dtype=np.intp)
+    owners = np.repeat(np.arange(len(projects)), sizes)
+    ufp = np.bincount(owners, weights=WEIGHT_TABLE.ravel()[codes], minlength=len(projects))
+    gsc = np.array([g for _, g in projects], dtype=np.int64).reshape(len(projects), NUM_GSC)
+    return _adjust(ufp.astype(np.int64), gsc)
+
+def batch_fp_counts(counts, gsc):
+    """counts (N, 15) - liczba funkcji kazdego typu i zlozonosci (COUNT_COLUMNS), gsc (N, 14)."""
+    return _adjust(np.asarray(counts, dtype=np.int64) @ WEIGHT_TABLE.ravel(), np.asarray(gsc, dtype=np.int64))
+
+
+# Strumieniowe czytanie portfela
+def _project(line, number):
+    """Rekord JSONL portfela po sprawdzeniu; ValueError z nazwa projektu albo numerem rekordu."""
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Rekord nr {number}: niepoprawny JSON ({e})") from None
+    where = f"Projekt {record.get('project')!r}" if isinstance(record, dict) and "project" in record \
+        else f"Rekord nr {number}"
+    if not isinstance(record, dict) or not isinstance(record.get("functions"), list):
+        raise ValueError(f"{where}: brak listy \"functions\"")
+    for function in record["functions"]:
+        if not isinstance(function, list) or len(function) != 3:
+            raise ValueError(f"{where}: funkcja {function!r} nie jest trojka [typ, zlozonosc, nazwa]")
+        func_type, complexity, _ = function
+        if func_type not in FLAT_INDEX or complexity not in COMPLEXITY:
+            raise ValueError(f"{where}: nieznany typ albo zlozonosc funkcji {function!r}")
+    gsc = record.get("gsc")
+    if not isinstance(gsc, list) or len(gsc) != NUM_GSC or not all(type(g) is int for g in gsc):
+        raise ValueError(f"{where}: \"gsc\" musi byc lista {NUM_GSC} liczb calkowitych")
+    return record
+
+def read_jsonl(source, chunk=10_000):
+    """Fragmenty (nazwy, projekty) z linii {"project", "functions": [[typ, zlozonosc, nazwa]], "gsc"}."""
+    lines = (line for line in source if line.strip())
+    first = 1  # numer pierwszego rekordu fragmentu (do komunikatow bledow)
+    while True:
+        records = [_project(line, first + i) for i, line in enumerate(islice(lines, chunk))]
+        if not records:
+            return
+        first += len(records)
+        yield ([r.get("project", "") for r in records],
+               [(r["functions"], r["gsc"]) for r in records])
+
+def read_counts_csv(source, chunk=10_000):
+    """Fragmenty (nazwy, liczniki, gsc) z CSV: project, COUNT_COLUMNS..., gsc_1..gsc_14 (brak kolumny = 0)."""
+    reader = csv.reader(source)
+    header = next(reader, None)
+    if header is None:
+        return
+    position = {name: i for i, name in enumerate(header)}
+    count_cols = [position.get(c) for c in COUNT_COLUMNS]
+    gsc_cols = [position.get(c) for c in GSC_COLUMNS]
+    name_col = position.get("project")
+    first = 2  # numer wiersza pliku (naglowek to wiersz 1)
+    while True:
+        rows = list(islice(reader, chunk))
+        if not rows:
+            return
+        for i, row in enumerate(rows):
+            if len(row) != len(header):
+                raise ValueError(f"Wiersz {first + i}: {len(row)} kolumn zamiast {len(header)}")
+        def value(row, c, number):
+            if c is None or not row[c]:
+                return 0
+            try:
+                return int(row[c])
+            except ValueError:
+                raise ValueError(f"Wiersz {number}, kolumna {header[c]!r}: {row[c]!r} nie jest liczba "
+                                 "calkowita") from None
+        def matrix(cols):
+            return np.array([[value(row, c, first + i) for c in cols] for i, row in enumerate(rows)],
+                            dtype=np.int64).reshape(len(rows), len(cols))
+        names = [row[name_col] if name_col is not None else "" for row in rows]
+        counts, gsc = matrix(count_cols), matrix(gsc_cols)
+        first += len(rows)
+        yield names, counts, gsc
+
+def run_batch(source, fmt="jsonl", chunk=10_000):
+    """Liczy FP calego portfela; zwraca iterator (nazwy, wyniki) po fragmentach."""
+    if fmt == "csv":
+        for names, counts, gsc in read_counts_csv(source, chunk):
+            yield names, batch_fp_counts(counts, gsc)
+    else:
+        for names, projects in read_jsonl(source, chunk):
+            yield names, batch_fp(projects)
+
+def write_results(out, chunks):
+    """Raport wsadowy - CSV project,ufp,tdi,vaf,fp; zwraca liczbe projektow."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["project", "ufp", "tdi", "vaf", "fp"])
+    total = 0
+    for names, result in chunks:
+        writer.writerows(zip(names, result["ufp"].tolist(), result["tdi"].tolist(),
+                             np.round(result["vaf"], 2).tolist(), np.round(result["fp"], 1).tolist()))
+        total += len(names)
+    return total
+
+def random_portfolio(num_projects, seed=0, max_functions=60):
+    """Losowy portfel projektow [(nazwa, functions, gsc)] do testow i pomiarow."""
+    rng = random.Random(seed)
+    portfolio = []
+    for p in range(num_projects):
+        functions = [(rng.choice(TYPES), rng.choice(list(COMPLEXITY)), f"funkcja_{i}")
+                     for i in range(rng.randint(1, max_functions))]
+        portfolio.append((f"projekt_{p}", functions, [rng.randint(0, 5) for _ in range(NUM_GSC)]))
+    return portfolio
+
+
 cinema_functions = [
     # External Inputs
     ("EI", "Average", "Dodanie rezerwacji"),
@@ -101,6 +386,35 @@ cinema_gsc = [
     3,  # 14. Latwosc zmian
 ]
 
+def main():
+    parser = argparse.ArgumentParser(description="Punkty funkcyjne - raport albo obliczenia wsadowe")
+    parser.add_argument("--batch", metavar="FILE", help="portfel projektow (JSONL albo CSV z licznikami; - = stdin)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="domyslnie wg rozszerzenia (stdin: jsonl)")
+    parser.add_argument("-o", "--output", default="-", help="plik CSV z wynikami albo - (stdout)")
+    parser.add_argument("--chunk", type=int, default=10_000, help="projektow na fragment")
+    args = parser.parse_args()
+    
+    if not args.batch:
+        print("\nSYSTEM REZERWACJI BILETOW DO KINA")
+        print_report(cinema_functions, cinema_gsc)
+        return
+    
+    fmt = args.format or ("csv" if args.batch.lower().endswith(".csv") else "jsonl")
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8", newline="")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    start = time.perf_counter()
+    try:
+        total = write_results(out, run_batch(source, fmt, args.chunk))
+    except ValueError as error:  # zle wejscie - komunikat zamiast sladu stosu
+        parser.error(str(error))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Projekty: {total}, czas: {elapsed:.2f} s", file=sys.stderr)
+
+
 if __name__ == "__main__":
-    print("\nSYSTEM REZERWACJI BILETOW DO KINA")
-    fp = calculate_fp(cinema_functions, cinema_gsc)
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,155 @@
+import io
+import json
+import unittest
+
+import numpy as np
+
+from function_points import (COMPLEXITY, COUNT_COLUMNS, GSC_COLUMNS, FunctionPointModel, batch_fp,
+                             batch_fp_counts, calculate_fp, calculate_ufp, calculate_vaf, cinema_functions,
+                             cinema_gsc, print_report, random_portfolio, run_batch, write_results)
+
+
+class TestBatchFP(unittest.TestCase):
+    
+    def test_cinema(self):
+        self.assertEqual(calculate_ufp(cinema_functions), 97)
+        self.assertAlmostEqual(calculate_fp(cinema_functions, cinema_gsc), 97 * calculate_vaf(cinema_gsc)[0])
+        out = io.StringIO()
+        fp = print_report(cinema_functions, cinema_gsc, out)
+        self.assertAlmostEqual(fp, calculate_fp(cinema_functions, cinema_gsc))
+        self.assertIn("UFP (Unadjusted Function Points) = 97", out.getvalue())
+    
+    def test_batch_matches_single(self):
+        portfolio = random_portfolio(200, seed=1)
+        result = batch_fp([(functions, gsc) for _, functions, gsc in portfolio])
+        self.assertEqual(result["ufp"].tolist(), [calculate_ufp(f) for _, f, _ in portfolio])
+        self.assertEqual(result["tdi"].tolist(), [calculate_vaf(g)[1] for _, _, g in portfolio])
+        np.testing.assert_allclose(result["fp"], [calculate_fp(f, g) for _, f, g in portfolio])
+    
+    def test_counts_matches_functions(self):
+        portfolio = random_portfolio(50, seed=2)
+        counts = np.zeros((len(portfolio), len(COUNT_COLUMNS)), dtype=np.int64)
+        for i, (_, functions, _) in enumerate(portfolio):
+            for func_type, complexity, _ in functions:
+                counts[i, COUNT_COLUMNS.index(f"{func_type}_{complexity}")] += 1
+        gsc = [g for _, _, g in portfolio]
+        expected = batch_fp([(f, g) for _, f, g in portfolio])
+        result = batch_fp_counts(counts, gsc)
+        self.assertEqual(result["ufp"].tolist(), expected["ufp"].tolist())
+        np.testing.assert_allclose(result["fp"], expected["fp"])
+    
+    def test_streams(self):
+        portfolio = random_portfolio(30, seed=3)
+        jsonl = io.StringIO("".join(json.dumps({"project": name, "functions": functions, "gsc": gsc}) + "\n"
+                                    for name, functions, gsc in portfolio))
+        out = io.StringIO()
+        self.assertEqual(write_results(out, run_batch(jsonl, "jsonl", chunk=7)), 30)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "project,ufp,tdi,vaf,fp")
+        self.assertEqual([line.split(",")[0] for line in lines[1:]], [name for name, _, _ in portfolio])
+        
+        # CSV bez czesci kolumn - brakujace liczniki to zera
+        header = ["project", "EI_Low", "ILF_High"] + GSC_COLUMNS
+        rows = ["a,2,1," + ",".join(["1"] * 14), "b,0,0," + ",".join(["5"] * 14)]
+        source = io.StringIO(",".join(header) + "\n" + "\n".join(rows) + "\n")
+        chunks = list(run_batch(source, "csv", chunk=1))
+        self.assertEqual([names for names, _ in chunks], [["a"], ["b"]])
+        self.assertEqual(chunks[0][1]["ufp"].tolist(), [2 * 3 + 15])
+        self.assertEqual(chunks[1][1]["ufp"].tolist(), [0])
+        self.assertAlmostEqual(float(chunks[0][1]["fp"][0]), 21 * 0.79)
+        self.assertEqual(len(COMPLEXITY) * 5, len(COUNT_COLUMNS))
+    
+    def test_invalid_input(self):
+        good = {"project": "ok", "functions": [["EI", "Low", "a"]], "gsc": [1] * 14}
+        cases = [({"project": "p", "functions": [["EI", "Huge", "a"]], "gsc": [1] * 14}, "'p'"),
+                 ({"project": "p", "functions": [["XX", "Low", "a"]], "gsc": [1] * 14}, "'p'"),
+                 ({"project": "p", "functions": [["EI", "Low"]], "gsc": [1] * 14}, "'p'"),
+                 ({"project": "p", "functions": [], "gsc": [1] * 13}, "'p'"),
+                 ({"functions": [], "gsc": ["1"] * 14}, "nr 2"),
+                 ({"gsc": [1] * 14}, "nr 2")]
+        for record, where in cases:
+            source = io.StringIO(json.dumps(good) + "\n" + json.dumps(record) + "\n")
+            with self.assertRaisesRegex(ValueError, where):
+                list(run_batch(source, "jsonl", chunk=1))
+        with self.assertRaisesRegex(ValueError, "nr 2: niepoprawny JSON"):  # puste linie pomijane
+            list(run_batch(io.StringIO(json.dumps(good) + "\n" * 2 + "{zle\n"), "jsonl"))
+        
+        header = "project,EI_Low," + ",".join(GSC_COLUMNS) + "\n"
+        for row, where in (("a,x," + ",".join(["1"] * 14), "Wiersz 3, kolumna 'EI_Low'"),
+                           ("a,1", "Wiersz 3: 2 kolumn")):
+            source = io.StringIO(header + "b,1," + ",".join(["0"] * 14) + "\n" + row + "\n")
+            with self.assertRaisesRegex(ValueError, where):
+                list(run_batch(source, "csv", chunk=1))
+
+
+class TestFunctionPointModel(unittest.TestCase):
+    
+    def test_matches_full_recount(self):
+        model = FunctionPointModel(cinema_functions, cinema_gsc)
+        self.assertEqual(model.ufp, calculate_ufp(cinema_functions))
+        self.assertAlmostEqual(model.fp, calculate_fp(cinema_functions, cinema_gsc))
+        
+        fp = model.apply([
+            ("add", "EO", "High", "Raport sprzedazy"),
+            ("remove", cinema_functions[0][2]),
+            ("reclassify", cinema_functions[1][2], "EQ", "Low"),
+            ("reclassify", cinema_functions[2][2], None, "High"),
+            ("gsc", 0, 5),
+        ])
+        gsc = list(cinema_gsc)
+        gsc[0] = 5
+        self.assertEqual(model.ufp, calculate_ufp(model.function_list()))
+        self.assertEqual(model.tdi, sum(gsc))
+        self.assertAlmostEqual(fp, calculate_fp(model.function_list(), gsc))
+        self.assertEqual(sum(map(sum, model.counts.values())), len(model.functions))
+        self.assertEqual([h["action"] for h in model.history], ["add", "remove", "reclassify", "reclassify", "gsc"])
+        self.assertEqual(model.history[-1]["before"], cinema_gsc[0])
+        self.assertAlmostEqual(model.history[-1]["fp"], fp)
+    
+    def test_invalid_changes_leave_state(self):
+        model = FunctionPointModel([("EI", "Low", "a")])
+        with self.assertRaises(ValueError):
+            model.add("EO", "Low", "a")
+        with self.assertRaises(KeyError):
+            model.add("XX", "Low", "b")
+        with self.assertRaises(KeyError):
+            model.reclassify("a", "EI", "Huge")
+        with self.assertRaises(KeyError):
+            model.remove("brak")
+        with self.assertRaises(ValueError):
+            model.set_gsc(3, 6)
+        self.assertEqual(model.function_list(), [("EI", "Low", "a")])
+        self.assertEqual((model.ufp, model.tdi, model.history), (3, 0, []))
+    
+    def test_apply_is_atomic(self):
+        model = FunctionPointModel([("EI", "Low", "a")], [1] * 14)
+        for changes in ([("add", "EO", "Low", "b"), ("remove", "zz")],
+                        [("gsc", 0, 5), ("reclassify", "a", "ILF", "High"), ("remove", "a"), ("add", "EI", "Huge", "c")],
+                        [("add", "EQ", "High", "b"), ("reclassify", "b", None, "Low"), ("gsc", 14, 1)],
+                        [("remove", "a"), ("brak",)]):
+            with self.assertRaises((KeyError, ValueError)):
+                model.apply(changes)
+            self.assertEqual(model.function_list(), [("EI", "Low", "a")])
+            self.assertEqual((model.ufp, model.tdi, model.gsc, model.history), (3, 14, [1] * 14, []))
+            self.assertEqual(sum(map(sum, model.counts.values())), 1)
+    
+    def test_gsc_index_validated(self):
+        model = FunctionPointModel()
+        for index in (-1, 14):
+            with self.assertRaises(ValueError):
+                model.set_gsc(index, 1)
+        self.assertEqual((model.gsc, model.tdi, model.history), ([0] * 14, 0, []))
+    
+    def test_constructor_validates(self):
+        with self.assertRaises(ValueError):
+            FunctionPointModel([("EI", "Low", "a"), ("EO", "High", "a")])
+        with self.assertRaises(ValueError):
+            FunctionPointModel(gsc=[9] * 14)
+        with self.assertRaises(ValueError):
+            FunctionPointModel(gsc=[3] * 13 + [-1])
+        with self.assertRaises(ValueError):
+            FunctionPointModel(gsc=[3] * 13)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)